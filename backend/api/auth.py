@@ -6,9 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from pydantic import BaseModel
 
-from core.dependencies import get_current_user, require_role
-from core.security import create_access_token, hash_password, verify_password
-from db.database import get_db
+from core.dependencies import get_current_user, invalidate_user, require_role
+from core.security import create_access_token, hash_password_async, verify_password_async
+from db.database import get_db, get_read_db
 from db.models import User, Role
 from schemas.user import UserCreate, UserLogin, UserResponse, Token
 
@@ -24,7 +24,7 @@ async def register(payload: UserCreate, db: AsyncSession = Depends(get_db)):
 
     user = User(
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=await hash_password_async(payload.password),
     )
     db.add(user)
     await db.commit()
@@ -38,7 +38,7 @@ async def login(payload: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.email == payload.email))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(payload.password, user.password_hash):
+    if not user or not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     if not user.is_active:
@@ -59,7 +59,7 @@ async def current_user(user: User = Depends(get_current_user)):
 
 @router.get("/users", response_model=list[UserResponse])
 async def list_users(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: User = Depends(require_role(Role.ADMIN)),
 ):
     """List all users (admin only)."""
@@ -88,6 +88,7 @@ async def update_user_role(
 
     user.role = body.role
     await db.commit()
+    invalidate_user(user_id)
     await db.refresh(user)
     return user
 
@@ -108,3 +109,4 @@ async def delete_user(
 
     await db.delete(user)
     await db.commit()
+    invalidate_user(user_id)
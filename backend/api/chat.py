@@ -1,44 +1,74 @@
 """Chat endpoint for the AI agent."""
 
+import json
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from core.dependencies import get_current_user
-from db.database import get_db
+from db.database import get_db, get_read_sessionmaker
 from db.models import User
-from schemas.chat import ChatRequest, ChatResponse
-from services.agent import run_agent, store_file
+from schemas.chat import ChatAttachmentResponse, ChatRequest, ChatResponse
+from services.agent import run_agent, store_file, stream_agent
+from services.uploads import UploadError, stash_text, stash_upload
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
+async def _prepare_message(payload: ChatRequest) -> str:
+    """Store an optional file attachment and return the message for the agent."""
+    user_message = payload.message
+
+    if payload.file_name:
+        if payload.file_content is not None:
+            # File sent inline instead of via /chat/attachments
+            try:
+                upload = stash_text(payload.session_id, payload.file_name, payload.file_content)
+            except UploadError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            await store_file(payload.session_id, upload.filename, upload.content_hash)
+        user_message += f"\n\n[Datei angehängt: {payload.file_name}]"
+
+    return user_message
+
+
+@router.post("/attachments", response_model=ChatAttachmentResponse, status_code=201)
+async def upload_attachment(
+    session_id: str = Form(..., min_length=1, max_length=64),
+    file: UploadFile = File(...),
+    user: User = Depends(get_current_user),
+):
+    """Attach a .txt file to a chat session for the `save_transcript` tool.
+
+    The file is streamed to disk until the transcript is saved; send its
+    name as `file_name` with the next message.
+    """
+    try:
+        upload = await stash_upload(session_id, file)
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await store_file(session_id, upload.filename, upload.content_hash)
+    return ChatAttachmentResponse(filename=upload.filename, size=upload.size)
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat(
     payload: ChatRequest,
     db: AsyncSession = Depends(get_db),
+    read_sessions: async_sessionmaker = Depends(get_read_sessionmaker),
     user: User = Depends(get_current_user),
 ):
     """Send a message to the AI agent and receive a response."""
-    user_message = payload.message
-
-    # Handle optional file attachment
-    if payload.file_content and payload.file_name:
-        if not payload.file_name.endswith(".txt"):
-            raise HTTPException(status_code=400, detail="Only .txt files are supported")
-
-        size_kb = len(payload.file_content.encode("utf-8")) // 1024
-        store_file(payload.session_id, payload.file_name, payload.file_content)
-        user_message += f"\n\n[Datei angehängt: {payload.file_name}, {size_kb} KB]"
-
     reply, tools_called = await run_agent(
-        user_message=user_message,
+        user_message=await _prepare_message(payload),
         session_id=payload.session_id,
         db=db,
         user=user,
+        read_sessions=read_sessions,
     )
 
     return ChatResponse(
@@ -46,3 +76,38 @@ async def chat(
         session_id=payload.session_id,
         tool_calls_made=tools_called,
     )
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str, ensure_ascii=False)}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(
+    payload: ChatRequest,
+    db: AsyncSession = Depends(get_db),
+    read_sessions: async_sessionmaker = Depends(get_read_sessionmaker),
+    user: User = Depends(get_current_user),
+):
+    """Send a message to the AI agent and stream its progress as Server-Sent Events.
+
+    Event types: `delta` (reply tokens), `tool_start`, `tool_end`,
+    `done` (final reply and tools called) and `error`.
+    """
+    user_message = await _prepare_message(payload)
+
+    async def events():
+        try:
+            async for event in stream_agent(user_message, payload.session_id, db, user, read_sessions):
+                yield _sse(event)
+        except Exception:
+            # Headers are already sent, so report failures in-band
+            logger.exception("Chat stream failed (session=%s)", payload.session_id)
+            yield _sse({"type": "error", "detail": "Fehler bei der Verarbeitung der Anfrage."})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx) so events reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -5,7 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import get_current_user, require_role
-from db.database import get_db
+from db.database import get_db, get_read_db
 from db.models import Company, Industry, User, Role
 from schemas.company import CompanyCreate
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/companies", tags=["companies"])
 
 
 @router.get("/")
-async def list_companies(db: AsyncSession = Depends(get_db), _user: User = Depends(get_current_user)):
+async def list_companies(db: AsyncSession = Depends(get_read_db), _user: User = Depends(get_current_user)):
     """List all companies."""
     result = await db.execute(select(Company).order_by(Company.name))
     companies = result.scalars().all()
@@ -5,7 +5,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import get_current_user, require_role
-from db.database import get_db
+from db.database import get_db, get_read_db
 from db.models import Industry, User, Role
 from schemas.industry import IndustryCreate
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/industries", tags=["industries"])
 
 
 @router.get("/")
-async def list_industries(db: AsyncSession = Depends(get_db), _user: User = Depends(get_current_user)):
+async def list_industries(db: AsyncSession = Depends(get_read_db), _user: User = Depends(get_current_user)):
     """List all industries."""
     result = await db.execute(select(Industry).order_by(Industry.name))
     industries = result.scalars().all()
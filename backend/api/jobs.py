@@ -0,0 +1,27 @@
+"""Background job status endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import get_current_user
+from db.database import get_db
+from db.models import ExtractionJob, User
+from schemas.job import ExtractionJobResponse
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=ExtractionJobResponse)
+async def get_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(get_current_user),
+):
+    """Get the status of a background extraction job.
+
+    Reads from the primary, so a job is visible right after it was queued.
+    """
+    job = await db.get(ExtractionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
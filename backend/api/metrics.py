@@ -0,0 +1,74 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.dependencies import user_cache
+from core.metrics import MetricFamily, registry
+from db.database import get_read_db
+from db.models import ExtractionJob, JobStatus
+from services.agent import session_store
+from services import llm as llm_service
+from services.llm import limiter
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def _snapshots(db: AsyncSession) -> list[MetricFamily]:
+    """Gauges and counters kept by other components, read at scrape time."""
+    llm = limiter.stats()
+    families = [
+        MetricFamily("llm_in_flight", "gauge", "LLM calls currently holding a limiter slot",
+                     samples=[((), llm.in_flight)]),
+        MetricFamily("llm_queued", "gauge", "LLM calls waiting for a limiter slot", ("priority",),
+                     [(("interactive",), llm.queued_interactive), (("batch",), llm.queued_batch)]),
+        MetricFamily("llm_throttled_total", "counter", "429 responses from the LLM provider",
+                     samples=[((), llm.throttled)]),
+        MetricFamily("llm_retries_total", "counter", "LLM calls retried by the limiter",
+                     samples=[((), llm.retries)]),
+        MetricFamily("user_cache_requests_total", "counter", "Auth user cache lookups", ("result",),
+                     [(("hit",), user_cache.hits), (("miss",), user_cache.misses)]),
+        MetricFamily("user_cache_entries", "gauge", "Users in the auth cache",
+                     samples=[((), len(user_cache))]),
+    ]
+
+    if (response_cache := llm_service.response_cache) is not None:
+        cache = await response_cache.stats()
+        families += [
+            MetricFamily("llm_cache_requests_total", "counter", "LLM response cache lookups", ("result",),
+                         [(("memory_hit",), cache.memory_hits), (("disk_hit",), cache.disk_hits),
+                          (("miss",), cache.misses)]),
+            MetricFamily("llm_cache_entries", "gauge", "Cached LLM responses", ("tier",),
+                         [(("memory",), cache.memory_entries), (("disk",), cache.disk_entries)]),
+        ]
+
+    sessions = await session_store.stats()
+    families += [
+        MetricFamily("chat_sessions", "gauge", "Chat sessions held", samples=[((), sessions.sessions)]),
+        MetricFamily("chat_session_bytes", "gauge", "Bytes of chat history held", samples=[((), sessions.bytes)]),
+        MetricFamily("chat_sessions_evicted_total", "counter", "Chat sessions dropped after idling or for space",
+                     samples=[((), sessions.evicted_sessions)]),
+    ]
+
+    # Every status is listed, so a drained queue shows 0 rather than disappearing
+    counts = dict((await db.execute(
+        select(ExtractionJob.status, func.count()).group_by(ExtractionJob.status)
+    )).all())
+    families.append(MetricFamily(
+        "extraction_jobs", "gauge", "Extraction jobs by status", ("status",),
+        [((status.value,), counts.get(status, 0)) for status in JobStatus],
+    ))
+    return families
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(db: AsyncSession = Depends(get_read_db)):
+    """Metrics of this worker process in the Prometheus text format.
+
+    Not authenticated, like `/health`; keep it off the public proxy.
+    """
+    return PlainTextResponse(registry.render(await _snapshots(db)), media_type=CONTENT_TYPE)
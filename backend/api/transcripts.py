@@ -1,36 +1,33 @@
 """Transcript upload and retrieval endpoints."""
 
 import logging
-from pathlib import Path
-import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, Form
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from core.dependencies import get_current_user, require_role
-from db.database import get_db
-from db.models import Transcript, Company, UseCase, User, Role
-from schemas.transcript import TranscriptResponse, TranscriptWithContent, TranscriptWithUseCases
+from db.database import get_db, get_read_db
+from db.models import Transcript, Company, UseCase, User, Role, ExtractionJob, JobStatus
+from schemas.job import ExtractionJobResponse
+from schemas.transcript import TranscriptResponse, TranscriptUploadResponse, TranscriptWithContent
 from schemas.use_case import UseCaseResponse
 from services.extraction import extract_use_cases, ExtractionError
+from services.jobs import job_queue
+from services.uploads import UploadError, read_upload
 
 logger = logging.getLogger(__name__)
 
-TRANSCRIPTS_DIR = Path(__file__).resolve().parents[1] / "data" / "transcripts"
-TRANSCRIPTS_DIR.mkdir(parents=True, exist_ok=True)
-
-def _safe_filename(name: str) -> str:
-    return Path(name).name
-
 router = APIRouter(prefix="/transcripts", tags=["transcripts"])
 
 
 async def _extract_and_persist(
-    transcript: Transcript, db: AsyncSession
+    transcript: Transcript, content: str, db: AsyncSession
 ) -> list[UseCase]:
-    """Run LLM extraction on a transcript and save the use cases to DB."""
-    extracted = await extract_use_cases(transcript.content)
+    """Run LLM extraction on a transcript's content and save the use cases to DB."""
+    extracted = await extract_use_cases(content)
 
     use_cases = []
     for item in extracted:
@@ -52,75 +49,106 @@ async def _extract_and_persist(
     return use_cases
 
 
-@router.post("/", response_model=TranscriptWithUseCases, status_code=201)
+async def _find_upload(db: AsyncSession, company_id: int, digest: str) -> Transcript | None:
+    return (await db.execute(
+        select(Transcript).where(Transcript.company_id == company_id, Transcript.content_hash == digest)
+    )).scalar_one_or_none()
+
+
+async def _upload_response(
+    db: AsyncSession, transcript: Transcript, user: User, duplicate: bool, response: Response
+) -> TranscriptUploadResponse:
+    """Describe an upload; queues an extraction unless one is pending or has produced use cases."""
+    use_cases = (await db.execute(
+        select(UseCase).where(UseCase.transcript_id == transcript.id).order_by(UseCase.id)
+    )).scalars().all()
+    job = (await db.execute(
+        select(ExtractionJob)
+        .where(ExtractionJob.transcript_id == transcript.id)
+        .order_by(ExtractionJob.id.desc())
+        .limit(1)
+    )).scalar_one_or_none()
+
+    if not use_cases and (job is None or job.status == JobStatus.FAILED):
+        job = await job_queue.enqueue(db, transcript.id, user.id)
+        response.status_code = 202
+
+    return TranscriptUploadResponse(
+        id=transcript.id,
+        filename=transcript.filename,
+        company_id=transcript.company_id,
+        created_at=transcript.created_at,
+        uploaded_by_id=transcript.uploaded_by_id,
+        duplicate=duplicate,
+        job=ExtractionJobResponse.model_validate(job) if job else None,
+        use_cases=use_cases,
+    )
+
+
+@router.post(
+    "/",
+    response_model=TranscriptUploadResponse,
+    status_code=200,
+    responses={202: {"description": "Transcript stored, extraction queued"}},
+)
 async def upload_transcript(
+    response: Response,
     file: UploadFile = File(...),
     company_id: int = Form(...),
     db: AsyncSession = Depends(get_db),
-    _user: User = Depends(require_role(Role.MAINTAINER)),
+    user: User = Depends(require_role(Role.MAINTAINER)),
 ):
-    """Upload a transcript file and automatically extract use cases via LLM."""
+    """Upload a transcript file and queue the LLM extraction of its use cases.
+
+    Returns 202 right after storing the transcript; poll `GET /jobs/{job.id}`
+    for the extraction result. A file this company uploaded before (same
+    SHA-256) resolves to the existing transcript with its use cases (200,
+    `duplicate: true`) without a new extraction. The file is read and
+    compressed in chunks, up to `TRANSCRIPT_MAX_BYTES`.
+    """
     # Validate company exists
     company = await db.get(Company, company_id)
     if not company:
         raise HTTPException(status_code=404, detail=f"Company with id {company_id} not found")
 
-    # Validate file type
-    if not file.filename.endswith(".txt"):
-        raise HTTPException(status_code=400, detail="Only .txt files are supported")
-
-    # Read content (max 512 KB)
-    max_size = 512 * 1024
-    content = await file.read(max_size + 1)
-    if len(content) > max_size:
-        raise HTTPException(status_code=400, detail="File too large (max 500 KB)")
-    if not content or not content.strip():
-        raise HTTPException(status_code=400, detail="File is empty")
     try:
-        content_str = content.decode("utf-8-sig")
-    except UnicodeDecodeError:
-        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+        upload = await read_upload(file)
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if existing := await _find_upload(db, company_id, upload.content_hash):
+        logger.info("Upload of %s matches transcript %d", upload.filename, existing.id)
+        return await _upload_response(db, existing, user, duplicate=True, response=response)
 
     # Create transcript
     transcript = Transcript(
-        filename=file.filename,
-        content=content_str,
+        filename=upload.filename,
+        content_z=upload.compressed,
+        content_hash=upload.content_hash,
         company_id=company_id,
         # uploaded_by_id=current_user.id  # TODO: Add after auth
     )
 
     db.add(transcript)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # The same file was uploaded concurrently
+        await db.rollback()
+        existing = await _find_upload(db, company_id, upload.content_hash)
+        if existing is None:
+            raise
+        return await _upload_response(db, existing, user, duplicate=True, response=response)
     await db.refresh(transcript)
 
-    stored_name = f"{transcript.id}_{uuid.uuid4().hex}_{_safe_filename(file.filename)}"
-    stored_path = TRANSCRIPTS_DIR / stored_name
-    try:
-        stored_path.write_bytes(content)
-    except Exception:
-        raise HTTPException(status_code=500, detail="Failed to persist transcript file")
-
-    # Extract use cases automatically
-    try:
-        use_cases = await _extract_and_persist(transcript, db)
-    except ExtractionError as e:
-        logger.error("Extraction failed for transcript %d: %s", transcript.id, e)
-        use_cases = []
-
-    return TranscriptWithUseCases(
-        id=transcript.id,
-        filename=transcript.filename,
-        company_id=transcript.company_id,
-        created_at=transcript.created_at,
-        uploaded_by_id=transcript.uploaded_by_id,
-        use_cases=use_cases,
-    )
+    # Extract use cases in the background
+    return await _upload_response(db, transcript, user, duplicate=False, response=response)
 
 
 @router.get("/", response_model=list[TranscriptResponse])
 async def list_transcripts(
     company_id: int | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: User = Depends(get_current_user),
 ):
     """List all transcripts, optionally filtered by company."""
@@ -138,11 +166,11 @@ async def list_transcripts(
 @router.get("/{transcript_id}", response_model=TranscriptWithContent)
 async def get_transcript(
     transcript_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: User = Depends(get_current_user),
 ):
     """Get a single transcript with full content."""
-    transcript = await db.get(Transcript, transcript_id)
+    transcript = await db.get(Transcript, transcript_id, options=[undefer(Transcript.content_z)])
     
     if not transcript:
         raise HTTPException(status_code=404, detail="Transcript not found")
@@ -162,12 +190,12 @@ async def extract_use_cases_from_transcript(
     response, and persists the extracted use cases in the database.
     Retries up to 2 times on validation failure.
     """
-    transcript = await db.get(Transcript, transcript_id)
+    transcript = await db.get(Transcript, transcript_id, options=[undefer(Transcript.content_z)])
     if not transcript:
         raise HTTPException(status_code=404, detail="Transcript not found")
 
     try:
-        use_cases = await _extract_and_persist(transcript, db)
+        use_cases = await _extract_and_persist(transcript, transcript.content, db)
     except ExtractionError as e:
         logger.error("Extraction failed for transcript %d: %s", transcript_id, e)
         raise HTTPException(status_code=502, detail=str(e))
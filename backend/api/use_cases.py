@@ -3,11 +3,10 @@
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.dependencies import get_current_user, require_role
-from db.database import get_db
+from db.database import get_db, get_read_db
 from db.models import UseCase, Company, User, Role
 from db.models.use_case import UseCaseStatus, ALLOWED_TRANSITIONS
 from schemas.use_case import (
@@ -15,6 +14,13 @@ from schemas.use_case import (
     UseCaseUpdate,
     UseCaseResponse,
     UseCaseListResponse,
+    UseCaseSearchResult,
+)
+from services.use_case_query import (
+    InvalidCursorError,
+    build_use_case_query,
+    fetch_use_case_page,
+    search_use_cases,
 )
 
 logger = logging.getLogger(__name__)
@@ -32,51 +38,63 @@ async def list_use_cases(
     search: str | None = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    db: AsyncSession = Depends(get_read_db),
     _user: User = Depends(get_current_user),
 ):
-    """List use cases with optional filters for company, status and search."""
-    query = select(UseCase)
-
-    if company_id is not None:
-        query = query.where(UseCase.company_id == company_id)
-    if industry_id is not None:
-        query = query.join(Company, UseCase.company_id == Company.id).where(
-            Company.industry_id == industry_id
-        )
-    if status is not None:
-        query = query.where(UseCase.status == status)
-    if search:
-        pattern = f"%{search}%"
-        query = query.where(
-            UseCase.title.ilike(pattern) | UseCase.description.ilike(pattern)
-        )
+    """List use cases with optional filters for company, status and search.
 
-    # Total count (before pagination)
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar_one()
-
-    # Paginate
-    query = query.order_by(UseCase.created_at.desc())
-    query = query.offset((page - 1) * per_page).limit(per_page)
+    Pass the returned `next_cursor` as `cursor` to page via keyset instead of
+    offset; `include_total=false` skips the extra COUNT query.
+    """
+    query = build_use_case_query(
+        db, company_id=company_id, industry_id=industry_id, status=status, search=search,
+    )
 
-    result = await db.execute(query)
-    use_cases = result.scalars().all()
+    try:
+        result = await fetch_use_case_page(
+            db,
+            query,
+            limit=per_page,
+            cursor=cursor,
+            offset=(page - 1) * per_page,
+            include_total=include_total,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return UseCaseListResponse(
-        data=use_cases,
-        total=total,
+        data=result.items,
+        total=result.total,
         page=page,
         per_page=per_page,
+        next_cursor=result.next_cursor,
     )
 
 
+# ---------- Full-text search ----------
+
+@router.get("/search", response_model=list[UseCaseSearchResult])
+async def search(
+    q: str = Query(..., min_length=1),
+    company_id: int | None = None,
+    status: UseCaseStatus | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    _user: User = Depends(get_current_user),
+):
+    """Search use cases by relevance with highlighted title and snippet."""
+    hits = await search_use_cases(db, q, company_id=company_id, status=status, limit=limit)
+    return [UseCaseSearchResult.model_validate(hit) for hit in hits]
+
+
 # ---------- E2-UC2: Get single use case ----------
 
 @router.get("/{use_case_id}", response_model=UseCaseResponse)
 async def get_use_case(
     use_case_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _user: User = Depends(get_current_user),
 ):
     """Get a single use case by ID."""
@@ -0,0 +1,71 @@
+"""Benchmark: event-loop latency during a login storm.
+
+Runs N concurrent password verifications twice — inline on the event loop
+(the old behaviour) and on the bounded bcrypt thread pool — while a probe
+coroutine measures how late the loop wakes it up. A late probe is what
+every chat or list request would experience during the storm.
+
+Usage:
+    python -m benchmarks.login_storm [logins]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from core.security import hash_password, verify_password, verify_password_async
+
+PROBE_INTERVAL = 0.005
+
+
+async def _probe(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+
+async def _inline_login(hashed: str) -> None:
+    verify_password("workshop-passwort", hashed)
+
+
+async def _executor_login(hashed: str) -> None:
+    await verify_password_async("workshop-passwort", hashed)
+
+
+async def run(login, logins: int, hashed: str) -> dict:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+    await asyncio.sleep(PROBE_INTERVAL * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login(hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+    lags.sort()
+    return {
+        "elapsed_s": elapsed,
+        "lag_p50_ms": statistics.median(lags) * 1000,
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] * 1000 if len(lags) > 1 else lags[-1] * 1000,
+        "lag_max_ms": lags[-1] * 1000,
+    }
+
+
+async def main(logins: int) -> None:
+    hashed = hash_password("workshop-passwort")
+    print(f"{logins} concurrent logins, probe every {PROBE_INTERVAL * 1000:.0f} ms\n")
+    print(f"{'mode':<10} {'total s':>8} {'p50 lag ms':>11} {'p99 lag ms':>11} {'max lag ms':>11}")
+    for name, login in (("inline", _inline_login), ("executor", _executor_login)):
+        r = await run(login, logins, hashed)
+        print(
+            f"{name:<10} {r['elapsed_s']:>8.2f} {r['lag_p50_ms']:>11.1f} "
+            f"{r['lag_p99_ms']:>11.1f} {r['lag_max_ms']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
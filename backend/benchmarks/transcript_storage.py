@@ -0,0 +1,115 @@
+"""Benchmark: transcript storage size and read latency, plain vs. compressed.
+
+Writes the same synthetic workshop transcripts into two SQLite files — one
+with the text in a TEXT column (the old `transcripts.content`), one
+zlib-compressed in a BLOB column (`transcripts.content_z`) — and compares
+file size and the latency of loading one transcript by id, decompression
+included. The text is built from a small phrase pool, so it compresses
+better than real transcripts; treat the ratio as an upper bound.
+
+Usage:
+    python -m benchmarks.transcript_storage [transcripts] [kb_per_transcript]
+"""
+
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+READS = 2000
+
+SPEAKERS = ["Lisa Berger", "Jörg Hansen", "Moderator", "Aylin Demir", "Thomas Krüger"]
+PHRASES = [
+    "Wir verlieren jede Woche mehrere Stunden mit der manuellen Schichtplanung",
+    "die Daten liegen verteilt in Excel-Listen und im ERP-System",
+    "das müsste man sich mit der IT genauer anschauen",
+    "ein Assistent könnte die Dokumentation nach jedem Einsatz vorbereiten",
+    "bei Reklamationen suchen wir oft lange nach dem passenden Lieferschein",
+    "die Qualitätssicherung prüft jede Charge noch von Hand",
+    "unsere Kunden fragen immer wieder dieselben Dinge per E-Mail",
+    "wie würde das im Alltag der Kolleginnen und Kollegen aussehen",
+    "wichtig ist, dass der Betriebsrat früh eingebunden wird",
+    "wir haben dafür aktuell kein Budget eingeplant",
+]
+FILLERS = ["Ja,", "Genau.", "Also", "Hm,", "Okay,", "Ich glaube", "Vielleicht", "Und"]
+
+
+def _transcript(rng: random.Random, size: int) -> str:
+    lines, length = [], 0
+    minute = 0
+    while length < size:
+        minute += rng.randint(0, 2)
+        sentence = " ".join(
+            f"{rng.choice(FILLERS)} {rng.choice(PHRASES)}, {rng.randint(2, 40)} Fälle im Monat."
+            for _ in range(rng.randint(1, 3))
+        )
+        line = f"[{minute // 60:02d}:{minute % 60:02d}] {rng.choice(SPEAKERS)}: {sentence}"
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def _column(compressed: bool) -> str:
+    return "content_z" if compressed else "content"
+
+
+def _build(path: Path, compressed: bool, texts: list[str]) -> None:
+    column = _column(compressed)
+    with sqlite3.connect(path) as db:
+        db.execute(
+            f"CREATE TABLE transcripts (id INTEGER PRIMARY KEY, filename TEXT, {column} "
+            f"{'BLOB' if compressed else 'TEXT'})"
+        )
+        db.executemany(
+            f"INSERT INTO transcripts (filename, {column}) VALUES (?, ?)",
+            [("t.txt", zlib.compress(t.encode()) if compressed else t) for t in texts],
+        )
+    with sqlite3.connect(path) as db:
+        db.execute("VACUUM")
+
+
+def _reads(path: Path, compressed: bool, count: int) -> list[float]:
+    rng = random.Random(1)
+    column = _column(compressed)
+    timings = []
+    with sqlite3.connect(path) as db:
+        for _ in range(READS):
+            start = time.perf_counter()
+            value = db.execute(
+                f"SELECT {column} FROM transcripts WHERE id = ?", (rng.randint(1, count),)
+            ).fetchone()[0]
+            text = zlib.decompress(value).decode() if compressed else value
+            timings.append(time.perf_counter() - start)
+            assert text
+    timings.sort()
+    return timings
+
+
+def main(count: int, kb: int) -> None:
+    rng = random.Random(0)
+    texts = [_transcript(rng, kb * 1024) for _ in range(count)]
+    raw = sum(len(t.encode()) for t in texts)
+    print(f"{count} transcripts à ~{kb} KB ({raw / 1024 / 1024:.1f} MB text), {READS} reads by id\n")
+    print(f"{'storage':<10} {'db MB':>8} {'ratio':>6} {'p50 ms':>8} {'p99 ms':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, compressed in (("text", False), ("zlib", True)):
+            path = Path(tmp) / f"{name}.db"
+            _build(path, compressed, texts)
+            size = path.stat().st_size
+            timings = _reads(path, compressed, count)
+            print(
+                f"{name:<10} {size / 1024 / 1024:>8.1f} {raw / size:>6.1f} "
+                f"{statistics.median(timings) * 1000:>8.2f} {timings[int(len(timings) * 0.99)] * 1000:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
@@ -0,0 +1,145 @@
+"""One-off migration: store transcripts compressed, and only once.
+
+Older databases keep each transcript as plain text in `transcripts.content`
+and a second copy as a file under data/transcripts/. This compresses every
+row into `transcripts.content_z` (zlib), drops `content` and removes the
+file copies. Safe to re-run; the app refuses to start until it has run.
+
+It also fills in `content_hash` for rows stored before uploads were
+deduplicated, so re-uploading them finds the existing transcript. Of
+several identical transcripts of one company only the oldest gets the
+hash (it is unique per company); the others stay unhashed.
+
+Usage:
+    python compress_transcripts.py [--keep-files] [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import shutil
+import zlib
+from pathlib import Path
+
+from sqlalchemy import LargeBinary, String, bindparam, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from db.database import engine
+
+LEGACY_FILES_DIR = Path(__file__).parent / "data" / "transcripts"
+
+
+def _columns(conn) -> set[str]:
+    return {column["name"] for column in inspect(conn).get_columns("transcripts")}
+
+
+async def migrate(engine: AsyncEngine, batch_size: int = 200) -> int:
+    """Compress all rows still stored as text and backfill content hashes.
+
+    Returns how many rows were compressed.
+    """
+    async with engine.begin() as conn:
+        columns = await conn.run_sync(_columns)
+        if "content_hash" not in columns:
+            column_type = String(64).compile(dialect=conn.dialect)
+            await conn.execute(text(f"ALTER TABLE transcripts ADD COLUMN content_hash {column_type}"))
+        if "content" in columns and "content_z" not in columns:
+            column_type = LargeBinary().compile(dialect=conn.dialect)
+            await conn.execute(text(f"ALTER TABLE transcripts ADD COLUMN content_z {column_type}"))
+
+    migrated = await _compress(engine, batch_size) if "content" in columns else 0
+    hashed = await _backfill_hashes(engine, batch_size)
+    if hashed:
+        print(f"  {hashed} content hashes filled in")
+    return migrated
+
+
+def _content_hash(content: str) -> str:
+    # As computed on upload: SHA-256 of the UTF-8 text without BOM
+    return hashlib.sha256(content.removeprefix("\ufeff").encode("utf-8")).hexdigest()
+
+
+async def _backfill_hashes(engine: AsyncEngine, batch_size: int) -> int:
+    """Hash rows that have none; return how many got one."""
+    hashed, last_id = 0, 0
+    while True:
+        async with engine.begin() as conn:
+            rows = (await conn.execute(
+                text(
+                    "SELECT id, company_id, content_z FROM transcripts "
+                    "WHERE content_hash IS NULL AND id > :last_id ORDER BY id LIMIT :n"
+                ),
+                {"last_id": last_id, "n": batch_size},
+            )).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            candidates = {
+                row.id: (row.company_id, _content_hash(zlib.decompress(row.content_z).decode("utf-8")))
+                for row in rows
+            }
+            taken = set((await conn.execute(
+                text("SELECT company_id, content_hash FROM transcripts WHERE content_hash IN :hashes")
+                .bindparams(bindparam("hashes", expanding=True)),
+                {"hashes": list({digest for _, digest in candidates.values()})},
+            )).tuples())
+            updates = []
+            for row_id, key in candidates.items():
+                if key not in taken:  # Later duplicates keep NULL
+                    taken.add(key)
+                    updates.append({"id": row_id, "content_hash": key[1]})
+            if updates:
+                await conn.execute(
+                    text("UPDATE transcripts SET content_hash = :content_hash WHERE id = :id"), updates
+                )
+        hashed += len(updates)
+    return hashed
+
+
+async def _compress(engine: AsyncEngine, batch_size: int) -> int:
+    migrated = 0
+    while True:
+        # One transaction per batch, so a large table is not locked for the whole run
+        async with engine.begin() as conn:
+            rows = (await conn.execute(
+                text("SELECT id, content FROM transcripts WHERE content_z IS NULL ORDER BY id LIMIT :n"),
+                {"n": batch_size},
+            )).all()
+            if not rows:
+                break
+            await conn.execute(
+                text("UPDATE transcripts SET content_z = :content_z WHERE id = :id"),
+                [{"id": row.id, "content_z": zlib.compress(row.content.encode("utf-8"))} for row in rows],
+            )
+        migrated += len(rows)
+        print(f"  {migrated} transcripts compressed")
+
+    async with engine.begin() as conn:
+        await conn.execute(text("ALTER TABLE transcripts DROP COLUMN content"))
+
+    if engine.dialect.name == "sqlite":
+        # Give the freed pages back to the file system
+        async with engine.connect() as conn:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM"))
+    return migrated
+
+
+async def main(keep_files: bool, batch_size: int) -> None:
+    migrated = await migrate(engine, batch_size)
+    await engine.dispose()
+    print(f"✅ {migrated} transcripts migrated" if migrated else "✅ Transcripts are already compressed")
+
+    if LEGACY_FILES_DIR.exists() and not keep_files:
+        # Every file there is a copy of a database row
+        shutil.rmtree(LEGACY_FILES_DIR)
+        print(f"✅ Removed file copies in {LEGACY_FILES_DIR}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep-files", action="store_true", help="keep data/transcripts/")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.keep_files, args.batch_size))
@@ -1,6 +1,7 @@
 """Application configuration loaded from environment variables."""
 
 from pathlib import Path
+from typing import Literal
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -16,19 +17,83 @@ class Settings(BaseSettings):
     env: str = "development"
     log_level: str = "INFO"
     
-    # Database
+    # Database — SQLite (aiosqlite) or PostgreSQL (asyncpg)
     database_url: str = "sqlite+aiosqlite:///./data/app.db"
+    # Optional read replica for read-only endpoints; unset = read from the primary
+    database_replica_url: str | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800  # seconds; -1 disables
+    # asyncpg statement caches per connection (0 for PgBouncer transaction pooling)
+    db_statement_cache_size: int = 100
+    # Statements slower than this are logged with parameters and EXPLAIN output; 0 disables
+    db_slow_query_ms: int = 500
+    db_slow_query_explain: bool = True
+
+    # SQLite tuning, applied to every new connection (ignored for other databases)
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "PERSIST", "MEMORY"] = "WAL"
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kb: int = 64 * 1024
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_temp_store: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
     
     # Auth — JWT_SECRET MUST be set in .env (min 32 chars)
     jwt_secret: str = ""
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 1440  # 24 hours
+    # Authenticated users cached per worker; role changes on other workers apply after the TTL
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_entries: int = 1024
+    # Threads for bcrypt hashing/verification (concurrent hashes beyond this queue)
+    password_hash_workers: int = 4
     
     # OpenRouter
     openrouter_api_key: str = ""
     openrouter_model: str = "anthropic/claude-3-haiku"
     openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    # Cache for identical LLM requests (model, temperature, messages); empty path = memory only
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_seconds: int = 7 * 24 * 60 * 60
+    llm_cache_max_entries: int = 256  # per worker
+    llm_cache_path: str = "data/llm_cache.db"  # relative to backend/
+    llm_cache_max_disk_entries: int = 10_000
+    # Limits on LLM calls per process; 429/5xx are retried with jittered backoff or Retry-After
+    llm_max_concurrency: int = 8
+    llm_requests_per_second: float = 5.0  # 0 disables the rate limit
+    llm_burst: int = 10
+    llm_max_retries: int = 4
+    llm_backoff_base_seconds: float = 1.0
+    llm_backoff_max_seconds: float = 30.0
+
+    # Uploaded .txt files are streamed to disk in chunks, so the limit doesn't cost memory
+    transcript_max_bytes: int = 8 * 1024 * 1024
+    upload_chunk_bytes: int = 64 * 1024
+    # Transcripts longer than this are extracted in overlapping chunks (map-reduce)
+    extraction_chunk_chars: int = 24_000
+    extraction_chunk_overlap_chars: int = 1_500
+    extraction_max_concurrency: int = 4  # concurrent LLM calls per transcript
+    # Background extraction jobs (per process)
+    job_workers: int = 2
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 10.0  # doubled per attempt
+    job_stale_after_seconds: int = 30 * 60  # running jobs older than this are re-queued on startup
     
+    # Chat sessions: "memory" (per worker) or "database" (shared by all workers)
+    chat_session_backend: Literal["memory", "database"] = "memory"
+    chat_max_sessions: int = 1000  # memory backend only
+    chat_session_idle_ttl_seconds: int = 2 * 60 * 60
+    chat_max_messages_per_session: int = 100
+    chat_max_bytes_per_session: int = 256 * 1024
+    # Prompt budget per LLM round (estimated tokens, excluding tool definitions)
+    chat_prompt_token_budget: int = 12_000
+    chat_keep_recent_turns: int = 4
+    chat_tool_result_chars: int = 2_000  # older tool results are cut to this length
+    # Offer only the mutating tools matching the keywords of the recent user turns (read-only tools are always offered)
+    chat_tool_intent_filter: bool = False
+
     # CORS
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
     
@@ -5,13 +5,24 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from core.cache import TTLCache
+from core.config import get_settings
 from core.security import decode_access_token
 from db.database import get_db
 from db.models import User, Role
 
 security_scheme = HTTPBearer()
 
+settings = get_settings()
+
+# user id -> column values of an active user (password hash is never cached)
+_CACHED_COLUMNS = ("id", "email", "role", "is_active", "created_at")
+user_cache: TTLCache[int, dict] = TTLCache(
+    maxsize=settings.user_cache_max_entries, ttl=settings.user_cache_ttl_seconds
+)
+
 # Role hierarchy: ADMIN > MAINTAINER > READER
 ROLE_LEVEL = {
     Role.READER: 0,
@@ -31,13 +42,26 @@ async def get_current_user(
     except (JWTError, KeyError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        # Fresh detached instance per request, so requests never share ORM state
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return user
+
     user = await db.get(User, user_id)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
+    user_cache.set(user_id, {name: getattr(user, name) for name in _CACHED_COLUMNS})
     return user
 
 
+def invalidate_user(user_id: int) -> None:
+    """Drop a user from the auth cache after a role change or deletion."""
+    user_cache.pop(user_id)
+
+
 def require_role(min_role: Role):
     """Dependency factory: ensures current user has at least `min_role`."""
 
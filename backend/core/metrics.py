@@ -0,0 +1,222 @@
+"""In-process metrics in the Prometheus text format.
+
+Counters and histograms are plain numbers in dicts keyed by label values.
+They are only updated from the event loop thread, so recording needs no
+locks: one dict lookup and an addition (plus a bisect for histograms).
+Values are per worker process; Prometheus scrapes each worker and sums.
+
+State that already exists elsewhere (queue depth, cache sizes, job counts)
+is not tracked twice but read at scrape time and passed to `render()` as
+`MetricFamily` snapshots.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+# Seconds; covers fast DB queries up to slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic count per label combination."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> Iterator[str]:
+        for values, total in self._values.items():
+            yield f"{self.name}{_labels(self.labels, values)} {_number(total)}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+class Histogram:
+    """Observations counted into fixed buckets per label combination."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: counts per bucket (last one is +Inf), then sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        entry = self._values.get(label_values)
+        if entry is None:
+            entry = self._values[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        """Observe the duration of the block, also if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def count(self, *label_values: str) -> int:
+        entry = self._values.get(label_values)
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> Iterator[str]:
+        for values, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, values)} {_number(total[0])}"
+            yield f"{self.name}_count{_labels(self.labels, values)} {cumulative}"
+
+    def clear(self) -> None:
+        self._values.clear()
+
+
+@dataclass
+class MetricFamily:
+    """A metric read at scrape time: samples as (label values, value)."""
+    name: str
+    type: str  # "gauge" or "counter"
+    help: str
+    labels: tuple[str, ...] = ()
+    samples: list[tuple[tuple[str, ...], float]] = field(default_factory=list)
+
+    def render(self) -> Iterator[str]:
+        for values, value in self.samples:
+            yield f"{self.name}{_labels(self.labels, values)} {_number(value)}"
+
+
+class Registry:
+    """All metrics of the process, rendered together."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def _add(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self, snapshots: Iterable[MetricFamily] = ()) -> str:
+        """All metrics plus `snapshots` in the Prometheus text format."""
+        lines = []
+        for family in (*self._metrics.values(), *snapshots):
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Reset all recorded values."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = Registry()
+
+# ---------- Hot-path metrics ----------
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies",
+    ("method", "route", "status"),
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("operation",),
+)
+llm_request_duration = registry.histogram(
+    "llm_request_duration_seconds", "LLM API call latency, retries and limiter waits included",
+    ("call", "outcome"),
+)
+llm_tokens = registry.counter(
+    "llm_tokens_total", "Tokens reported by the LLM provider", ("call", "type"),
+)
+tool_duration = registry.histogram(
+    "agent_tool_duration_seconds", "Agent tool execution time", ("tool", "outcome"),
+)
+extraction_attempts = registry.counter(
+    "extraction_attempts_total", "LLM extraction attempts per transcript piece", ("outcome",),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording `http_request_duration_seconds`.
+
+    Requests are labelled with the route template (`/api/use-cases/{id}`),
+    not the raw path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+            )
@@ -1,5 +1,7 @@
 """Password hashing and JWT token utilities."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -16,6 +18,27 @@ def verify_password(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
+# bcrypt releases the GIL, so hashes run in parallel here while the event
+# loop keeps serving requests. max_workers caps how many run at once; further
+# calls queue instead of adding CPU contention.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=get_settings().password_hash_workers,
+    thread_name_prefix="bcrypt",
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() on the bounded bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    """verify_password() on the bounded bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain, hashed)
+
+
 def create_access_token(user_id: int, email: str, role: str) -> str:
     settings = get_settings()
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_expire_minutes)
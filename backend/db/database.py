@@ -1,24 +1,280 @@
-"""Database connection and session management."""
+"""Database connection and session management.
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+Mutations use `get_db` (primary engine). Read-only endpoints use
+`get_read_db`, which routes to the replica engine unless the current
+request has already written — then it reads from the primary so the
+request sees its own writes.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session
 
 from core.config import get_settings
+from core.metrics import db_query_duration
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.env == "development",  # SQL logging in dev
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Apply the SQLite performance profile to a freshly opened connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kb)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA temp_store={settings.sqlite_temp_store}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(database_url: str) -> AsyncEngine:
+    """Create an async engine with pool sizing and, for SQLite, connection pragmas.
+
+    Plain `postgresql://` URLs are switched to the asyncpg driver.
+    """
+    url = make_url(database_url)
+    kwargs = {}
+    if url.drivername == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    if url.get_backend_name() == "postgresql":
+        # SQLAlchemy's prepared statement cache and asyncpg's own statement cache; both must be 0 behind
+        # PgBouncer in transaction mode, where the next statement may land on another server connection
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "statement_cache_size": settings.db_statement_cache_size,
+        }
+
+    # In-memory SQLite uses a single static connection; pool sizing doesn't apply
+    if not (url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")):
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+        )
+
+    db_engine = create_async_engine(
+        url,
+        echo=settings.env == "development",  # SQL logging in dev
+        **kwargs,
+    )
+    if url.get_backend_name() == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return db_engine
+
+
+@dataclass
+class RequestState:
+    """Per-request database state, shared by every session of the request."""
+    wrote: bool = False
+    queries: int = 0
+    query_seconds: float = 0.0
+
+
+_request_state: ContextVar[RequestState | None] = ContextVar("db_request_state", default=None)
+
+
+@contextmanager
+def request_scope():
+    """Track writes and statements for the duration of one HTTP request.
+
+    Covers everything the request awaits, including a streamed chat agent
+    run. Extraction jobs run outside any scope.
+    """
+    state = RequestState()
+    token = _request_state.set(state)
+    try:
+        yield state
+    finally:
+        _request_state.reset(token)
+
+
+class RequestScopeMiddleware:
+    """ASGI middleware opening a request_scope() around every HTTP request.
+
+    With `query_headers` (development), responses carry the number of SQL
+    statements and their total time so far in `X-DB-Queries` and
+    `X-DB-Time-Ms`. Streamed responses send headers first, so they only
+    count what ran before the body started.
+    """
+
+    def __init__(self, app, query_headers: bool = False):
+        self.app = app
+        self.query_headers = query_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with request_scope() as state:
+            if not self.query_headers:
+                await self.app(scope, receive, send)
+                return
+
+            async def _send(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-db-queries", str(state.queries).encode()),
+                        (b"x-db-time-ms", f"{state.query_seconds * 1000:.1f}".encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, _send)
+
+
+# ---------- Statement timing ----------
+# Feeds db_query_duration_seconds and the request's RequestState; start
+# times are kept on the connection, as statements of one connection run
+# one after another.
+
+_QUERY_OPERATIONS = {"select", "insert", "update", "delete"}
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    words = statement.split(None, 1)
+    operation = words[0].lower() if words else ""
+    db_query_duration.observe(elapsed, operation if operation in _QUERY_OPERATIONS else "other")
+
+    state = _request_state.get()
+    if state is not None:
+        state.queries += 1
+        state.query_seconds += elapsed
+
+    if settings.db_slow_query_ms and elapsed * 1000 >= settings.db_slow_query_ms:
+        plan = None
+        if settings.db_slow_query_explain and operation in _QUERY_OPERATIONS and not executemany:
+            plan = _explain(conn, statement, parameters)
+        logger.warning(
+            "Slow query (%.1f ms): %s\nParameters: %s\nPlan:\n%s",
+            elapsed * 1000, statement, _truncate(repr(parameters)), plan or "-",
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _query_failed(context) -> None:
+    # after_cursor_execute doesn't run for a failed statement
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+
+def _truncate(text: str, limit: int = 1000) -> str:
+    # Parameters may hold whole (compressed) transcripts
+    return text if len(text) <= limit else f"{text[:limit]}… ({len(text)} chars)"
+
+
+def _explain(conn, statement: str, parameters) -> str | None:
+    """The plan of a statement that just ran, on the same connection.
+
+    Goes to the DBAPI cursor directly, so it is neither timed nor counted.
+    On PostgreSQL it runs in a savepoint: a failing EXPLAIN must not abort
+    the request's transaction. Any failure (also of the savepoint itself,
+    e.g. outside a transaction block) is only logged; the plan is None.
+    """
+    sqlite = conn.dialect.name == "sqlite"
+    savepoint = False
+    cursor = None
+    try:
+        cursor = conn.connection.cursor()
+        if not sqlite:
+            cursor.execute("SAVEPOINT slow_query_explain")
+            savepoint = True
+        cursor.execute(("EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN ") + statement, parameters)
+        rows = cursor.fetchall()
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            savepoint = False
+        return "\n".join(" | ".join(str(value) for value in row) for row in rows)
+    except Exception as e:
+        # Diagnostics only: never fail the statement that already succeeded
+        logger.debug("EXPLAIN failed: %s", e)
+        if savepoint:
+            try:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            except Exception as rollback_error:
+                logger.debug("Rolling back the EXPLAIN savepoint failed: %s", rollback_error)
+        return None
+    finally:
+        if cursor is not None:
+            cursor.close()
+
+
+def _mark_write() -> None:
+    state = _request_state.get()
+    if state is not None:
+        state.wrote = True
+
+
+@event.listens_for(Session, "after_flush")
+def _pin_after_flush(session, flush_context) -> None:
+    _mark_write()
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _pin_after_dml(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _mark_write()
+
+
+class ReadSession(Session):
+    """Session bound to the replica, pinned to the primary after a write.
+
+    The bind is chosen whenever the session starts a transaction; the
+    primary engine is passed via `info={"primary": ...}`.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        state = _request_state.get()
+        if state is not None and state.wrote:
+            return self.info["primary"].sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def create_read_session_maker(primary: AsyncEngine, replica: AsyncEngine) -> async_sessionmaker:
+    """Session factory for read-only work with read-your-writes routing."""
+    return async_sessionmaker(
+        replica,
+        class_=AsyncSession,
+        sync_session_class=ReadSession,
+        expire_on_commit=False,
+        info={"primary": primary},
+    )
+
+
+# Create async engines; without a replica URL reads go to the primary
+engine = create_db_engine(settings.database_url)
+replica_engine = (
+    create_db_engine(settings.database_replica_url) if settings.database_replica_url else engine
 )
 
-# Session factory
+# Session factories
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
+async_read_session_maker = create_read_session_maker(engine, replica_engine)
 
 
 class Base(DeclarativeBase):
@@ -35,7 +291,63 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db() -> AsyncSession:
+    """Dependency that provides a read-only (replica-routed) database session."""
+    async with async_read_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def get_read_sessionmaker() -> async_sessionmaker:
+    """Dependency providing the read session factory, for work that needs several sessions."""
+    return async_read_session_maker
+
+
+def _add_missing_columns(conn) -> None:
+    """create_all() skips existing tables, so add nullable columns introduced later."""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+
+# Columns the models no longer map, with the one-off script that migrates them away
+_LEGACY_COLUMNS = {("transcripts", "content"): "compress_transcripts.py"}
+
+
+def _check_legacy_columns(conn) -> None:
+    """Refuse to start on a schema that still needs a one-off migration."""
+    inspector = inspect(conn)
+    for (table, column), script in _LEGACY_COLUMNS.items():
+        if column in {c["name"] for c in inspector.get_columns(table)}:
+            raise RuntimeError(
+                f"Column {table}.{column} is outdated. Run `python {script}` once before starting the app."
+            )
+
+
+def _create_missing_indexes(conn) -> None:
+    """create_all() skips existing tables, so add indexes introduced later."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
 async def init_db():
-    """Create all tables. Call on startup."""
+    """Create all tables (and missing columns and indexes). Call on startup."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_check_legacy_columns)
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+    if replica_engine is not engine:
+        # Schema arrives via replication; only detect what the replica offers
+        from db.fts import detect_fts
+
+        async with replica_engine.connect() as conn:
+            await conn.run_sync(detect_fts)
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""SQLite FTS5 full-text index over use cases.
+
+The `use_cases_fts` virtual table mirrors title, description, expected
+benefit and stakeholder names of every use case (rowid = use case id) and
+is kept in sync by triggers, so raw SQL writes are indexed as well.
+
+The trigram tokenizer keeps the substring semantics of the former
+`ILIKE '%term%'` search (important for German compound words) while
+answering from the index. On other databases, or SQLite builds without
+FTS5, nothing is created and search falls back to ILIKE.
+"""
+
+import logging
+import weakref
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from db.database import Base
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "use_cases_fts"
+
+# Trigram queries need at least 3 characters to match anything
+MIN_TERM_LENGTH = 3
+
+# Engines whose database carries the FTS index
+_available: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+# Stakeholders are stored as a JSON array of {"name", "role"} objects
+_STAKEHOLDER_NAMES = (
+    "(SELECT group_concat(json_extract(value, '$.name'), ' ') "
+    "FROM json_each(CASE WHEN json_valid({row}.stakeholders) THEN {row}.stakeholders END) "
+    "WHERE type = 'object')"
+)
+
+_INSERT_ROW = (
+    f"INSERT INTO {FTS_TABLE}(rowid, title, description, expected_benefit, stakeholders) "
+    "VALUES (new.id, new.title, new.description, new.expected_benefit, "
+    f"{_STAKEHOLDER_NAMES.format(row='new')});"
+)
+
+_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON use_cases BEGIN
+        {_INSERT_ROW}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON use_cases BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF title, description, expected_benefit, stakeholders ON use_cases BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        {_INSERT_ROW}
+    END""",
+]
+
+
+def fts_available(bind: Engine | Connection) -> bool:
+    """True once the FTS index has been created on the bind's database."""
+    return bind.engine in _available
+
+
+def _fts_table_exists(connection) -> bool:
+    return connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first() is not None
+
+
+def detect_fts(connection) -> None:
+    """Register the connection's engine if its database already has the index.
+
+    Used for read replicas, whose schema is created on the primary.
+    """
+    if connection.dialect.name == "sqlite" and _fts_table_exists(connection):
+        _available.add(connection.engine)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_fts(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+
+    if not _fts_table_exists(connection):
+        try:
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                "title, description, expected_benefit, stakeholders, tokenize = 'trigram')"
+            )
+        except OperationalError as e:
+            logger.warning("FTS5 unavailable, use case search falls back to ILIKE: %s", e)
+            _available.discard(connection.engine)
+            return
+
+        # Backfill rows that existed before the index
+        connection.exec_driver_sql(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, description, expected_benefit, stakeholders) "
+            "SELECT id, title, description, expected_benefit, "
+            f"{_STAKEHOLDER_NAMES.format(row='use_cases')} FROM use_cases"
+        )
+
+    for ddl in _TRIGGERS:
+        connection.exec_driver_sql(ddl)
+    _available.add(connection.engine)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_fts(target, connection, **kw):
+    if connection.dialect.name != "sqlite":
+        return
+    # Triggers are dropped together with the use_cases table
+    connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    _available.discard(connection.engine)
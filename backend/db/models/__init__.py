@@ -5,6 +5,9 @@ from db.models.company import Company
 from db.models.user import User, Role
 from db.models.transcript import Transcript
 from db.models.use_case import UseCase, UseCaseStatus
+from db.models.agent_session import AgentSession
+from db.models.extraction_job import ExtractionJob, JobStatus
+import db.fts  # noqa: F401 — registers the use case FTS index DDL
 
 __all__ = [
     "Industry",
@@ -14,4 +17,7 @@ __all__ = [
     "Transcript",
     "UseCase",
     "UseCaseStatus",
+    "AgentSession",
+    "ExtractionJob",
+    "JobStatus",
 ]
\ No newline at end of file
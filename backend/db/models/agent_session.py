@@ -0,0 +1,29 @@
+"""Chat agent session state shared by all workers."""
+
+from datetime import datetime
+from sqlalchemy import String, LargeBinary, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.database import Base
+
+
+class AgentSession(Base):
+    """Conversation history and pending file attachment of one chat session.
+
+    Payloads are zlib-compressed JSON, see services.session_store.
+    """
+
+    __tablename__ = "agent_sessions"
+    __table_args__ = (
+        Index("ix_agent_sessions_updated_at", "updated_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    history: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    message_count: Mapped[int] = mapped_column(default=0)
+    pending_file: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    # Set in Python on every write; drives idle expiry
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<AgentSession(id='{self.id}', messages={self.message_count})>"
@@ -14,27 +14,27 @@ class Company(Base):
     
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(200), unique=True, nullable=False)
-    industry_id: Mapped[int] = mapped_column(ForeignKey("industries.id"), nullable=False)
+    industry_id: Mapped[int] = mapped_column(ForeignKey("industries.id"), nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now()
     )
     
-    # Relationships
+    # Relationships (never loaded implicitly — request them per query via selectinload/joinedload)
     industry: Mapped["Industry"] = relationship(
         "Industry",
         back_populates="companies",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     transcripts: Mapped[list["Transcript"]] = relationship(
         "Transcript",
         back_populates="company",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     use_cases: Mapped[list["UseCase"]] = relationship(
         "UseCase",
         back_populates="company",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     
     def __repr__(self) -> str:
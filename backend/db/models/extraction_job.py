@@ -0,0 +1,47 @@
+"""Background use case extraction job."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any
+from sqlalchemy import Text, DateTime, ForeignKey, Index, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.database import Base
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of an extraction job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ExtractionJob(Base):
+    """One queued LLM extraction of a transcript, see services.jobs."""
+
+    __tablename__ = "extraction_jobs"
+    __table_args__ = (
+        Index("ix_extraction_jobs_status", "status"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    transcript_id: Mapped[int] = mapped_column(ForeignKey("transcripts.id"), nullable=False)
+    created_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
+    status: Mapped[JobStatus] = mapped_column(default=JobStatus.QUEUED)
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int] = mapped_column(default=1)
+    # Last failure, kept while the job waits for a retry
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # IDs of the use cases created by a successful run
+    use_case_ids: Mapped[list[Any] | None] = mapped_column(JSON, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now()
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ExtractionJob(id={self.id}, transcript_id={self.transcript_id}, status='{self.status}')>"
@@ -24,7 +24,7 @@ class Industry(Base):
     companies: Mapped[list["Company"]] = relationship(
         "Company", 
         back_populates="industry",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     
     def __repr__(self) -> str:
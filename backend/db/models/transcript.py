@@ -1,7 +1,8 @@
 """Transcript model for uploaded workshop transcripts."""
 
+import zlib
 from datetime import datetime
-from sqlalchemy import String, Text, DateTime, ForeignKey, func
+from sqlalchemy import String, LargeBinary, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.database import Base
@@ -11,10 +12,19 @@ class Transcript(Base):
     """Workshop transcript uploaded for analysis."""
     
     __tablename__ = "transcripts"
+    __table_args__ = (
+        Index("ix_transcripts_created_at", "created_at"),
+        Index("ix_transcripts_company_created_at", "company_id", "created_at"),
+        # One transcript per content and company; re-uploads resolve to it
+        Index("uq_transcripts_company_content_hash", "company_id", "content_hash", unique=True),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
-    content: Mapped[str] = mapped_column(Text, nullable=False)
+    # zlib-compressed UTF-8 text, read and written via `content`; only loaded where explicitly undeferred
+    content_z: Mapped[bytes] = mapped_column(LargeBinary, nullable=False, deferred=True, deferred_raiseload=True)
+    # SHA-256 of the UTF-8 content; NULL for rows stored before hashing was added
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), nullable=False)
     uploaded_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
@@ -26,13 +36,22 @@ class Transcript(Base):
     company: Mapped["Company"] = relationship(
         "Company",
         back_populates="transcripts",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     use_cases: Mapped[list["UseCase"]] = relationship(
         "UseCase",
         back_populates="transcript",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     
+    @property
+    def content(self) -> str:
+        """Transcript text; load with `undefer(Transcript.content_z)`."""
+        return zlib.decompress(self.content_z).decode("utf-8")
+
+    @content.setter
+    def content(self, text: str) -> None:
+        self.content_z = zlib.compress(text.encode("utf-8"))
+
     def __repr__(self) -> str:
         return f"<Transcript(id={self.id}, filename='{self.filename}')>"
\ No newline at end of file
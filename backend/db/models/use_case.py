@@ -3,7 +3,8 @@
 from datetime import datetime
 from enum import Enum
 from typing import Any
-from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, func, JSON
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, Index, func, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.database import Base
@@ -33,11 +34,23 @@ class UseCase(Base):
     """Use Case extracted from workshops or created manually."""
     
     __tablename__ = "use_cases"
+    __table_args__ = (
+        # Listing is ordered by (created_at, id); each hot filter gets a
+        # matching prefix so filter + sort + keyset cursor use one index.
+        Index("ix_use_cases_created_at_id", "created_at", "id"),
+        Index("ix_use_cases_company_created_at", "company_id", "created_at", "id"),
+        Index("ix_use_cases_status_created_at", "status", "created_at", "id"),
+        Index("ix_use_cases_transcript_id", "transcript_id"),
+        # Containment queries on stakeholders (@>) — PostgreSQL only
+        Index("ix_use_cases_stakeholders", "stakeholders", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(300), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
-    stakeholders: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    stakeholders: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=True
+    )
     expected_benefit: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[UseCaseStatus] = mapped_column(default=UseCaseStatus.NEW)
     
@@ -68,12 +81,12 @@ class UseCase(Base):
     company: Mapped["Company"] = relationship(
         "Company",
         back_populates="use_cases",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     transcript: Mapped["Transcript | None"] = relationship(
         "Transcript",
         back_populates="use_cases",
-        lazy="selectin"
+        lazy="raise_on_sql"
     )
     
     def __repr__(self) -> str:
@@ -0,0 +1,162 @@
+"""Index advisor: EXPLAIN QUERY PLAN for every query the API issues.
+
+Seeds an in-memory SQLite database, drives the read endpoints and the
+read-only agent tools against it, captures every SELECT they emit and
+runs EXPLAIN QUERY PLAN on each one. Exits with status 1 if any plan
+contains a full table scan.
+
+Usage:
+    python index_advisor.py [-v]
+"""
+
+import asyncio
+import re
+import sys
+from dataclasses import dataclass
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from core.security import create_access_token
+from db.database import Base, get_db, get_read_db
+from db.models import Company, Industry, Role, Transcript, UseCase, User
+from main import app
+from services.tools import execute_tool
+
+# "SCAN use_cases" is a full scan; "SCAN use_cases USING [COVERING] INDEX ..."
+# and virtual-table (FTS) scans are not. Older SQLite prints "SCAN TABLE x".
+_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$")
+
+ENDPOINTS = [
+    "/api/use-cases/",
+    "/api/use-cases/?include_total=false",
+    "/api/use-cases/?company_id=1",
+    "/api/use-cases/?status=new",
+    "/api/use-cases/?company_id=1&status=new",
+    "/api/use-cases/?industry_id=1",
+    "/api/use-cases/?search=Kunden",
+    "/api/use-cases/search?q=Kunden",
+    "/api/use-cases/1",
+    "/api/transcripts/",
+    "/api/transcripts/?company_id=1",
+    "/api/transcripts/1",
+    "/api/companies/",
+    "/api/industries/",
+    "/api/auth/me",
+    "/api/auth/users",
+]
+
+TOOL_CALLS = [
+    ("list_use_cases", {}),
+    ("list_use_cases", {"company_id": 1, "status": "new"}),
+    ("list_use_cases", {"search": "Kunden"}),
+    ("get_use_case", {"use_case_id": 1}),
+    ("list_companies", {}),
+    ("list_industries", {}),
+]
+
+
+@dataclass
+class QueryPlan:
+    """A captured statement with its plan and any fully scanned tables."""
+    statement: str
+    plan: list[str]
+    full_scans: list[str]
+
+
+async def _seed(session: AsyncSession) -> User:
+    industry = Industry(name="Gesundheitswesen")
+    session.add(industry)
+    await session.flush()
+    company = Company(name="Klinikum", industry_id=industry.id)
+    admin = User(email="admin@example.com", password_hash="-", role=Role.ADMIN)
+    session.add_all([company, admin])
+    await session.flush()
+    transcript = Transcript(filename="workshop.txt", content="Kundenanalyse", company_id=company.id)
+    session.add(transcript)
+    await session.flush()
+    for i in range(3):
+        session.add(UseCase(
+            title=f"Kundenanalyse {i}",
+            description="Analyse von Kundendaten.",
+            stakeholders=[{"name": "Anna Schmidt", "role": "Controlling"}],
+            company_id=company.id,
+            transcript_id=transcript.id,
+        ))
+    await session.commit()
+    return admin
+
+
+async def collect_query_plans() -> list[QueryPlan]:
+    """Run all endpoints and tools, return the plan of every distinct SELECT."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    captured: dict[str, tuple] = {}
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.setdefault(statement, parameters)
+
+    async with session_maker() as session:
+        admin = await _seed(session)
+
+        async def _override_get_db():
+            yield session
+
+        previous = dict(app.dependency_overrides)
+        app.dependency_overrides[get_db] = _override_get_db
+        app.dependency_overrides[get_read_db] = _override_get_db
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            headers = {"Authorization": f"Bearer {create_access_token(admin.id, admin.email, admin.role.value)}"}
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://advisor") as client:
+                for path in ENDPOINTS:
+                    res = await client.get(path, headers=headers)
+                    res.raise_for_status()
+                # Second page via keyset cursor
+                res = await client.get("/api/use-cases/?per_page=1", headers=headers)
+                await client.get(f"/api/use-cases/?per_page=1&cursor={res.json()['next_cursor']}", headers=headers)
+            for name, args in TOOL_CALLS:
+                await execute_tool(name, args, session, admin)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+            app.dependency_overrides = previous
+
+    table_names = set(Base.metadata.tables)
+    plans = []
+    async with engine.connect() as conn:
+        for statement, parameters in captured.items():
+            rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+            details = [row[-1] for row in rows]
+            full_scans = [
+                m.group(1) for d in details
+                if (m := _FULL_SCAN.match(d)) and m.group(1) in table_names
+            ]
+            plans.append(QueryPlan(statement=statement, plan=details, full_scans=full_scans))
+
+    await engine.dispose()
+    return plans
+
+
+def main() -> int:
+    verbose = "-v" in sys.argv[1:]
+    plans = asyncio.run(collect_query_plans())
+    offenders = [p for p in plans if p.full_scans]
+
+    for p in plans:
+        if p.full_scans or verbose:
+            marker = "❌ FULL SCAN" if p.full_scans else "✅"
+            print(f"{marker} {' '.join(p.statement.split())}")
+            for line in p.plan:
+                print(f"      {line}")
+
+    print(f"\n{len(plans)} queries checked, {len(offenders)} with full table scans")
+    return 1 if offenders else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,13 +8,19 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import get_settings
-from db.database import get_db, init_db
+from core.metrics import MetricsMiddleware
+from db.database import RequestScopeMiddleware, get_db, init_db
 from api.auth import router as auth_router
 from api.transcripts import router as transcripts_router
 from api.use_cases import router as use_cases_router
 from api.chat import router as chat_router
 from api.companies import router as companies_router
 from api.industries import router as industries_router
+from api.jobs import router as jobs_router
+from api.metrics import router as metrics_router
+from services.jobs import job_queue
+from services.llm import close_response_cache, open_response_cache
+from services.uploads import sweep_stashes
 
 settings = get_settings()
 
@@ -24,7 +30,12 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events."""
     await init_db()
     print("✅ Database initialized")
+    open_response_cache()
+    await job_queue.recover()
+    sweep_stashes()  # Chat attachments left behind by sessions that expired meanwhile
     yield
+    await job_queue.stop()
+    close_response_cache()
     print("👋 Shutting down")
 
 
@@ -43,6 +54,12 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+# Read-your-writes tracking for replica-routed read sessions; SQL statement counts in dev
+app.add_middleware(RequestScopeMiddleware, query_headers=settings.env == "development")
+
+# Request latency per route for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Routers
 app.include_router(auth_router, prefix="/api")
 app.include_router(transcripts_router, prefix="/api")
@@ -50,6 +67,8 @@ app.include_router(use_cases_router, prefix="/api")
 app.include_router(chat_router, prefix="/api")
 app.include_router(companies_router, prefix="/api")
 app.include_router(industries_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
+app.include_router(metrics_router)
 
 
 @app.get("/health")
@@ -6,9 +6,16 @@ from pydantic import BaseModel, Field
 class ChatRequest(BaseModel):
     """Incoming chat message from the user."""
     message: str = Field(..., min_length=1)
-    session_id: str = Field(..., min_length=1)
-    file_content: str | None = Field(None, max_length=512_000)
+    session_id: str = Field(..., min_length=1, max_length=64)
+    # Name of a file attached via POST /chat/attachments, or sent inline with file_content
     file_name: str | None = None
+    file_content: str | None = Field(None, max_length=512_000)
+
+
+class ChatAttachmentResponse(BaseModel):
+    """A file attached to a chat session, waiting for save_transcript."""
+    filename: str
+    size: int
 
 
 class ChatResponse(BaseModel):
@@ -22,3 +22,11 @@ class ExtractionResult(BaseModel):
     use_cases: list[ExtractedUseCase] = Field(
         ..., min_length=1, description="Liste der extrahierten Use Cases"
     )
+
+
+class ChunkExtractionResult(ExtractionResult):
+    """Extraction result for one chunk of a long transcript; may be empty."""
+
+    use_cases: list[ExtractedUseCase] = Field(
+        default_factory=list, description="Im Abschnitt gefundene Use Cases"
+    )
@@ -0,0 +1,23 @@
+"""Pydantic schemas for background jobs."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from db.models.extraction_job import JobStatus
+
+
+class ExtractionJobResponse(BaseModel):
+    """Status of a background extraction job."""
+    id: int
+    transcript_id: int
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    error: str | None = None
+    use_case_ids: list[int] | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict
 
+from schemas.job import ExtractionJobResponse
 from schemas.use_case import UseCaseResponse
 
 
@@ -32,6 +33,11 @@ class TranscriptWithContent(TranscriptResponse):
     content: str
 
 
-class TranscriptWithUseCases(TranscriptResponse):
-    """Transcript response including extracted use cases."""
+class TranscriptUploadResponse(TranscriptResponse):
+    """Uploaded transcript with its latest extraction job and use cases so far.
+
+    `duplicate` is set when the content was uploaded for this company before.
+    """
+    duplicate: bool = False
+    job: ExtractionJobResponse | None = None
     use_cases: list[UseCaseResponse] = []
@@ -67,9 +67,20 @@ class UseCaseResponse(UseCaseBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class UseCaseSearchResult(BaseModel):
+    """Ranked full-text search hit; highlights are HTML-escaped with <mark> tags."""
+    use_case: UseCaseResponse
+    score: float | None = None
+    title_highlight: str
+    snippet: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class UseCaseListResponse(BaseModel):
     """Paginated list of use cases."""
     data: list[UseCaseResponse]
-    total: int
+    total: int | None = None
     page: int = 1
-    per_page: int = 20
\ No newline at end of file
+    per_page: int = 20
+    next_cursor: str | None = None
\ No newline at end of file
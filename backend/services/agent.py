@@ -1,14 +1,21 @@
 """Agent service: tool-calling loop with conversation memory."""
 
+import asyncio
 import json
 import logging
+import time
+from typing import AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from core.config import get_settings
+from core.metrics import llm_request_duration
 from db.models import User
-from services.llm import client as _client
-from services.tools import TOOL_DEFINITIONS, execute_tool
+from services.history import compact_messages
+from services.llm import client as _client, limiter as _limiter, record_usage
+from services.llm_limiter import Priority
+from services.session_store import create_session_backend
+from services.tools import execute_tool, is_read_only, tools_for
 import services.tool_handlers  # noqa: F401 — registers all tools on import
 
 logger = logging.getLogger(__name__)
@@ -47,94 +54,216 @@ einzeln aufzulisten. Das gilt für Use Cases, Unternehmen, Branchen und alle and
 
 MAX_TOOL_ROUNDS = 10
 
-# In-memory conversation storage (keyed by session_id)
-_sessions: dict[str, list[dict]] = {}
+# Earlier user turns whose intents still count for the tool list (follow-ups refer back)
+INTENT_HISTORY_TURNS = 4
 
-# Temporary file storage for chat uploads (keyed by session_id)
-_file_store: dict[str, dict] = {}
+# Conversation history and chat uploads (keyed by session_id)
+session_store = create_session_backend(settings)
 
 
-def store_file(session_id: str, filename: str, content: str) -> None:
-    """Store an uploaded file for later use by tools."""
-    _file_store[session_id] = {"filename": filename, "content": content}
+async def store_file(session_id: str, filename: str, content_hash: str) -> None:
+    """Attach a stashed upload (see services.uploads) for later use by tools."""
+    await session_store.store_file(session_id, filename, content_hash)
 
 
-def get_file(session_id: str) -> dict | None:
+async def get_file(session_id: str) -> dict | None:
     """Retrieve and remove the stored file for a session."""
-    return _file_store.pop(session_id, None)
+    return await session_store.pop_file(session_id)
 
 
-def _get_history(session_id: str) -> list[dict]:
-    """Get or create conversation history for a session."""
-    if session_id not in _sessions:
-        _sessions[session_id] = []
-    return _sessions[session_id]
+def _recent_user_turns(history: list[dict], user_message: str) -> list[str]:
+    """The current message and up to INTENT_HISTORY_TURNS user messages before it."""
+    earlier = [
+        m["content"] for m in history
+        if m.get("role") == "user" and isinstance(m.get("content"), str)
+    ]
+    return earlier[-INTENT_HISTORY_TURNS:] + [user_message]
 
 
-async def run_agent(
+def _is_error(tool_result: str) -> bool:
+    """True if execute_tool() returned an {"error": ...} payload."""
+    parsed = json.loads(tool_result)
+    return isinstance(parsed, dict) and "error" in parsed
+
+
+def _batches(calls: list[dict]) -> list[list[dict]]:
+    """Group consecutive read-only tool calls; every mutating call stands alone.
+
+    Batches run in order, so a read requested after a write still sees it.
+    """
+    batches: list[list[dict]] = []
+    for call in calls:
+        read_only = is_read_only(call["function"]["name"])
+        if read_only and batches and is_read_only(batches[-1][-1]["function"]["name"]):
+            batches[-1].append(call)
+        else:
+            batches.append([call])
+    return batches
+
+
+async def _execute_batch(
+    batch: list[tuple[str, dict]],
+    db: AsyncSession,
+    user: User | None,
+    session_id: str,
+    read_sessions: async_sessionmaker | None,
+) -> list[str]:
+    """Execute a batch of (name, args) tool calls and return results in call order.
+
+    Several read-only calls fan out concurrently, each on its own session
+    (an AsyncSession must not be shared between concurrent tasks).
+    """
+    if len(batch) == 1 or read_sessions is None:
+        return [await execute_tool(name, args, db, user, session_id) for name, args in batch]
+
+    async def _isolated(name: str, args: dict) -> str:
+        async with read_sessions() as session:
+            return await execute_tool(name, args, session, user, session_id)
+
+    return list(await asyncio.gather(*(_isolated(name, args) for name, args in batch)))
+
+
+async def stream_agent(
     user_message: str,
     session_id: str,
     db: AsyncSession,
     user: User | None = None,
-) -> tuple[str, list[str]]:
-    """Run the agent loop for a user message.
-
-    Returns:
-        Tuple of (assistant_reply, list_of_tool_names_called).
+    read_sessions: async_sessionmaker | None = None,
+) -> AsyncIterator[dict]:
+    """Run the agent loop for a user message, yielding progress events.
+
+    Read-only tool calls of one turn run concurrently on sessions from
+    `read_sessions` (sequentially on `db` if not given); mutating calls run
+    one at a time in the order the model requested them.
+
+    Every LLM round is streamed. Events:
+        {"type": "delta", "content": str}            — text token(s)
+        {"type": "tool_start", "name": str, "arguments": dict}
+        {"type": "tool_end", "name": str, "ok": bool}
+        {"type": "done", "reply": str, "tool_calls_made": list[str]}
     """
-    history = _get_history(session_id)
-    history.append({"role": "user", "content": user_message})
+    user_turn = {"role": "user", "content": user_message}
+    history = await session_store.load(session_id)
 
-    messages = [{"role": "system", "content": SYSTEM_PROMPT}] + history
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}] + history + [user_turn]
+
+    # Only tools the user may call and, optionally, that match the intents of the recent user turns
+    tools = tools_for(
+        user.role if user else None,
+        *(_recent_user_turns(history, user_message) if settings.chat_tool_intent_filter else ()),
+    )
 
     tools_called: list[str] = []
 
     for _ in range(MAX_TOOL_ROUNDS):
         kwargs = {
             "model": settings.openrouter_model,
-            "messages": messages,
+            "messages": compact_messages(
+                messages,
+                budget=settings.chat_prompt_token_budget,
+                keep_recent_turns=settings.chat_keep_recent_turns,
+                tool_result_chars=settings.chat_tool_result_chars,
+            ),
             "temperature": 0.3,
+            "stream": True,
+            "stream_options": {"include_usage": True},
         }
-        if TOOL_DEFINITIONS:
-            kwargs["tools"] = TOOL_DEFINITIONS
+        if tools:
+            kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
 
-        response = await _client.chat.completions.create(**kwargs)
-        choice = response.choices[0]
+        content_parts: list[str] = []
+        # Tool calls arrive in fragments, keyed by their index
+        tool_calls: dict[int, dict] = {}
+        outcome, start = "error", time.perf_counter()
+        # The slot is held while the response streams in
+        async with _limiter.slot(Priority.INTERACTIVE):
+            try:
+                stream = await _limiter.send(lambda: _client.chat.completions.create(**kwargs))
+                async for chunk in stream:
+                    # With include_usage the last chunk carries the token counts and no choices
+                    record_usage("chat_stream", chunk.usage)
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield {"type": "delta", "content": delta.content}
+                    for fragment in delta.tool_calls or []:
+                        call = tool_calls.setdefault(fragment.index, {
+                            "id": "", "type": "function", "function": {"name": "", "arguments": ""},
+                        })
+                        if fragment.id:
+                            call["id"] = fragment.id
+                        if fragment.function and fragment.function.name:
+                            call["function"]["name"] += fragment.function.name
+                        if fragment.function and fragment.function.arguments:
+                            call["function"]["arguments"] += fragment.function.arguments
+                outcome = "ok"
+            finally:
+                llm_request_duration.observe(time.perf_counter() - start, "chat_stream", outcome)
+
+        content = "".join(content_parts)
 
         # If the model wants to call tools
-        if choice.message.tool_calls:
+        if tool_calls:
+            calls = [tool_calls[i] for i in sorted(tool_calls)]
             # Append assistant message with tool calls
-            messages.append(choice.message.model_dump())
+            messages.append({"role": "assistant", "content": content or None, "tool_calls": calls})
 
-            for tool_call in choice.message.tool_calls:
-                fn_name = tool_call.function.name
-                fn_args = json.loads(tool_call.function.arguments or "{}")
+            for batch in _batches(calls):
+                parsed = []
+                for call in batch:
+                    fn_name = call["function"]["name"]
+                    fn_args = json.loads(call["function"]["arguments"] or "{}")
+                    parsed.append((fn_name, fn_args))
 
-                logger.info("Tool call: %s(%s)", fn_name, fn_args)
-                tools_called.append(fn_name)
+                    logger.info("Tool call: %s(%s)", fn_name, fn_args)
+                    tools_called.append(fn_name)
+                    yield {"type": "tool_start", "name": fn_name, "arguments": fn_args}
 
-                result = await execute_tool(fn_name, fn_args, db, user, session_id)
+                results = await _execute_batch(parsed, db, user, session_id, read_sessions)
 
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "content": result,
-                })
+                for call, (fn_name, _), result in zip(batch, parsed, results):
+                    yield {"type": "tool_end", "name": fn_name, "ok": not _is_error(result)}
+                    messages.append({
+                        "role": "tool",
+                        "tool_call_id": call["id"],
+                        "content": result,
+                    })
 
             continue  # Next round — let the LLM process tool results
 
         # No tool calls — we have the final text response
-        reply = choice.message.content or ""
-        history.append({"role": "assistant", "content": reply})
+        await session_store.append(session_id, [user_turn, {"role": "assistant", "content": content}])
 
         logger.info(
             "Agent reply (session=%s, tools=%d): %s",
-            session_id, len(tools_called), reply[:100],
+            session_id, len(tools_called), content[:100],
         )
-        return reply, tools_called
+        yield {"type": "done", "reply": content, "tool_calls_made": tools_called}
+        return
 
     # Safety: max rounds exceeded
     fallback = "Entschuldigung, ich konnte die Anfrage nicht abschließen. Bitte versuche es erneut."
-    history.append({"role": "assistant", "content": fallback})
-    return fallback, tools_called
+    await session_store.append(session_id, [user_turn, {"role": "assistant", "content": fallback}])
+    yield {"type": "done", "reply": fallback, "tool_calls_made": tools_called}
+
+
+async def run_agent(
+    user_message: str,
+    session_id: str,
+    db: AsyncSession,
+    user: User | None = None,
+    read_sessions: async_sessionmaker | None = None,
+) -> tuple[str, list[str]]:
+    """Run the agent loop for a user message.
+
+    Returns:
+        Tuple of (assistant_reply, list_of_tool_names_called).
+    """
+    reply, tools_called = "", []
+    async for event in stream_agent(user_message, session_id, db, user, read_sessions):
+        if event["type"] == "done":
+            reply, tools_called = event["reply"], event["tool_calls_made"]
+    return reply, tools_called
@@ -0,0 +1,89 @@
+"""Content-addressed file store.
+
+Each blob is stored once under its SHA-256 (`<root>/ab/abcdef…`), so
+identical uploads share one file. Writes go to a temporary file first and
+are renamed into place, so a reader never sees a partial blob.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobWriter:
+    """Streams one blob to a temporary file; `commit()` moves it into place."""
+
+    def __init__(self, store: "BlobStore"):
+        self.store = store
+        self.size = 0
+        self._hash = hashlib.sha256()
+        store.root.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp = tempfile.mkstemp(dir=store.root, prefix=".tmp-")
+        self._file = os.fdopen(fd, "wb")
+        self._done = False
+
+    def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        self._file.write(data)
+        self.size += len(data)
+
+    def commit(self) -> str:
+        """Store the written bytes unless an identical blob exists; return the digest."""
+        digest = self._hash.hexdigest()
+        self._file.close()
+        path = self.store.path(digest)
+        try:
+            # Storing it again makes an existing blob new again, so an age-based sweep keeps it
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp, path)
+        else:
+            Path(self._tmp).unlink(missing_ok=True)
+        self._done = True
+        return digest
+
+    def abort(self) -> None:
+        self._file.close()
+        Path(self._tmp).unlink(missing_ok=True)
+        self._done = True
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self._done:
+            self.abort()
+
+
+class BlobStore:
+    """Blobs on disk, keyed by their SHA-256 hex digest."""
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).is_file()
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def put(self, data: bytes) -> str:
+        """Store `data` unless an identical blob exists; return its digest."""
+        with self.writer() as writer:
+            writer.write(data)
+            return writer.commit()
+
+    def get(self, digest: str) -> bytes:
+        return self.path(digest).read_bytes()
+
+    def delete(self, digest: str) -> None:
+        self.path(digest).unlink(missing_ok=True)
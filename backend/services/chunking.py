@@ -0,0 +1,74 @@
+"""Splitting long transcripts into overlapping chunks for extraction.
+
+Transcripts are split on speaker turns ("Name: text"); a transcript without
+recognisable speakers is split on blank lines. Turns are packed greedily
+into chunks of at most `max_chars`, and each chunk repeats the last turns
+of its predecessor (up to `overlap_chars`) so a use case discussed across
+the boundary is seen whole at least once.
+"""
+
+import re
+
+# "Lisa Weber:", "Moderator (BC):" at the start of a line
+SPEAKER_TURN = re.compile(r"^[^\s:][^:\n]{0,60}:(\s|$)")
+
+
+def split_turns(text: str) -> list[str]:
+    """Split a transcript into speaker turns (or paragraphs), keeping all text."""
+    lines = text.splitlines(keepends=True)
+    by_speaker = any(SPEAKER_TURN.match(line) for line in lines)
+
+    turns: list[str] = []
+    current: list[str] = []
+    for line in lines:
+        starts_turn = SPEAKER_TURN.match(line) if by_speaker else not line.strip()
+        if starts_turn and "".join(current).strip():
+            turns.append("".join(current))
+            current = []
+        current.append(line)
+    if "".join(current).strip():
+        turns.append("".join(current))
+    return turns
+
+
+def _split_long(turn: str, max_chars: int) -> list[str]:
+    """Cut a turn longer than `max_chars` at whitespace (hard cut if there is none)."""
+    pieces = []
+    while len(turn) > max_chars:
+        cut = turn.rfind(" ", 0, max_chars)
+        cut = cut if cut > 0 else max_chars
+        pieces.append(turn[:cut])
+        turn = turn[cut:]
+    return pieces + [turn] if turn else pieces
+
+
+def chunk_transcript(text: str, max_chars: int, overlap_chars: int) -> list[str]:
+    """Split `text` into chunks of at most `max_chars` with turn-aligned overlap.
+
+    A transcript that fits into one chunk is returned unchanged.
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    turns = [piece for turn in split_turns(text) for piece in _split_long(turn, max_chars)]
+
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for turn in turns:
+        if current and size + len(turn) > max_chars:
+            chunks.append("".join(current))
+            # Carry over trailing turns as overlap, leaving room for the next turn
+            overlap: list[str] = []
+            overlap_size = 0
+            for previous in reversed(current):
+                if overlap_size + len(previous) > min(overlap_chars, max_chars - len(turn)):
+                    break
+                overlap.insert(0, previous)
+                overlap_size += len(previous)
+            current, size = overlap, overlap_size
+        current.append(turn)
+        size += len(turn)
+    if current:
+        chunks.append("".join(current))
+    return chunks
@@ -1,16 +1,27 @@
 """Use Case extraction from workshop transcripts via LLM."""
 
+import asyncio
 import logging
+import re
+from difflib import SequenceMatcher
 
 from pydantic import ValidationError
 
-from schemas.extraction import ExtractionResult, ExtractedUseCase
-from services.llm import chat_completion_json
+from core.config import get_settings
+from core.metrics import extraction_attempts
+from schemas.extraction import ChunkExtractionResult, ExtractionResult, ExtractedUseCase
+from services.chunking import chunk_transcript
+from services.llm import chat_completion_json, forget_completion
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 MAX_RETRIES = 2
 
+# Use cases from different chunks with titles at least this similar are merged
+DUPLICATE_TITLE_SIMILARITY = 0.8
+
 SYSTEM_PROMPT = """\
 Du bist ein Experte für die Analyse von Workshop-Transkripten.
 
@@ -41,13 +52,25 @@ Antwortformat:
 }\
 """
 
+CHUNK_NOTE = """
+
+Hinweis: Du erhältst nur einen Abschnitt eines längeren Transkripts. \
+Abschnitte überlappen sich am Rand. Extrahiere die Use Cases, die in diesem \
+Abschnitt besprochen werden. Enthält der Abschnitt keinen Use Case, antworte mit {"use_cases": []}.\
+"""
+
 
 async def extract_use_cases(transcript_content: str) -> list[ExtractedUseCase]:
     """Extract use cases from a transcript using the LLM.
 
-    Sends the transcript to the LLM, validates the response against
-    the ExtractionResult schema, and retries up to MAX_RETRIES times
-    if validation fails.
+    Transcripts longer than `EXTRACTION_CHUNK_CHARS` are split into
+    overlapping chunks on speaker turns (map), extracted concurrently with
+    at most `EXTRACTION_MAX_CONCURRENCY` LLM calls in flight, and the
+    results merged and deduplicated (reduce). Shorter transcripts go to the
+    LLM in one piece.
+
+    Each LLM response is validated against the extraction schema and
+    retried up to MAX_RETRIES times if validation fails.
 
     Args:
         transcript_content: The full text of the workshop transcript.
@@ -58,9 +81,48 @@ async def extract_use_cases(transcript_content: str) -> list[ExtractedUseCase]:
     Raises:
         ExtractionError: If extraction fails after all retries.
     """
+    chunks = chunk_transcript(
+        transcript_content,
+        max_chars=settings.extraction_chunk_chars,
+        overlap_chars=settings.extraction_chunk_overlap_chars,
+    )
+    if len(chunks) == 1:
+        return await _extract(chunks[0], SYSTEM_PROMPT, ExtractionResult)
+
+    logger.info("Transcript split into %d chunks (%d chars)", len(chunks), len(transcript_content))
+    semaphore = asyncio.Semaphore(settings.extraction_max_concurrency)
+
+    async def _extract_chunk(chunk: str) -> list[ExtractedUseCase]:
+        async with semaphore:
+            return await _extract(chunk, SYSTEM_PROMPT + CHUNK_NOTE, ChunkExtractionResult)
+
+    tasks = [asyncio.create_task(_extract_chunk(chunk)) for chunk in chunks]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # A missing chunk would silently lose use cases, whatever the error
+        # (or cancellation); stop the others so they don't keep using LLM calls
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    use_cases = merge_use_cases([uc for chunk_result in results for uc in chunk_result])
+    if not use_cases:
+        raise ExtractionError(f"No use cases found in any of {len(chunks)} transcript chunks")
+    logger.info("Extraction merged: %d use cases from %d chunks", len(use_cases), len(chunks))
+    return use_cases
+
+
+async def _extract(
+    content: str,
+    system_prompt: str,
+    schema: type[ExtractionResult],
+) -> list[ExtractedUseCase]:
+    """Extract use cases from one piece of transcript, retrying on invalid output."""
     messages = [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        {"role": "user", "content": transcript_content},
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": content},
     ]
 
     last_error = None
@@ -70,14 +132,19 @@ async def extract_use_cases(transcript_content: str) -> list[ExtractedUseCase]:
             logger.info("Extraction attempt %d/%d", attempt + 1, 1 + MAX_RETRIES)
 
             data = await chat_completion_json(messages)
-            result = ExtractionResult.model_validate(data)
+            result = schema.model_validate(data)
 
             logger.info("Extraction successful: %d use cases", len(result.use_cases))
+            extraction_attempts.inc("ok")
             return result.use_cases
 
         except (ValueError, ValidationError) as e:
             last_error = e
+            extraction_attempts.inc("retry" if attempt < MAX_RETRIES else "failed")
             logger.warning("Extraction attempt %d failed: %s", attempt + 1, e)
+            if isinstance(e, ValidationError):
+                # Don't serve the unusable response again for this prompt
+                await forget_completion(messages)
 
             if attempt < MAX_RETRIES:
                 # Add error feedback for the LLM to correct itself
@@ -100,3 +167,38 @@ async def extract_use_cases(transcript_content: str) -> list[ExtractedUseCase]:
 
 class ExtractionError(Exception):
     """Raised when LLM extraction fails after all retries."""
+
+
+def _normalize_title(title: str) -> str:
+    return re.sub(r"\W+", " ", title.lower()).strip()
+
+
+def merge_use_cases(use_cases: list[ExtractedUseCase]) -> list[ExtractedUseCase]:
+    """Merge duplicates found in overlapping chunks, keeping first-seen order.
+
+    Two use cases are duplicates if their normalized titles are at least
+    DUPLICATE_TITLE_SIMILARITY similar. The merged use case keeps the longer
+    description and expected benefit and the union of the stakeholders.
+    """
+    merged: list[ExtractedUseCase] = []
+    titles: list[str] = []
+    for uc in use_cases:
+        title = _normalize_title(uc.title)
+        match = next(
+            (i for i, seen in enumerate(titles)
+             if SequenceMatcher(None, title, seen).ratio() >= DUPLICATE_TITLE_SIMILARITY),
+            None,
+        )
+        if match is None:
+            merged.append(uc)
+            titles.append(title)
+            continue
+
+        kept = merged[match]
+        known = {s.name.casefold() for s in kept.stakeholders}
+        merged[match] = kept.model_copy(update={
+            "description": max(kept.description, uc.description, key=len),
+            "expected_benefit": max(kept.expected_benefit, uc.expected_benefit, key=len),
+            "stakeholders": kept.stakeholders + [s for s in uc.stakeholders if s.name.casefold() not in known],
+        })
+    return merged
@@ -0,0 +1,105 @@
+"""Token-budgeted compaction of the agent's prompt messages.
+
+Applied before every LLM round. Messages stay untouched while the prompt
+fits the budget; otherwise, in this order, until it fits:
+
+1. Tool results of earlier rounds are cut to `tool_result_chars`.
+2. Conversation turns older than the last `keep_recent_turns` are dropped
+   and replaced by a one-line summary of the questions asked.
+3. Tool results of the latest round are cut step by step (down to
+   `MIN_TOOL_RESULT_CHARS`).
+
+The system prompt, the recent turns and the message structure (every tool
+result still follows its tool call) are always kept, so a prompt may
+remain over budget if those alone exceed it.
+"""
+
+import json
+
+# Rough average for mixed German/English text and JSON; no tokenizer needed
+CHARS_PER_TOKEN = 4
+# Per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+MIN_TOOL_RESULT_CHARS = 200
+SUMMARY_QUESTION_CHARS = 80
+
+
+def estimate_tokens(message: dict) -> int:
+    """Approximate prompt tokens of one chat message."""
+    chars = len(message.get("content") or "")
+    if message.get("tool_calls"):
+        chars += len(json.dumps(message["tool_calls"], ensure_ascii=False))
+    return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def estimate_prompt_tokens(messages: list[dict]) -> int:
+    return sum(estimate_tokens(m) for m in messages)
+
+
+def _truncate(message: dict, max_chars: int) -> dict:
+    content = message.get("content") or ""
+    if len(content) <= max_chars:
+        return message
+    cut = f"{content[:max_chars]}… [gekürzt: {max_chars} von {len(content)} Zeichen]"
+    return {**message, "content": cut}
+
+
+def _summary(dropped: list[dict]) -> str:
+    questions = [
+        m["content"][:SUMMARY_QUESTION_CHARS] + ("…" if len(m["content"]) > SUMMARY_QUESTION_CHARS else "")
+        for m in dropped if m.get("role") == "user" and m.get("content")
+    ]
+    summary = f"[Frühere Unterhaltung gekürzt: {len(dropped)} Nachrichten ausgelassen."
+    if questions:
+        summary += " Frühere Fragen des Nutzers: " + " | ".join(questions)
+    return summary + "]"
+
+
+def compact_messages(
+    messages: list[dict],
+    *,
+    budget: int,
+    keep_recent_turns: int,
+    tool_result_chars: int,
+) -> list[dict]:
+    """Return `messages` (system prompt first) compacted to about `budget` tokens.
+
+    The input list is not modified.
+    """
+    if estimate_prompt_tokens(messages) <= budget:
+        return messages
+
+    system, rest = messages[0], list(messages[1:])
+
+    # Tool results after the last tool-calling assistant message belong to the latest round
+    last_call = max((i for i, m in enumerate(rest) if m.get("tool_calls")), default=-1)
+
+    # 1. Cut tool results of earlier rounds
+    rest = [
+        _truncate(m, tool_result_chars) if m.get("role") == "tool" and i < last_call else m
+        for i, m in enumerate(rest)
+    ]
+    compacted = [system] + rest
+    if estimate_prompt_tokens(compacted) <= budget:
+        return compacted
+
+    # 2. Drop turns before the last `keep_recent_turns` user messages
+    user_starts = [i for i, m in enumerate(rest) if m.get("role") == "user"]
+    keep = max(keep_recent_turns, 1)  # the current question is always kept
+    if len(user_starts) > keep:
+        split = user_starts[-keep]
+        dropped, rest = rest[:split], rest[split:]
+        system = {**system, "content": f"{system['content']}\n\n{_summary(dropped)}"}
+        compacted = [system] + rest
+        if estimate_prompt_tokens(compacted) <= budget:
+            return compacted
+
+    # 3. Cut the latest round's tool results too, halving the limit until the prompt fits
+    limit = tool_result_chars
+    while True:
+        rest = [_truncate(m, limit) if m.get("role") == "tool" else m for m in rest]
+        compacted = [system] + rest
+        if estimate_prompt_tokens(compacted) <= budget or limit <= MIN_TOOL_RESULT_CHARS:
+            return compacted
+        limit = max(limit // 2, MIN_TOOL_RESULT_CHARS)
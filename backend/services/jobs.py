@@ -0,0 +1,221 @@
+"""In-process background queue for transcript extraction.
+
+Jobs are persisted as `extraction_jobs` rows; the asyncio queue only carries
+their IDs. Each process runs `JOB_WORKERS` worker tasks, started on first
+use. A failed run is retried after `JOB_RETRY_BACKOFF_SECONDS`, doubling per
+attempt, until `JOB_MAX_ATTEMPTS` is reached.
+
+A worker claims a job with a conditional UPDATE (queued -> running), so a
+job runs once even if several processes hold its ID. On startup `recover()`
+re-enqueues queued jobs and running jobs older than
+`JOB_STALE_AFTER_SECONDS`, which were cut off by a restart.
+"""
+
+import asyncio
+import contextvars
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import undefer
+
+from core.config import Settings, get_settings
+from db.database import async_session_maker
+from db.models import ExtractionJob, JobStatus, Transcript, UseCase
+from services.extraction import extract_use_cases
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Queue of extraction job IDs with a fixed number of worker tasks."""
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        workers: int,
+        max_attempts: int,
+        backoff_seconds: float,
+        stale_after_seconds: float,
+    ):
+        self.session_maker = session_maker
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[int] | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._retries: set[asyncio.TimerHandle] = set()
+
+    async def enqueue(self, db: AsyncSession, transcript_id: int, user_id: int | None = None) -> ExtractionJob:
+        """Persist a job for the transcript (committing `db`) and queue it."""
+        job = ExtractionJob(transcript_id=transcript_id, created_by_id=user_id, max_attempts=self.max_attempts)
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        self._submit(job.id)
+        logger.info("Extraction job %d queued for transcript %d", job.id, transcript_id)
+        return job
+
+    async def recover(self) -> None:
+        """Re-enqueue jobs left over from a previous run of the app."""
+        stale = datetime.now(timezone.utc) - timedelta(seconds=self.stale_after_seconds)
+        async with self.session_maker() as db:
+            await db.execute(
+                update(ExtractionJob)
+                .where(ExtractionJob.status == JobStatus.RUNNING, ExtractionJob.started_at < stale)
+                .values(status=JobStatus.QUEUED)
+            )
+            job_ids = (await db.execute(
+                select(ExtractionJob.id).where(ExtractionJob.status == JobStatus.QUEUED).order_by(ExtractionJob.id)
+            )).scalars().all()
+            await db.commit()
+        for job_id in job_ids:
+            self._submit(job_id)
+        if job_ids:
+            logger.info("Recovered %d extraction jobs", len(job_ids))
+
+    async def join(self) -> None:
+        """Wait until every queued job has been processed (scheduled retries excluded)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Cancel the workers and pending retries; jobs stay in the database."""
+        for handle in self._retries:
+            handle.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._loop, self._queue, self._tasks, self._retries = None, None, [], set()
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        # Started from whichever request enqueues first; an empty context keeps the workers
+        # from inheriting that request's state (such as its db query counters)
+        self._tasks = [
+            contextvars.Context().run(loop.create_task, self._worker(), name=f"extraction-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    def _submit(self, job_id: int, delay: float = 0) -> None:
+        self._start()
+        if delay <= 0:
+            self._queue.put_nowait(job_id)
+            return
+
+        def _retry():
+            self._retries.discard(handle)
+            self._queue.put_nowait(job_id)
+
+        handle = self._loop.call_later(delay, _retry)
+        self._retries.add(handle)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run(job_id)
+            except Exception:
+                logger.exception("Extraction job %d crashed", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def run(self, job_id: int) -> None:
+        """Claim and execute one job; on failure schedule a retry or give up."""
+        async with self.session_maker() as db:
+            claimed = await db.execute(
+                update(ExtractionJob)
+                .where(ExtractionJob.id == job_id, ExtractionJob.status == JobStatus.QUEUED)
+                .values(
+                    status=JobStatus.RUNNING,
+                    attempts=ExtractionJob.attempts + 1,
+                    started_at=datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                return  # Already taken or finished
+            job = await db.get(ExtractionJob, job_id)
+            transcript = await db.get(Transcript, job.transcript_id, options=[undefer(Transcript.content_z)])
+
+        # No session is held during the LLM calls
+        try:
+            if transcript is None:
+                raise LookupError(f"Transcript {job.transcript_id} not found")
+            extracted = await extract_use_cases(transcript.content)
+        except Exception as e:
+            await self._failed(job, e)
+            return
+
+        # A failed write (constraint, lost connection) must not leave the job running
+        try:
+            async with self.session_maker() as db:
+                use_cases = [
+                    UseCase(
+                        title=item.title,
+                        description=item.description,
+                        stakeholders=[s.model_dump() for s in item.stakeholders],
+                        expected_benefit=item.expected_benefit,
+                        company_id=transcript.company_id,
+                        transcript_id=transcript.id,
+                        created_by_id=job.created_by_id,
+                    )
+                    for item in extracted
+                ]
+                db.add_all(use_cases)
+                await db.flush()
+                await db.execute(
+                    update(ExtractionJob).where(ExtractionJob.id == job_id).values(
+                        status=JobStatus.SUCCEEDED,
+                        error=None,
+                        use_case_ids=[uc.id for uc in use_cases],
+                        finished_at=datetime.now(timezone.utc),
+                    )
+                )
+                await db.commit()
+        except Exception as e:
+            await self._failed(job, e)
+            return
+        logger.info("Extraction job %d succeeded: %d use cases", job_id, len(use_cases))
+
+    async def _failed(self, job: ExtractionJob, error: Exception) -> None:
+        retry = job.attempts < job.max_attempts
+        async with self.session_maker() as db:
+            await db.execute(
+                update(ExtractionJob).where(ExtractionJob.id == job.id).values(
+                    status=JobStatus.QUEUED if retry else JobStatus.FAILED,
+                    error=str(error),
+                    finished_at=None if retry else datetime.now(timezone.utc),
+                )
+            )
+            await db.commit()
+
+        if retry:
+            delay = self.backoff_seconds * 2 ** (job.attempts - 1)
+            logger.warning(
+                "Extraction job %d attempt %d/%d failed, retrying in %.0fs: %s",
+                job.id, job.attempts, job.max_attempts, delay, error,
+            )
+            self._submit(job.id, delay)
+        else:
+            logger.error("Extraction job %d failed after %d attempts: %s", job.id, job.attempts, error)
+
+
+def create_job_queue(settings: Settings) -> JobQueue:
+    return JobQueue(
+        async_session_maker,
+        workers=settings.job_workers,
+        max_attempts=settings.job_max_attempts,
+        backoff_seconds=settings.job_retry_backoff_seconds,
+        stale_after_seconds=settings.job_stale_after_seconds,
+    )
+
+
+job_queue = create_job_queue(get_settings())
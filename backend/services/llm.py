@@ -2,32 +2,74 @@
 
 import json
 import logging
+import time
 
 from openai import AsyncOpenAI
 
 from core.config import get_settings
+from core.metrics import llm_request_duration, llm_tokens
+from services.llm_cache import LLMResponseCache, cache_key, create_llm_cache
+from services.llm_limiter import Priority, create_llm_limiter
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+# Retries are done by the limiter, which sees every caller
 client = AsyncOpenAI(
     base_url=settings.openrouter_base_url,
     api_key=settings.openrouter_api_key,
+    max_retries=0,
 )
 
+# Shared by every LLM call in this process (chat agent and extraction)
+limiter = create_llm_limiter(settings)
+
+# Responses of identical requests; opened in the app lifespan (None if disabled or not open)
+response_cache: LLMResponseCache | None = None
+
+
+def open_response_cache() -> None:
+    """Create the response cache from settings, on startup rather than at import."""
+    global response_cache
+    if response_cache is None:
+        response_cache = create_llm_cache(settings)
+
+
+def close_response_cache() -> None:
+    """Close the cache's disk connections on shutdown."""
+    global response_cache
+    if response_cache is not None:
+        response_cache.close()
+        response_cache = None
+
+
+def record_usage(call: str, usage) -> None:
+    """Count the tokens the provider reported for one call (`usage` may be None)."""
+    if usage is None:
+        return
+    llm_tokens.inc(call, "prompt", amount=usage.prompt_tokens or 0)
+    llm_tokens.inc(call, "completion", amount=usage.completion_tokens or 0)
+
 
 async def chat_completion(
     messages: list[dict[str, str]],
     model: str | None = None,
     temperature: float = 0.2,
+    use_cache: bool = True,
+    priority: Priority = Priority.BATCH,
 ) -> str:
     """Send messages to OpenRouter and return the assistant's text response.
 
+    An identical earlier request (same model, temperature and messages) is
+    answered from the response cache.
+
     Args:
         messages: OpenAI-format messages (role + content).
         model: Override the default model from settings.
         temperature: Sampling temperature (low = more deterministic).
+        use_cache: Set to False to always ask the model.
+        priority: Queue position when the limiter is saturated.
 
     Returns:
         The assistant message content as a string.
@@ -37,22 +79,50 @@ async def chat_completion(
     """
     model = model or settings.openrouter_model
 
+    cache = response_cache if use_cache else None
+    if cache is not None:
+        key = cache_key(model, temperature, messages)
+        if (cached := await cache.get(key)) is not None:
+            logger.info("LLM response from cache: %d chars", len(cached))
+            return cached
+
     logger.info("LLM request: model=%s, messages=%d", model, len(messages))
 
-    response = await client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=temperature,
-    )
+    outcome, start = "error", time.perf_counter()
+    try:
+        response = await limiter.call(
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+            ),
+            priority,
+        )
+        outcome = "ok"
+    finally:
+        llm_request_duration.observe(time.perf_counter() - start, "completion", outcome)
+    record_usage("completion", getattr(response, "usage", None))
 
     content = response.choices[0].message.content
     if not content:
         raise RuntimeError("LLM returned empty response")
 
     logger.info("LLM response: %d chars", len(content))
+    if cache is not None:
+        await cache.set(key, content)
     return content
 
 
+async def forget_completion(
+    messages: list[dict[str, str]],
+    model: str | None = None,
+    temperature: float = 0.2,
+) -> None:
+    """Drop a cached response the caller could not use, so a retry asks the model again."""
+    if response_cache is not None:
+        await response_cache.discard(cache_key(model or settings.openrouter_model, temperature, messages))
+
+
 async def chat_completion_json(
     messages: list[dict[str, str]],
     model: str | None = None,
@@ -78,4 +148,5 @@ async def chat_completion_json(
     try:
         return json.loads(text)
     except json.JSONDecodeError as e:
+        await forget_completion(messages, model, temperature)
         raise ValueError(f"LLM response is not valid JSON: {e}\nRaw: {raw[:500]}")
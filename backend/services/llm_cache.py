@@ -0,0 +1,191 @@
+"""Content-addressed cache for LLM responses.
+
+Keyed on a SHA-256 of (model, temperature, messages), so an identical
+request, such as re-extracting the same transcript, is answered without an
+API call. Two layers:
+
+- memory: per-worker LRU with TTL (`core.cache.TTLCache`)
+- disk: a SQLite file shared by all workers on the host, with the same
+  TTL and a cap on the number of entries (least recently used evicted)
+
+Disk access runs in a worker thread to keep the event loop free.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.cache import TTLCache
+from core.config import Settings
+
+# Relative LLM_CACHE_PATH values are resolved against backend/, not the working directory
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def cache_key(model: str, temperature: float, messages: list[dict]) -> str:
+    """Stable hash of everything that determines the response."""
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class LLMCacheStats:
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    memory_entries: int
+    disk_entries: int
+
+
+class _DiskCache:
+    """Blocking SQLite store; call through asyncio.to_thread.
+
+    Each thread keeps one connection, opened on first use; `close()`
+    closes all of them.
+    """
+
+    def __init__(self, path: Path, ttl: float, max_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")  # stored in the file, so once is enough
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """This thread's connection; use `with` on it for a transaction."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only ever used by this thread, but close() runs on another one
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every thread's connection; later calls open new ones."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created_at > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            conn.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,))
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, key: str | None = None) -> None:
+        with self._connect() as conn:
+            if key is None:
+                conn.execute("DELETE FROM llm_cache")
+            else:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class LLMResponseCache:
+    """Memory layer in front of an optional disk layer."""
+
+    def __init__(self, memory_entries: int, ttl: float, disk_path: Path | None = None, disk_entries: int = 0):
+        self.memory: TTLCache[str, str] = TTLCache(maxsize=memory_entries, ttl=ttl)
+        self.disk = _DiskCache(disk_path, ttl, disk_entries) if disk_path and disk_entries > 0 else None
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> str | None:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        if self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value)
+
+    async def discard(self, key: str) -> None:
+        """Forget a response, e.g. one the caller could not use."""
+        self.memory.pop(key)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete, key)
+
+    async def clear(self) -> None:
+        self.memory.clear()
+        self.disk_hits = self.misses = 0
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete)
+
+    def close(self) -> None:
+        """Close the disk layer's connections (the memory layer is kept)."""
+        if self.disk is not None:
+            self.disk.close()
+
+    async def stats(self) -> LLMCacheStats:
+        return LLMCacheStats(
+            memory_hits=self.memory.hits,
+            disk_hits=self.disk_hits,
+            misses=self.misses,
+            memory_entries=len(self.memory),
+            disk_entries=await asyncio.to_thread(self.disk.count) if self.disk is not None else 0,
+        )
+
+
+def create_llm_cache(settings: Settings) -> LLMResponseCache | None:
+    """Build the cache from settings; None if `LLM_CACHE_ENABLED` is off."""
+    if not settings.llm_cache_enabled:
+        return None
+    return LLMResponseCache(
+        memory_entries=settings.llm_cache_max_entries,
+        ttl=settings.llm_cache_ttl_seconds,
+        disk_path=BACKEND_DIR / settings.llm_cache_path if settings.llm_cache_path else None,
+        disk_entries=settings.llm_cache_max_disk_entries,
+    )
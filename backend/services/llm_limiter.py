@@ -0,0 +1,222 @@
+"""Process-wide limiter for LLM API calls.
+
+Every call to the provider goes through one `LLMLimiter`:
+
+- at most `max_concurrency` calls in flight; waiting callers are served by
+  priority (interactive chat before batch extraction), then in arrival order
+- a token bucket caps the request rate at `requests_per_second` (bursts up
+  to `burst`)
+- rate limits (429), overload (5xx) and connection errors are retried with
+  jittered exponential backoff, or after the provider's Retry-After. A 429
+  also pauses the bucket, so every caller backs off, not just the one that
+  was throttled. A Retry-After longer than `backoff_max` is not waited out;
+  the call fails instead of blocking its slot and every other caller.
+
+The OpenAI client must be created with `max_retries=0` so its own retries
+don't bypass the limiter.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+import openai
+
+from core.config import Settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    """Lower value is served first."""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+@dataclass
+class LLMLimiterStats:
+    in_flight: int
+    queued_interactive: int
+    queued_batch: int
+    throttled: int  # 429 responses received
+    retries: int
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Seconds the provider asked us to wait, if it said so."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        return None  # HTTP-date form; fall back to our own backoff
+    return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    return isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError))
+
+
+class LLMLimiter:
+    """Priority-ordered concurrency limit plus token bucket, with retries."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        requests_per_second: float,
+        burst: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ):
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._in_flight = 0
+        # (priority, arrival, future) of callers waiting for a slot
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._arrival = itertools.count()
+
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+
+        self.throttled = 0
+        self.retries = 0
+
+    # ---------- Concurrency ----------
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.BATCH) -> AsyncIterator[None]:
+        """Hold one of the `max_concurrency` slots, e.g. for the length of a stream."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._in_flight < self.max_concurrency and not self._waiters:
+            self._in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        entry = (int(priority), next(self._arrival), future)
+        heapq.heappush(self._waiters, entry)
+        try:
+            await future  # _release hands its slot over
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Slot was granted just before the cancel
+            elif entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # The slot passes on; _in_flight is unchanged
+                return
+        self._in_flight -= 1
+
+    # ---------- Rate ----------
+
+    async def _take_token(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            if self.requests_per_second <= 0:
+                return
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.requests_per_second)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.requests_per_second)
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": uniform in [0, capped exponential]
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    # ---------- Calls ----------
+
+    async def send(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run `request` under the rate limit, retrying transient failures.
+
+        Does not take a concurrency slot; use inside `slot()` or via `call()`.
+        """
+        attempt = 0
+        while True:
+            await self._take_token()
+            try:
+                return await request()
+            except Exception as e:
+                if not _is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                delay = _retry_after(e)
+                if delay is None:
+                    delay = self._backoff(attempt)
+                elif delay > self.backoff_max:
+                    # Waiting would hold the slot (and pause everyone) for that long
+                    logger.warning(
+                        "LLM call failed (%s), provider asks to wait %.0fs (max %.0fs); giving up",
+                        type(e).__name__, delay, self.backoff_max,
+                    )
+                    raise
+                if isinstance(e, openai.RateLimitError):
+                    self.throttled += 1
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    "LLM call failed (%s), retry %d/%d in %.1fs",
+                    type(e).__name__, attempt, self.max_retries, delay,
+                )
+                await asyncio.sleep(delay)
+
+    async def call(self, request: Callable[[], Awaitable[T]], priority: Priority = Priority.BATCH) -> T:
+        """Run `request` in a concurrency slot, under the rate limit, with retries."""
+        async with self.slot(priority):
+            return await self.send(request)
+
+    def stats(self) -> LLMLimiterStats:
+        pending = [p for p, _, future in self._waiters if not future.done()]
+        return LLMLimiterStats(
+            in_flight=self._in_flight,
+            queued_interactive=pending.count(Priority.INTERACTIVE),
+            queued_batch=pending.count(Priority.BATCH),
+            throttled=self.throttled,
+            retries=self.retries,
+        )
+
+
+def create_llm_limiter(settings: Settings) -> LLMLimiter:
+    return LLMLimiter(
+        max_concurrency=settings.llm_max_concurrency,
+        requests_per_second=settings.llm_requests_per_second,
+        burst=settings.llm_burst,
+        max_retries=settings.llm_max_retries,
+        backoff_base=settings.llm_backoff_base_seconds,
+        backoff_max=settings.llm_backoff_max_seconds,
+    )
@@ -0,0 +1,346 @@
+"""Chat agent session state: conversation history and pending file attachment.
+
+Two interchangeable backends (`CHAT_SESSION_BACKEND`):
+
+- `memory` — per-worker, fastest; a follow-up routed to another worker
+  starts a fresh conversation.
+- `database` — the `agent_sessions` table, shared by all workers. History
+  is stored as zlib-compressed JSON, so a turn costs one primary-key read
+  and one write of a few KB.
+
+Both enforce the same limits: sessions idle for longer than `idle_ttl`
+seconds expire, and per session at most `max_messages` messages and
+`max_bytes` of JSON are kept (oldest turns trimmed first). The memory
+backend additionally caps the number of sessions (LRU).
+"""
+
+import json
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import Settings
+from db.database import async_session_maker
+from db.models import AgentSession
+
+
+@dataclass
+class SessionStoreStats:
+    """Snapshot of what the store currently holds."""
+    sessions: int
+    messages: int
+    bytes: int
+    evicted_sessions: int
+    trimmed_messages: int
+
+
+def _size(message: dict) -> int:
+    return len(json.dumps(message, ensure_ascii=False, default=str).encode())
+
+
+def _trim(messages: list[dict], sizes: list[int], max_messages: int, max_bytes: int) -> int:
+    """Drop the oldest messages in place until both budgets hold; return how many.
+
+    The history must start with a user turn, so an assistant reply left
+    at the front without its question is dropped as well. The newest
+    message is always kept, even if it alone exceeds the byte budget.
+    """
+    total = sum(sizes)
+    dropped = 0
+    while len(messages) > 1 and (
+        len(messages) > max_messages
+        or total > max_bytes
+        or messages[0].get("role") != "user"
+    ):
+        messages.pop(0)
+        total -= sizes.pop(0)
+        dropped += 1
+    return dropped
+
+
+def _pack(value) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str).encode())
+
+
+def _unpack(blob: bytes):
+    return json.loads(zlib.decompress(blob))
+
+
+class SessionBackend(ABC):
+    """Storage for chat history and the pending file attachment per session."""
+
+    def __init__(self, idle_ttl: float, max_messages: int, max_bytes: int):
+        self.idle_ttl = idle_ttl
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._evicted = 0
+        self._trimmed = 0
+
+    @abstractmethod
+    async def load(self, session_id: str) -> list[dict]:
+        """Return a copy of the session's history (empty for unknown sessions)."""
+
+    @abstractmethod
+    async def append(self, session_id: str, messages: list[dict]) -> None:
+        """Append messages to a session, then enforce the budgets."""
+
+    @abstractmethod
+    async def store_file(self, session_id: str, filename: str, content_hash: str) -> None:
+        """Remember a stashed upload (see services.uploads) until a tool picks it up."""
+
+    @abstractmethod
+    async def pop_file(self, session_id: str) -> dict | None:
+        """Retrieve and remove the pending file ({"filename", "content_hash"})."""
+
+    @abstractmethod
+    async def clear(self, session_id: str | None = None) -> None:
+        """Drop one session, or all sessions if no id is given."""
+
+    @abstractmethod
+    async def stats(self) -> SessionStoreStats:
+        """Live sessions, messages and bytes held, plus eviction counters."""
+
+
+@dataclass
+class _Session:
+    messages: list[dict] = field(default_factory=list)
+    sizes: list[int] = field(default_factory=list)
+    bytes: int = 0
+    file: dict | None = None
+    last_access: float = 0.0
+
+
+class MemorySessionBackend(SessionBackend):
+    """In-process store with an LRU cap on the number of sessions."""
+
+    def __init__(self, max_sessions: int, idle_ttl: float, max_messages: int, max_bytes: int):
+        super().__init__(idle_ttl, max_messages, max_bytes)
+        self.max_sessions = max_sessions
+        # Ordered by last access, oldest first
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+
+    async def load(self, session_id: str) -> list[dict]:
+        session = self._get(session_id)
+        return list(session.messages) if session else []
+
+    async def append(self, session_id: str, messages: list[dict]) -> None:
+        session = self._get(session_id, create=True)
+        for message in messages:
+            session.messages.append(message)
+            session.sizes.append(_size(message))
+        self._trimmed += _trim(session.messages, session.sizes, self.max_messages, self.max_bytes)
+        session.bytes = sum(session.sizes)
+
+    async def store_file(self, session_id: str, filename: str, content_hash: str) -> None:
+        self._get(session_id, create=True).file = {"filename": filename, "content_hash": content_hash}
+
+    async def pop_file(self, session_id: str) -> dict | None:
+        session = self._get(session_id)
+        if session is None:
+            return None
+        file, session.file = session.file, None
+        return file
+
+    async def clear(self, session_id: str | None = None) -> None:
+        if session_id is None:
+            self._sessions.clear()
+        else:
+            self._sessions.pop(session_id, None)
+
+    async def stats(self) -> SessionStoreStats:
+        self._evict_idle()
+        return SessionStoreStats(
+            sessions=len(self._sessions),
+            messages=sum(len(s.messages) for s in self._sessions.values()),
+            bytes=sum(s.bytes for s in self._sessions.values()),
+            evicted_sessions=self._evicted,
+            trimmed_messages=self._trimmed,
+        )
+
+    def _get(self, session_id: str, create: bool = False) -> _Session | None:
+        self._evict_idle()
+        session = self._sessions.get(session_id)
+        if session is None:
+            if not create:
+                return None
+            session = self._sessions[session_id] = _Session()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._evicted += 1
+        session.last_access = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _evict_idle(self) -> None:
+        # LRU order is also idle order, so expired sessions sit at the front
+        deadline = time.monotonic() - self.idle_ttl
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.last_access > deadline:
+                break
+            self._sessions.popitem(last=False)
+            self._evicted += 1
+
+
+class DatabaseSessionBackend(SessionBackend):
+    """Store in the `agent_sessions` table, shared across workers.
+
+    Uses its own short transactions on the primary, independent of the
+    request's session. Expired rows are ignored on read and purged every
+    `purge_every` writes.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        idle_ttl: float,
+        max_messages: int,
+        max_bytes: int,
+        purge_every: int = 100,
+    ):
+        super().__init__(idle_ttl, max_messages, max_bytes)
+        self.session_maker = session_maker
+        self.purge_every = purge_every
+        self._writes = 0
+
+    def _cutoff(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.idle_ttl)
+
+    def _is_live(self, row: AgentSession | None) -> bool:
+        if row is None:
+            return False
+        updated_at = row.updated_at
+        if updated_at.tzinfo is None:  # SQLite drops the offset
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return updated_at > self._cutoff()
+
+    async def load(self, session_id: str) -> list[dict]:
+        async with self.session_maker() as db:
+            row = await db.get(AgentSession, session_id)
+            return _unpack(row.history) if self._is_live(row) else []
+
+    async def append(self, session_id: str, messages: list[dict]) -> None:
+        trimmed = 0
+
+        def _apply(db, row: AgentSession | None) -> None:
+            nonlocal trimmed
+            live = self._is_live(row)
+            history = _unpack(row.history) if live else []
+            history.extend(messages)
+            trimmed = _trim(history, [_size(m) for m in history], self.max_messages, self.max_bytes)
+            row = self._upsert(db, row, session_id)
+            if not live:
+                row.pending_file = None
+            row.history = _pack(history)
+            row.message_count = len(history)
+
+        await self._write(session_id, _apply)
+        self._trimmed += trimmed  # Of the attempt that was committed
+        await self._maybe_purge()
+
+    async def store_file(self, session_id: str, filename: str, content_hash: str) -> None:
+        def _apply(db, row: AgentSession | None) -> None:
+            if not self._is_live(row):
+                row = self._upsert(db, row, session_id)
+                row.history, row.message_count = _pack([]), 0
+            else:
+                row.updated_at = datetime.now(timezone.utc)
+            row.pending_file = _pack({"filename": filename, "content_hash": content_hash})
+
+        await self._write(session_id, _apply)
+
+    async def pop_file(self, session_id: str) -> dict | None:
+        async with self.session_maker() as db:
+            row = await db.get(AgentSession, session_id)
+            if not self._is_live(row) or row.pending_file is None:
+                return None
+            file = _unpack(row.pending_file)
+            row.pending_file = None
+            await db.commit()
+            return file
+
+    async def clear(self, session_id: str | None = None) -> None:
+        async with self.session_maker() as db:
+            stmt = delete(AgentSession)
+            if session_id is not None:
+                stmt = stmt.where(AgentSession.id == session_id)
+            await db.execute(stmt)
+            await db.commit()
+
+    async def stats(self) -> SessionStoreStats:
+        async with self.session_maker() as db:
+            sessions, messages, size = (await db.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(AgentSession.message_count), 0),
+                    func.coalesce(func.sum(
+                        func.length(AgentSession.history)
+                        + func.coalesce(func.length(AgentSession.pending_file), 0)
+                    ), 0),
+                ).where(AgentSession.updated_at > self._cutoff())
+            )).one()
+        return SessionStoreStats(
+            sessions=sessions,
+            messages=messages,
+            bytes=size,
+            evicted_sessions=self._evicted,
+            trimmed_messages=self._trimmed,
+        )
+
+    async def _write(self, session_id: str, apply: Callable[[AsyncSession, AgentSession | None], None]) -> None:
+        """Read the session's row, let `apply` change or create it, and commit.
+
+        Two requests can create the same session at once (e.g. an attachment
+        upload and the chat message right after it); the one that loses the
+        insert retries once on the row the other created.
+        """
+        for attempt in range(2):
+            async with self.session_maker() as db:
+                apply(db, await db.get(AgentSession, session_id))
+                try:
+                    await db.commit()
+                    return
+                except IntegrityError:
+                    await db.rollback()
+                    if attempt:
+                        raise
+
+    @staticmethod
+    def _upsert(db, row: AgentSession | None, session_id: str) -> AgentSession:
+        now = datetime.now(timezone.utc)
+        if row is None:
+            row = AgentSession(id=session_id, updated_at=now)
+            db.add(row)
+        else:
+            # An expired row is reused as a fresh session
+            row.updated_at = now
+        return row
+
+    async def _maybe_purge(self) -> None:
+        self._writes += 1
+        if self._writes % self.purge_every:
+            return
+        async with self.session_maker() as db:
+            result = await db.execute(delete(AgentSession).where(AgentSession.updated_at <= self._cutoff()))
+            await db.commit()
+        self._evicted += result.rowcount or 0
+
+
+def create_session_backend(settings: Settings) -> SessionBackend:
+    """Build the backend selected by `CHAT_SESSION_BACKEND`."""
+    limits = {
+        "idle_ttl": settings.chat_session_idle_ttl_seconds,
+        "max_messages": settings.chat_max_messages_per_session,
+        "max_bytes": settings.chat_max_bytes_per_session,
+    }
+    if settings.chat_session_backend == "database":
+        return DatabaseSessionBackend(async_session_maker, **limits)
+    return MemorySessionBackend(max_sessions=settings.chat_max_sessions, **limits)
@@ -3,14 +3,18 @@
 Import this module to register all tools with the tool registry.
 """
 
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
-from db.models import UseCase, UseCaseStatus, Company, Industry, Transcript, Role
+from db.models import UseCase, UseCaseStatus, Company, Industry, Transcript, Role, ExtractionJob
 from db.models.use_case import UseCaseStatus as UseCaseStatusEnum, ALLOWED_TRANSITIONS
 from core.dependencies import ROLE_LEVEL
 from services.tools import register_tool
 from services.extraction import extract_use_cases, ExtractionError
+from services.jobs import job_queue
+from services.use_case_query import InvalidCursorError, build_use_case_query, fetch_use_case_page
+from services.uploads import discard_stash, load_stash
 
 
 def _check_role(user, min_role: Role) -> dict | None:
@@ -24,27 +28,21 @@ def _check_role(user, min_role: Role) -> dict | None:
 # ---------- E3-UC2: list_use_cases ----------
 
 async def _list_use_cases(args: dict, db: AsyncSession, user=None, session_id=None) -> dict:
-    query = select(UseCase)
-
-    if args.get("company_id"):
-        query = query.where(UseCase.company_id == args["company_id"])
-    if args.get("status"):
-        query = query.where(UseCase.status == args["status"])
-    if args.get("search"):
-        pattern = f"%{args['search']}%"
-        query = query.where(
-            UseCase.title.ilike(pattern) | UseCase.description.ilike(pattern)
-        )
-
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar_one()
+    query = build_use_case_query(
+        db,
+        company_id=args.get("company_id") or None,
+        status=args.get("status") or None,
+        search=args.get("search") or None,
+    )
 
-    query = query.order_by(UseCase.created_at.desc()).limit(20)
-    result = await db.execute(query)
-    use_cases = result.scalars().all()
+    try:
+        page = await fetch_use_case_page(db, query, limit=20, cursor=args.get("cursor"))
+    except InvalidCursorError:
+        return {"error": "Ungültiger Cursor. Rufe list_use_cases ohne Cursor erneut auf."}
 
     return {
-        "total": total,
+        "total": page.total,
+        "next_cursor": page.next_cursor,
         "use_cases": [
             {
                 "id": uc.id,
@@ -53,7 +51,7 @@ async def _list_use_cases(args: dict, db: AsyncSession, user=None, session_id=No
                 "company_id": uc.company_id,
                 "description": uc.description[:150] + "..." if len(uc.description) > 150 else uc.description,
             }
-            for uc in use_cases
+            for uc in page.items
         ],
     }
 
@@ -75,12 +73,17 @@ register_tool(
                         "description": "Filter nach Status",
                     },
                     "search": {"type": "string", "description": "Suchbegriff für Titel oder Beschreibung"},
+                    "cursor": {
+                        "type": "string",
+                        "description": "next_cursor aus einem vorherigen Aufruf, um die nächsten 20 Einträge zu laden",
+                    },
                 },
                 "required": [],
             },
         },
     },
     _list_use_cases,
+    read_only=True,
 )
 
 
@@ -122,6 +125,7 @@ register_tool(
         },
     },
     _get_use_case,
+    read_only=True,
 )
 
 
@@ -184,6 +188,8 @@ register_tool(
         },
     },
     _create_use_case,
+    min_role=Role.MAINTAINER,
+    intents=("use_case",),
 )
 
 
@@ -255,6 +261,8 @@ register_tool(
         },
     },
     _update_use_case,
+    min_role=Role.MAINTAINER,
+    intents=("use_case",),
 )
 
 
@@ -309,6 +317,8 @@ register_tool(
         },
     },
     _set_status,
+    min_role=Role.MAINTAINER,
+    intents=("use_case",),
 )
 
 
@@ -352,6 +362,8 @@ register_tool(
         },
     },
     _archive_use_case,
+    min_role=Role.ADMIN,
+    intents=("use_case",),
 )
 
 
@@ -395,6 +407,8 @@ register_tool(
         },
     },
     _restore_use_case,
+    min_role=Role.ADMIN,
+    intents=("use_case",),
 )
 
 
@@ -403,10 +417,21 @@ register_tool(
 async def _analyze_transcript(args: dict, db: AsyncSession, user=None, session_id=None) -> dict:
     if err := _check_role(user, Role.MAINTAINER):
         return err
-    transcript = await db.get(Transcript, args["transcript_id"])
+    transcript = await db.get(Transcript, args["transcript_id"], options=[undefer(Transcript.content_z)])
     if not transcript:
         return {"error": f"Transkript mit ID {args['transcript_id']} nicht gefunden."}
 
+    if args.get("background"):
+        job = await job_queue.enqueue(db, transcript.id, user.id if user else None)
+        return {
+            "message": (
+                f"Extraktion für Transkript {transcript.id} läuft im Hintergrund (Job {job.id}). "
+                "Den Stand kann der Nutzer mit get_extraction_job abfragen."
+            ),
+            "job_id": job.id,
+            "status": job.status.value,
+        }
+
     try:
         extracted = await extract_use_cases(transcript.content)
     except ExtractionError as e:
@@ -454,12 +479,55 @@ register_tool(
                 "type": "object",
                 "properties": {
                     "transcript_id": {"type": "integer", "description": "Die ID des Transkripts"},
+                    "background": {
+                        "type": "boolean",
+                        "description": "Als Hintergrund-Job ausführen (für lange Transkripte); liefert eine Job-ID statt der Use Cases",
+                    },
                 },
                 "required": ["transcript_id"],
             },
         },
     },
     _analyze_transcript,
+    min_role=Role.MAINTAINER,
+    intents=("transcript",),
+)
+
+
+# ---------- get_extraction_job ----------
+
+async def _get_extraction_job(args: dict, db: AsyncSession, user=None, session_id=None) -> dict:
+    job = await db.get(ExtractionJob, args["job_id"])
+    if not job:
+        return {"error": f"Job mit ID {args['job_id']} nicht gefunden."}
+    return {
+        "id": job.id,
+        "transcript_id": job.transcript_id,
+        "status": job.status.value,
+        "attempts": job.attempts,
+        "error": job.error,
+        "use_case_ids": job.use_case_ids,
+    }
+
+
+register_tool(
+    "get_extraction_job",
+    {
+        "type": "function",
+        "function": {
+            "name": "get_extraction_job",
+            "description": "Status eines Hintergrund-Jobs zur Transkript-Analyse abrufen (queued, running, succeeded, failed) inkl. IDs der erzeugten Use Cases.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "integer", "description": "Die ID des Jobs"},
+                },
+                "required": ["job_id"],
+            },
+        },
+    },
+    _get_extraction_job,
+    read_only=True,
 )
 
 
@@ -493,6 +561,7 @@ register_tool(
         },
     },
     _list_companies,
+    read_only=True,
 )
 
 
@@ -525,6 +594,7 @@ register_tool(
         },
     },
     _list_industries,
+    read_only=True,
 )
 
 
@@ -569,6 +639,8 @@ register_tool(
         },
     },
     _create_industry,
+    min_role=Role.MAINTAINER,
+    intents=("industry",),
 )
 
 
@@ -625,6 +697,8 @@ register_tool(
         },
     },
     _create_company,
+    min_role=Role.MAINTAINER,
+    intents=("company",),
 )
 
 
@@ -639,20 +713,42 @@ async def _save_transcript(args: dict, db: AsyncSession, user=None, session_id=N
 
     from services.agent import get_file
 
-    file_data = get_file(session_id)
+    file_data = await get_file(session_id)
     if not file_data:
         return {"error": "Keine angehängte Datei gefunden. Bitte zuerst eine .txt-Datei anhängen."}
 
-    if not file_data["content"].strip():
-        return {"error": "Die angehängte Datei ist leer."}
-
     company = await db.get(Company, args["company_id"])
     if not company:
         return {"error": f"Unternehmen mit ID {args['company_id']} nicht gefunden."}
 
+    digest = file_data["content_hash"]
+    existing = (await db.execute(
+        select(Transcript).where(Transcript.company_id == args["company_id"], Transcript.content_hash == digest)
+    )).scalar_one_or_none()
+    if existing:
+        discard_stash(session_id, digest)
+        use_cases = (await db.execute(
+            select(UseCase.id, UseCase.title).where(UseCase.transcript_id == existing.id).order_by(UseCase.id)
+        )).all()
+        return {
+            "transcript_id": existing.id,
+            "duplicate": True,
+            "message": (
+                f"Dieses Transkript ist für das Unternehmen bereits gespeichert (ID {existing.id}). "
+                "Eine erneute Analyse ist nicht nötig. Liste dem Nutzer die vorhandenen Use Cases auf."
+            ),
+            "use_cases": [{"id": uc.id, "title": uc.title} for uc in use_cases],
+        }
+
+    try:
+        content_z = load_stash(session_id, digest)
+    except FileNotFoundError:
+        return {"error": "Die angehängte Datei ist nicht mehr verfügbar. Bitte erneut anhängen."}
+
     transcript = Transcript(
         filename=file_data["filename"],
-        content=file_data["content"],
+        content_z=content_z,
+        content_hash=digest,
         company_id=args["company_id"],
     )
     db.add(transcript)
@@ -662,6 +758,7 @@ async def _save_transcript(args: dict, db: AsyncSession, user=None, session_id=N
     except Exception:
         await db.rollback()
         return {"error": "Datenbankfehler beim Speichern des Transkripts."}
+    discard_stash(session_id, digest)
 
     return {
         "transcript_id": transcript.id,
@@ -692,4 +789,6 @@ register_tool(
         },
     },
     _save_transcript,
+    min_role=Role.MAINTAINER,
+    intents=("transcript",),
 )
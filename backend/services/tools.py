@@ -2,8 +2,16 @@
 
 import json
 import logging
+import re
+import time
+from functools import cache
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.dependencies import ROLE_LEVEL
+from core.metrics import tool_duration
+from db.models import Role
+
 logger = logging.getLogger(__name__)
 
 # OpenAI function-calling format tool definitions
@@ -12,11 +20,89 @@ TOOL_DEFINITIONS: list[dict] = []
 # Registry: tool_name -> async callable(args_dict, db) -> str
 _TOOL_HANDLERS: dict[str, object] = {}
 
+# Tools that never write; the agent may run these concurrently on separate sessions
+_READ_ONLY_TOOLS: set[str] = set()
+
+# Minimum role per tool; tools above the user's role are not offered to the model
+_TOOL_MIN_ROLE: dict[str, Role] = {}
+
+# Intents a tool serves, for narrowing the catalogue to what a message asks about
+_TOOL_INTENTS: dict[str, frozenset[str]] = {}
+
+# Keyword classifier: intent -> pattern matched against the lowercased user message
+INTENT_PATTERNS: dict[str, re.Pattern] = {
+    "use_case": re.compile(
+        r"use[\s-]?cases?|\buc\b|anwendungsf|status|archiv|wiederherst|bewert|rating"
+        r"|in_review|approved|in_progress|completed"
+    ),
+    "transcript": re.compile(r"transkript|transcript|workshop|datei|analys|extrah"),
+    "company": re.compile(r"unternehmen|firm|compan|kunde"),
+    "industry": re.compile(r"branche|industr"),
+}
 
-def register_tool(name: str, definition: dict, handler):
-    """Register a tool with its OpenAI definition and handler function."""
+
+def register_tool(
+    name: str,
+    definition: dict,
+    handler,
+    *,
+    read_only: bool = False,
+    min_role: Role = Role.READER,
+    intents: tuple[str, ...] = (),
+):
+    """Register a tool with its OpenAI definition and handler function.
+
+    Tools are treated as mutating unless registered with `read_only=True`.
+    `min_role` mirrors the handler's own role check and hides the tool from
+    users below it; `intents` (keys of INTENT_PATTERNS) let the catalogue
+    drop a mutating tool when the message is clearly about something else.
+    """
     TOOL_DEFINITIONS.append(definition)
     _TOOL_HANDLERS[name] = handler
+    if read_only:
+        _READ_ONLY_TOOLS.add(name)
+    _TOOL_MIN_ROLE[name] = min_role
+    _TOOL_INTENTS[name] = frozenset(intents)
+    _catalogue.cache_clear()
+
+
+def is_read_only(name: str) -> bool:
+    """True if the tool was registered as read-only."""
+    return name in _READ_ONLY_TOOLS
+
+
+def classify_intents(*messages: str) -> frozenset[str]:
+    """Intents whose keywords occur in any of the messages (empty if none do)."""
+    text = "\n".join(messages).lower()
+    return frozenset(intent for intent, pattern in INTENT_PATTERNS.items() if pattern.search(text))
+
+
+@cache
+def _catalogue(level: int, intents: frozenset[str]) -> list[dict]:
+    """Definitions for a role level, built once per (level, intents) and shared."""
+    return [
+        definition for definition in TOOL_DEFINITIONS
+        if ROLE_LEVEL[_TOOL_MIN_ROLE[name := definition["function"]["name"]]] <= level
+        and (not intents or name in _READ_ONLY_TOOLS or _TOOL_INTENTS[name] & intents)
+    ]
+
+
+def tools_for(role: Role | None, *messages: str) -> list[dict]:
+    """Tool definitions to send to the model for a user of `role`.
+
+    Tools above the role are left out; their handlers would reject the call
+    anyway. Given user `messages` (the current one and the turns before it),
+    mutating tools are also narrowed to the union of the intents they
+    mention, so a follow-up like "Mach das für Firma Acme" keeps the tools
+    of the request it refers to. Read-only tools are always kept (the model
+    needs them to resolve names and IDs), and messages without any
+    recognised intent keep the full list.
+
+    The returned list is shared between requests and must not be modified.
+    """
+    level = ROLE_LEVEL.get(role, 0) if role is not None else 0
+    intents = classify_intents(*messages)
+    return _catalogue(level, intents)
 
 
 async def execute_tool(name: str, arguments: dict, db: AsyncSession, user=None, session_id: str | None = None) -> str:
@@ -25,9 +111,15 @@ async def execute_tool(name: str, arguments: dict, db: AsyncSession, user=None,
     if not handler:
         return json.dumps({"error": f"Unknown tool: {name}"})
 
+    outcome, start = "error", time.perf_counter()
     try:
         result = await handler(arguments, db, user, session_id=session_id)
-        return json.dumps(result, default=str, ensure_ascii=False)
+        reply = json.dumps(result, default=str, ensure_ascii=False)
+        # Handlers report refusals (not found, no permission) as {"error": ...}
+        outcome = "error" if isinstance(result, dict) and "error" in result else "ok"
+        return reply
     except Exception as e:
         logger.error("Tool '%s' failed: %s", name, e)
         return json.dumps({"error": str(e)})
+    finally:
+        tool_duration.observe(time.perf_counter() - start, name, outcome)
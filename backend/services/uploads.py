@@ -0,0 +1,192 @@
+"""Streaming intake of uploaded transcript files.
+
+Uploads are read in `UPLOAD_CHUNK_BYTES` pieces. Each chunk is checked with
+an incremental UTF-8 decoder, hashed and compressed on the fly, so a request
+only ever holds the compressed text (what `Transcript.content_z` stores),
+however large the file is (up to `TRANSCRIPT_MAX_BYTES`). A leading BOM is
+dropped before hashing, so it doesn't change the content hash.
+
+Chat attachments have to outlive the request until `save_transcript` picks
+them up; they are stashed in a content-addressed blob store per chat
+session (so one session saving a file never removes another session's
+copy) and removed once saved. Stashes that are never saved expire like
+idle chat sessions: `sweep_stashes()` removes those older than
+`CHAT_SESSION_IDLE_TTL_SECONDS`.
+"""
+
+import codecs
+import hashlib
+import logging
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+
+from core.config import get_settings
+from services.blob_store import BlobStore
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENTS_DIR = Path(__file__).resolve().parents[1] / "data" / "attachments"
+
+# Chat attachments waiting for save_transcript, one sub-store per session
+attachment_blobs = BlobStore(ATTACHMENTS_DIR)
+
+# Seconds between sweeps triggered by new stashes
+SWEEP_INTERVAL = 10 * 60
+_last_sweep = float("-inf")
+
+_BOM = codecs.BOM_UTF8
+
+
+class UploadError(ValueError):
+    """Upload rejected; the message can be shown to the client."""
+
+
+@dataclass
+class Upload:
+    filename: str
+    content_hash: str
+    size: int  # bytes, without BOM
+    compressed: bytes | None = None  # zlib, as in Transcript.content_z; set by read_upload
+
+
+def check_filename(filename: str | None) -> str:
+    if not filename or not filename.endswith(".txt"):
+        raise UploadError("Only .txt files are supported")
+    return filename
+
+
+def _too_large(max_bytes: int) -> UploadError:
+    return UploadError(f"File too large (max {max_bytes // 1024} KB)")
+
+
+async def _chunks(file: UploadFile, max_bytes: int | None) -> AsyncIterator[bytes]:
+    """Yield the file's bytes (BOM stripped) in chunks; raise UploadError once it proves invalid."""
+    settings = get_settings()
+    check_filename(file.filename)
+    max_bytes = max_bytes or settings.transcript_max_bytes
+    chunk_bytes = max(settings.upload_chunk_bytes, len(_BOM))  # The first chunk holds any BOM
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    size, blank, first = 0, True, True
+
+    while chunk := await file.read(chunk_bytes):
+        if first:
+            chunk, first = chunk.removeprefix(_BOM), False
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        try:
+            text = decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise UploadError("File must be UTF-8 encoded")
+        blank = blank and not text.strip()
+        yield chunk
+    try:
+        decoder.decode(b"", final=True)  # Truncated sequence at the end
+    except UnicodeDecodeError:
+        raise UploadError("File must be UTF-8 encoded")
+    if blank:
+        raise UploadError("File is empty")
+
+
+async def read_upload(file: UploadFile, max_bytes: int | None = None) -> Upload:
+    """Validate an uploaded .txt file and return it compressed."""
+    digest, compressor = hashlib.sha256(), zlib.compressobj()
+    parts, size = [], 0
+    async for chunk in _chunks(file, max_bytes):
+        digest.update(chunk)
+        parts.append(compressor.compress(chunk))
+        size += len(chunk)
+    parts.append(compressor.flush())
+    return Upload(file.filename, digest.hexdigest(), size, b"".join(parts))
+
+
+def _session_blobs(session_id: str) -> BlobStore:
+    # Session IDs come from the client, so they are hashed into a directory name
+    return BlobStore(attachment_blobs.root / hashlib.sha256(session_id.encode()).hexdigest()[:32])
+
+
+async def stash_upload(session_id: str, file: UploadFile, max_bytes: int | None = None) -> Upload:
+    """Validate an uploaded .txt file and keep it in the session's attachment store."""
+    _maybe_sweep()
+    with _session_blobs(session_id).writer() as writer:
+        async for chunk in _chunks(file, max_bytes):
+            writer.write(chunk)
+        return Upload(file.filename, writer.commit(), writer.size)
+
+
+def stash_text(session_id: str, filename: str, content: str, max_bytes: int | None = None) -> Upload:
+    """Keep text that arrived in memory (inline chat attachments) in the session's attachment store."""
+    filename = check_filename(filename)
+    max_bytes = max_bytes or get_settings().transcript_max_bytes
+    content = content.removeprefix("\ufeff")
+    data = content.encode("utf-8")
+    if len(data) > max_bytes:
+        raise _too_large(max_bytes)
+    if not content.strip():
+        raise UploadError("File is empty")
+    _maybe_sweep()
+    return Upload(filename, _session_blobs(session_id).put(data), len(data))
+
+
+def load_stash(session_id: str, content_hash: str) -> bytes:
+    """A stashed attachment, compressed; FileNotFoundError if it is gone."""
+    compressor = zlib.compressobj()
+    parts = []
+    with _session_blobs(session_id).path(content_hash).open("rb") as f:
+        while chunk := f.read(get_settings().upload_chunk_bytes):
+            parts.append(compressor.compress(chunk))
+    parts.append(compressor.flush())
+    return b"".join(parts)
+
+
+def discard_stash(session_id: str, content_hash: str) -> None:
+    _session_blobs(session_id).delete(content_hash)
+
+
+def sweep_stashes(max_age: float | None = None) -> int:
+    """Remove stashed attachments older than `max_age` seconds, and empty directories.
+
+    `max_age` defaults to the chat session idle TTL. Returns how many files were removed.
+    """
+    if max_age is None:
+        max_age = get_settings().chat_session_idle_ttl_seconds
+    root = attachment_blobs.root
+    if not root.is_dir():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    # Modification times are taken before anything is removed, as removing
+    # a file touches its directory
+    expired = []
+    for path in root.rglob("*"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                expired.append(path)
+        except OSError:
+            pass
+    # Deepest paths first, so directories are emptied before they are checked
+    for path in sorted(expired, key=lambda p: len(p.parts), reverse=True):
+        try:
+            if path.is_file():
+                path.unlink()
+                removed += 1
+            elif not any(path.iterdir()):
+                path.rmdir()
+        except OSError:
+            pass  # Changed concurrently, e.g. saved, re-used or swept by another worker
+    if removed:
+        logger.info("Removed %d expired chat attachments", removed)
+    return removed
+
+
+def _maybe_sweep() -> None:
+    global _last_sweep
+    now = time.monotonic()
+    if now - _last_sweep >= SWEEP_INTERVAL:
+        _last_sweep = now
+        sweep_stashes()
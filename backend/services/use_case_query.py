@@ -0,0 +1,242 @@
+"""Shared use case listing: filters, full-text search and keyset pagination.
+
+Used by both the REST endpoints and the agent's list_use_cases tool so the
+two paths filter, order and paginate identically.
+"""
+
+import base64
+import html
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import Select, String, column, func, literal, literal_column, select, table, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.fts import FTS_TABLE, MIN_TERM_LENGTH, fts_available
+from db.models import Company, UseCase
+from db.models.use_case import UseCaseStatus
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+# Column weights for bm25(): title, description, expected_benefit, stakeholders
+_BM25 = f"bm25({FTS_TABLE}, 10.0, 1.0, 2.0, 5.0)"
+
+# Control characters as highlight markers, swapped for <mark> after HTML-escaping
+_HL_START, _HL_END = "\x02", "\x03"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+@dataclass
+class UseCaseSearchHit:
+    """A ranked search result with HTML-safe highlighted fragments."""
+    use_case: UseCase
+    score: float | None
+    title_highlight: str
+    snippet: str
+
+
+@dataclass
+class UseCasePage:
+    """One page of use cases plus the cursor for the next one."""
+    items: list[UseCase]
+    next_cursor: str | None
+    total: int | None
+
+
+def encode_cursor(created_at: datetime, use_case_id: int) -> str:
+    """Encode the sort key of the last row as an opaque cursor string."""
+    raw = json.dumps([created_at.isoformat(), use_case_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor()."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, use_case_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(use_case_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+def build_use_case_query(
+    db: AsyncSession,
+    company_id: int | None = None,
+    industry_id: int | None = None,
+    status: UseCaseStatus | str | None = None,
+    search: str | None = None,
+) -> Select:
+    """Build the filtered (unordered, unpaginated) use case query.
+
+    The session only decides the search strategy (FTS index or ILIKE).
+    """
+    query = select(UseCase)
+
+    if company_id is not None:
+        query = query.where(UseCase.company_id == company_id)
+    if industry_id is not None:
+        query = query.join(Company, UseCase.company_id == Company.id).where(
+            Company.industry_id == industry_id
+        )
+    if status is not None:
+        query = query.where(UseCase.status == status)
+    if search:
+        if _use_fts(db, search):
+            query = query.where(UseCase.id.in_(select(_fts.c.rowid).where(_fts_match(search))))
+        else:
+            pattern = f"%{search}%"
+            query = query.where(
+                UseCase.title.ilike(pattern)
+                | UseCase.description.ilike(pattern)
+                | UseCase.expected_benefit.ilike(pattern)
+                | _stakeholder_name_like(db, pattern)
+            )
+
+    return query
+
+
+# Stakeholders are a JSON array of {"name", "role"}; like the FTS index, only names are searched
+_STAKEHOLDER_NAME_LIKE = {
+    "sqlite": (
+        "EXISTS (SELECT 1 FROM json_each(CASE WHEN json_valid(use_cases.stakeholders) "
+        "THEN use_cases.stakeholders END) WHERE type = 'object' "
+        "AND lower(json_extract(value, '$.name')) LIKE lower(:stakeholder_pattern))"
+    ),
+    "postgresql": (
+        "EXISTS (SELECT 1 FROM jsonb_array_elements(CASE WHEN jsonb_typeof(use_cases.stakeholders) = 'array' "
+        "THEN use_cases.stakeholders END) AS stakeholder "
+        "WHERE stakeholder->>'name' ILIKE :stakeholder_pattern)"
+    ),
+}
+
+
+def _stakeholder_name_like(db: AsyncSession, pattern: str):
+    sql = _STAKEHOLDER_NAME_LIKE[db.get_bind().dialect.name]
+    return text(sql).bindparams(stakeholder_pattern=pattern)
+
+
+def _use_fts(db: AsyncSession, search: str) -> bool:
+    return fts_available(db.get_bind()) and len(search) >= MIN_TERM_LENGTH
+
+
+def _fts_match(search: str):
+    """MATCH the whole term as one quoted FTS5 phrase (a substring under trigram)."""
+    phrase = '"' + search.replace('"', '""') + '"'
+    return literal_column(FTS_TABLE).op("MATCH")(phrase)
+
+
+def _mark(fragment: str) -> str:
+    return html.escape(fragment).replace(_HL_START, "<mark>").replace(_HL_END, "</mark>")
+
+
+async def search_use_cases(
+    db: AsyncSession,
+    term: str,
+    *,
+    company_id: int | None = None,
+    status: UseCaseStatus | str | None = None,
+    limit: int = 20,
+) -> list[UseCaseSearchHit]:
+    """Full-text search ranked by BM25, with highlighted title and snippet.
+
+    Without an FTS index (or for terms too short for trigram matching) this
+    falls back to the ILIKE filter ordered by recency, without scores.
+    """
+    if not _use_fts(db, term):
+        query = build_use_case_query(db, company_id=company_id, status=status, search=term)
+        page = await fetch_use_case_page(db, query, limit=limit, include_total=False)
+        return [
+            UseCaseSearchHit(
+                use_case=uc,
+                score=None,
+                title_highlight=html.escape(uc.title),
+                snippet=html.escape(uc.description[:200]),
+            )
+            for uc in page.items
+        ]
+
+    query = (
+        select(
+            UseCase,
+            literal_column(_BM25).label("rank"),
+            literal_column(f"highlight({FTS_TABLE}, 0, char(2), char(3))"),
+            literal_column(f"snippet({FTS_TABLE}, -1, char(2), char(3), '…', 64)"),
+        )
+        .select_from(_fts)
+        .join(UseCase, UseCase.id == _fts.c.rowid)
+        .where(_fts_match(term))
+    )
+    if company_id is not None:
+        query = query.where(UseCase.company_id == company_id)
+    if status is not None:
+        query = query.where(UseCase.status == status)
+    query = query.order_by(literal_column("rank")).limit(limit)
+
+    rows = (await db.execute(query)).all()
+    return [
+        # bm25() is lower-is-better; flip it so higher scores rank higher
+        UseCaseSearchHit(use_case=uc, score=-rank, title_highlight=_mark(title), snippet=_mark(snippet))
+        for uc, rank, title, snippet in rows
+    ]
+
+
+def _timestamp_param(db: AsyncSession, value: datetime):
+    """Bind a cursor timestamp so it compares equal to the stored value.
+
+    SQLite stores server-side CURRENT_TIMESTAMP as 'YYYY-MM-DD HH:MM:SS',
+    while SQLAlchemy binds datetimes with microseconds. Comparing those as
+    strings would never match on equality, so bind the stored format instead.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        text = value.strftime("%Y-%m-%d %H:%M:%S")
+        if value.microsecond:
+            text += f".{value.microsecond:06d}"
+        return literal(text, String)
+    return value
+
+
+async def fetch_use_case_page(
+    db: AsyncSession,
+    query: Select,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    offset: int = 0,
+    include_total: bool = True,
+) -> UseCasePage:
+    """Execute a use case query ordered by (created_at, id), newest first.
+
+    With a cursor, rows after that position are returned (keyset pagination,
+    constant cost regardless of depth); otherwise `offset` is applied. The
+    exact total is only counted when `include_total` is set.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded.
+    """
+    total = None
+    if include_total:
+        count_query = select(func.count()).select_from(query.subquery())
+        total = (await db.execute(count_query)).scalar_one()
+
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        ts = _timestamp_param(db, created_at)
+        # Row-value comparison so the planner can seek the (created_at, id) index
+        query = query.where(tuple_(UseCase.created_at, UseCase.id) < tuple_(ts, last_id))
+    elif offset:
+        query = query.offset(offset)
+
+    # Fetch one extra row to know whether another page exists
+    query = query.order_by(UseCase.created_at.desc(), UseCase.id.desc()).limit(limit + 1)
+    items = list((await db.execute(query)).scalars().all())
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+    return UseCasePage(items=items, next_cursor=next_cursor, total=total)
@@ -1,23 +1,36 @@
 """Shared test fixtures: in-memory DB, async client, auth helpers."""
 
 import asyncio
+import os
 from typing import AsyncGenerator
 
+# Keep the LLM response cache in memory; tests must not write to data/
+os.environ.setdefault("LLM_CACHE_PATH", "")
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
 
-from db.database import Base, get_db
+from db.database import Base, get_db, get_read_db, get_read_sessionmaker
 from db.models import User, Role, Industry, Company, UseCase
+from core.dependencies import user_cache
 from core.security import hash_password, create_access_token
 from main import app
+from services.blob_store import BlobStore
+from services.jobs import job_queue
 
 
-# In-memory SQLite for tests
-TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+# In-memory SQLite by default; set TEST_DATABASE_URL to run against PostgreSQL
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite+aiosqlite:///:memory:")
 
-engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+engine = create_async_engine(
+    TEST_DATABASE_URL,
+    echo=False,
+    # Tests run on separate event loops; asyncpg connections must not be pooled across them
+    **({} if TEST_DATABASE_URL.startswith("sqlite") else {"poolclass": NullPool}),
+)
 TestSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -29,6 +42,22 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def _clear_user_cache():
+    """Every test starts with fresh IDs, so cached users must not leak across tests."""
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def blob_store(tmp_path, monkeypatch) -> BlobStore:
+    """Chat attachments go to a temporary directory, not data/attachments."""
+    store = BlobStore(tmp_path / "blobs")
+    monkeypatch.setattr("services.uploads.attachment_blobs", store)
+    return store
+
+
 @pytest_asyncio.fixture
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create tables, yield a session, then drop everything."""
@@ -50,11 +79,16 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
+    app.dependency_overrides[get_read_sessionmaker] = lambda: TestSessionLocal
+    job_sessions, job_queue.session_maker = job_queue.session_maker, TestSessionLocal
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
+    await job_queue.stop()
+    job_queue.session_maker = job_sessions
     app.dependency_overrides.clear()
 
 
@@ -1,8 +1,13 @@
 """Tests for auth endpoints: register, login, /me, RBAC."""
 
+import threading
+
+import bcrypt
 import pytest
 from httpx import AsyncClient
 
+from core.dependencies import user_cache
+from core.security import hash_password_async, verify_password_async
 from db.models import User
 from tests.conftest import auth_header
 
@@ -146,3 +151,60 @@ async def test_admin_cannot_change_own_role(client: AsyncClient, seed_users: dic
         headers=auth_header(admin),
     )
     assert res.status_code == 400
+
+
+# ---------- User cache ----------
+
+
+@pytest.mark.asyncio
+async def test_authenticated_user_served_from_cache(client: AsyncClient, seed_users: dict[str, User]):
+    headers = auth_header(seed_users["reader"])
+    assert (await client.get("/api/auth/me", headers=headers)).status_code == 200
+    assert user_cache.hits == 0
+
+    res = await client.get("/api/auth/me", headers=headers)
+    assert res.status_code == 200
+    assert res.json()["email"] == "reader@test.com"
+    assert user_cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_role_change_invalidates_cached_user(client: AsyncClient, seed_users: dict[str, User]):
+    reader = seed_users["reader"]
+    assert (await client.get("/api/auth/me", headers=auth_header(reader))).json()["role"] == "reader"
+
+    await client.patch(f"/api/auth/users/{reader.id}", json={"role": "maintainer"},
+                       headers=auth_header(seed_users["admin"]))
+
+    res = await client.get("/api/auth/me", headers=auth_header(reader))
+    assert res.json()["role"] == "maintainer"
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_rejected_despite_cache(client: AsyncClient, seed_users: dict[str, User]):
+    reader = seed_users["reader"]
+    assert (await client.get("/api/auth/me", headers=auth_header(reader))).status_code == 200
+
+    res = await client.delete(f"/api/auth/users/{reader.id}", headers=auth_header(seed_users["admin"]))
+    assert res.status_code == 204
+
+    assert (await client.get("/api/auth/me", headers=auth_header(reader))).status_code == 401
+
+
+# ---------- Password hashing ----------
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_off_the_event_loop(monkeypatch):
+    threads = []
+    real_checkpw = bcrypt.checkpw
+
+    def _checkpw(*args):
+        threads.append(threading.current_thread().name)
+        return real_checkpw(*args)
+
+    monkeypatch.setattr(bcrypt, "checkpw", _checkpw)
+    hashed = await hash_password_async("geheim123")
+    assert await verify_password_async("geheim123", hashed)
+    assert not await verify_password_async("falsch", hashed)
+    assert all(name.startswith("bcrypt") for name in threads)
@@ -0,0 +1,229 @@
+"""Tests for the chat endpoints with a mocked, streaming LLM."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from openai.types.chat import ChatCompletionChunk
+from sqlalchemy.orm import undefer
+
+from db.models import Transcript
+from services import agent
+from services.agent import stream_agent
+from services.tool_handlers import _save_transcript
+from tests.conftest import auth_header
+
+
+def _chunk(content: str | None = None, tool_calls: list[dict] | None = None) -> ChatCompletionChunk:
+    delta = {}
+    if content is not None:
+        delta["content"] = content
+    if tool_calls is not None:
+        delta["tool_calls"] = tool_calls
+    return ChatCompletionChunk.model_validate({
+        "id": "c", "object": "chat.completion.chunk", "created": 0, "model": "m",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+    })
+
+
+async def _stream(*chunks: ChatCompletionChunk):
+    for c in chunks:
+        yield c
+
+
+def _tool_round():
+    """One LLM round calling list_companies, with the arguments split across chunks."""
+    return _stream(
+        _chunk(tool_calls=[{"index": 0, "id": "call_1", "type": "function",
+                            "function": {"name": "list_companies", "arguments": "{"}}]),
+        _chunk(tool_calls=[{"index": 0, "function": {"arguments": "}"}}]),
+    )
+
+
+def _text_round(*parts: str):
+    return _stream(*(_chunk(content=p) for p in parts))
+
+
+def _parse_sse(body: str) -> list[dict]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        data = next(line[len("data: "):] for line in block.splitlines() if line.startswith("data: "))
+        events.append(json.loads(data))
+    return events
+
+
+@pytest.mark.asyncio
+@patch("services.agent._client")
+async def test_chat_stream_emits_tool_and_delta_events(mock_client, client: AsyncClient, seed_data: dict):
+    mock_client.chat.completions.create = AsyncMock(
+        side_effect=[_tool_round(), _text_round("Es gibt ", "TestCorp.")]
+    )
+    res = await client.post(
+        "/api/chat/stream",
+        json={"message": "Welche Unternehmen gibt es?", "session_id": "s-stream"},
+        headers=auth_header(seed_data["users"]["reader"]),
+    )
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+
+    events = _parse_sse(res.text)
+    assert [e["type"] for e in events] == ["tool_start", "tool_end", "delta", "delta", "done"]
+    assert events[0] == {"type": "tool_start", "name": "list_companies", "arguments": {}}
+    assert events[1]["ok"] is True
+    assert events[-1]["reply"] == "Es gibt TestCorp."
+    assert events[-1]["tool_calls_made"] == ["list_companies"]
+
+    # A reader is only offered read-only tools
+    offered = {t["function"]["name"] for t in mock_client.chat.completions.create.call_args.kwargs["tools"]}
+    assert offered == {"list_use_cases", "get_use_case", "list_companies", "list_industries", "get_extraction_job"}
+
+    # The tool result went back to the model with the reassembled call id
+    second_call_messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+    assert second_call_messages[-2]["tool_calls"][0]["id"] == "call_1"
+    assert "TestCorp" in second_call_messages[-1]["content"]
+
+
+@pytest.mark.asyncio
+@patch("services.agent._client")
+async def test_chat_stream_reports_llm_failure_in_band(mock_client, client: AsyncClient, seed_data: dict):
+    mock_client.chat.completions.create = AsyncMock(side_effect=RuntimeError("upstream down"))
+    res = await client.post(
+        "/api/chat/stream",
+        json={"message": "Hallo", "session_id": "s-error"},
+        headers=auth_header(seed_data["users"]["reader"]),
+    )
+    assert res.status_code == 200
+    assert [e["type"] for e in _parse_sse(res.text)] == ["error"]
+
+
+@pytest.mark.asyncio
+@patch("services.agent._client")
+async def test_chat_returns_final_reply(mock_client, client: AsyncClient, seed_data: dict):
+    mock_client.chat.completions.create = AsyncMock(side_effect=[_tool_round(), _text_round("Fertig.")])
+    res = await client.post(
+        "/api/chat/",
+        json={"message": "Welche Unternehmen gibt es?", "session_id": "s-plain"},
+        headers=auth_header(seed_data["users"]["reader"]),
+    )
+    assert res.status_code == 200
+    assert res.json() == {"reply": "Fertig.", "session_id": "s-plain", "tool_calls_made": ["list_companies"]}
+
+
+@pytest.mark.asyncio
+@patch("services.agent._client")
+async def test_read_only_tools_fan_out_and_mutations_keep_order(mock_client, monkeypatch):
+    calls = ["list_companies", "list_industries", "create_industry", "get_use_case", "list_use_cases"]
+    mock_client.chat.completions.create = AsyncMock(side_effect=[
+        _stream(_chunk(tool_calls=[
+            {"index": i, "id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": "{}"}}
+            for i, name in enumerate(calls)
+        ])),
+        _text_round("Fertig."),
+    ])
+
+    in_flight, max_in_flight, log = 0, {}, []
+
+    async def _fake_execute_tool(name, args, db, user=None, session_id=None):
+        nonlocal in_flight
+        in_flight += 1
+        log.append(("start", name, db))
+        await asyncio.sleep(0.01)
+        max_in_flight[name] = in_flight
+        in_flight -= 1
+        log.append(("end", name, db))
+        return json.dumps({"tool": name})
+
+    @asynccontextmanager
+    async def _read_sessions():
+        yield "read-session"
+
+    monkeypatch.setattr("services.agent.execute_tool", _fake_execute_tool)
+    events = [e async for e in stream_agent("Los", "s-fanout", "primary-session", None, _read_sessions)]
+
+    # Reads before the write overlap; the write runs alone; then the next reads overlap again
+    assert max_in_flight == {
+        "list_companies": 2, "list_industries": 1, "create_industry": 1,
+        "get_use_case": 2, "list_use_cases": 1,
+    }
+    assert [entry for entry in log if entry[1] == "create_industry"] == [
+        ("start", "create_industry", "primary-session"), ("end", "create_industry", "primary-session"),
+    ]
+    assert log.index(("start", "create_industry", "primary-session")) > log.index(("end", "list_industries", "read-session"))
+    assert {db for _, name, db in log if name != "create_industry"} == {"read-session"}
+
+    # Tool results are reported in the order the model asked for them
+    assert [e["name"] for e in events if e["type"] == "tool_end"] == calls
+    tool_messages = mock_client.chat.completions.create.call_args.kwargs["messages"][-len(calls):]
+    assert [m["tool_call_id"] for m in tool_messages] == [f"call_{i}" for i in range(len(calls))]
+
+
+@pytest.mark.asyncio
+@patch("services.agent._client")
+async def test_follow_up_turn_includes_history(mock_client, client: AsyncClient, seed_data: dict):
+    mock_client.chat.completions.create = AsyncMock(side_effect=[_text_round("Hallo!"), _text_round("Gern.")])
+    headers = auth_header(seed_data["users"]["reader"])
+    for message in ("Hi", "Danke"):
+        await client.post("/api/chat/", json={"message": message, "session_id": "s-history"}, headers=headers)
+
+    messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+    assert [(m["role"], m["content"]) for m in messages[1:]] == [
+        ("user", "Hi"), ("assistant", "Hallo!"), ("user", "Danke"),
+    ]
+
+
+@pytest.mark.asyncio
+@patch("services.agent._client")
+async def test_intent_filter_counts_earlier_user_turns(
+    mock_client, client: AsyncClient, seed_data: dict, monkeypatch,
+):
+    monkeypatch.setattr(agent.settings, "chat_tool_intent_filter", True)
+    mock_client.chat.completions.create = AsyncMock(side_effect=[_text_round("Für welche Firma?"), _text_round("OK")])
+    headers = auth_header(seed_data["users"]["maintainer"])
+    for message in ("Lege einen Use Case für Predictive Maintenance an", "Mach das für Firma Acme"):
+        await client.post("/api/chat/", json={"message": message, "session_id": "s-intent"}, headers=headers)
+
+    offered = {t["function"]["name"] for t in mock_client.chat.completions.create.call_args.kwargs["tools"]}
+    assert {"create_use_case", "list_companies"} <= offered
+    assert "save_transcript" not in offered
+
+
+@pytest.mark.asyncio
+@patch("services.agent._client")
+async def test_attachment_is_picked_up_by_save_transcript(
+    mock_client, client: AsyncClient, db_session, seed_data: dict, blob_store
+):
+    mock_client.chat.completions.create = AsyncMock(return_value=_text_round("Für welche Firma?"))
+    maintainer = seed_data["users"]["maintainer"]
+    headers = auth_header(maintainer)
+
+    res = await client.post(
+        "/api/chat/attachments", data={"session_id": "s-attach"},
+        files={"file": ("workshop.txt", "Lisa: Größe".encode(), "text/plain")}, headers=headers,
+    )
+    assert res.status_code == 201
+    assert res.json() == {"filename": "workshop.txt", "size": len("Lisa: Größe".encode())}
+
+    await client.post(
+        "/api/chat/", json={"message": "Speichern", "session_id": "s-attach", "file_name": "workshop.txt"},
+        headers=headers,
+    )
+    messages = mock_client.chat.completions.create.call_args.kwargs["messages"]
+    assert messages[-1]["content"] == "Speichern\n\n[Datei angehängt: workshop.txt]"
+
+    result = await _save_transcript({"company_id": seed_data["company"].id}, db_session, maintainer, "s-attach")
+    transcript = await db_session.get(Transcript, result["transcript_id"], options=[undefer(Transcript.content_z)])
+    assert transcript.content == "Lisa: Größe"
+    assert not any(p.is_file() for p in blob_store.root.rglob("*"))  # Stash removed once saved
+
+
+@pytest.mark.asyncio
+async def test_attachment_rejects_non_text(client: AsyncClient, seed_data: dict):
+    res = await client.post(
+        "/api/chat/attachments", data={"session_id": "s-attach"},
+        files={"file": ("deck.pdf", b"%PDF", "application/pdf")},
+        headers=auth_header(seed_data["users"]["maintainer"]),
+    )
+    assert res.status_code == 400
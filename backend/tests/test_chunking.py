@@ -0,0 +1,50 @@
+"""Tests for splitting transcripts into overlapping chunks."""
+
+from services.chunking import chunk_transcript, split_turns
+
+
+def _transcript(turns: int, words: int = 20) -> str:
+    speakers = ["Lisa Weber", "Max Müller", "Moderator (BC)"]
+    return "".join(
+        f"{speakers[i % 3]}: Beitrag {i} " + "wort " * words + "\nweiter im Beitrag\n"
+        for i in range(turns)
+    )
+
+
+def test_split_turns_on_speakers_keeps_text():
+    text = _transcript(5)
+    turns = split_turns(text)
+    assert len(turns) == 5
+    assert "".join(turns) == text
+    assert turns[2].startswith("Moderator (BC): Beitrag 2")
+
+
+def test_split_turns_falls_back_to_paragraphs():
+    assert split_turns("Absatz eins\nZeile\n\nAbsatz zwei\n") == ["Absatz eins\nZeile\n", "\nAbsatz zwei\n"]
+
+
+def test_short_transcript_is_one_chunk():
+    text = _transcript(3)
+    assert chunk_transcript(text, max_chars=10_000, overlap_chars=500) == [text]
+
+
+def test_chunks_respect_size_align_to_turns_and_overlap():
+    text = _transcript(40)
+    turns = split_turns(text)
+    chunks = chunk_transcript(text, max_chars=1000, overlap_chars=300)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 1000 for c in chunks)
+    # Every chunk is a run of whole turns, and every turn is covered
+    assert all(c.startswith(("Lisa", "Max", "Moderator")) for c in chunks)
+    assert all(any(t in c for c in chunks) for t in turns)
+    # Each chunk starts with the last turn(s) of its predecessor
+    for previous, following in zip(chunks, chunks[1:]):
+        assert split_turns(following)[0] in split_turns(previous)[1:]
+
+
+def test_overlong_turn_is_cut_at_whitespace():
+    text = "Lisa: " + "langeswort " * 300
+    chunks = chunk_transcript(text, max_chars=500, overlap_chars=0)
+    assert all(len(c) <= 500 for c in chunks)
+    assert "".join(chunks) == text
@@ -0,0 +1,77 @@
+"""Tests for the one-off transcript compression migration."""
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import undefer
+
+from compress_transcripts import _content_hash, migrate
+from db.database import _check_legacy_columns, create_db_engine
+from db.models import Transcript
+
+LEGACY_TABLE = """
+CREATE TABLE transcripts (
+    id INTEGER PRIMARY KEY,
+    filename VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    content_hash VARCHAR(64),
+    company_id INTEGER NOT NULL,
+    uploaded_by_id INTEGER,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+@pytest.mark.asyncio
+async def test_migrate_compresses_legacy_rows(tmp_path):
+    engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    texts = [f"Lisa: Workshop {i}. " * 100 for i in range(5)]
+    async with engine.begin() as conn:
+        await conn.execute(text(LEGACY_TABLE))
+        await conn.execute(
+            text("INSERT INTO transcripts (filename, content, company_id) VALUES ('t.txt', :content, 1)"),
+            [{"content": t} for t in texts],
+        )
+        with pytest.raises(RuntimeError, match="compress_transcripts.py"):
+            await conn.run_sync(_check_legacy_columns)
+
+    try:
+        assert await migrate(engine, batch_size=2) == 5
+        assert await migrate(engine) == 0  # Already done
+
+        async with engine.connect() as conn:
+            await conn.run_sync(_check_legacy_columns)
+        async with async_sessionmaker(engine)() as session:
+            rows = (await session.execute(
+                select(Transcript).options(undefer(Transcript.content_z)).order_by(Transcript.id)
+            )).scalars().all()
+            assert [t.content for t in rows] == texts
+            assert all(len(t.content_z) < len(t.content) / 5 for t in rows)
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_migrate_backfills_content_hashes(tmp_path):
+    """Rows from before deduplication get the upload hash; duplicates keep NULL."""
+    engine = create_db_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    legacy_table = LEGACY_TABLE.replace("    content_hash VARCHAR(64),\n", "")
+    rows = [("Lisa: A", 1), ("\ufeffLisa: A", 1), ("Lisa: A", 2), ("Lisa: B", 1)]
+    async with engine.begin() as conn:
+        await conn.execute(text(legacy_table))
+        await conn.execute(
+            text("INSERT INTO transcripts (filename, content, company_id) VALUES ('t.txt', :content, :company)"),
+            [{"content": content, "company": company} for content, company in rows],
+        )
+
+    try:
+        await migrate(engine, batch_size=2)
+        async with engine.begin() as conn:
+            hashes = (await conn.execute(text("SELECT content_hash FROM transcripts ORDER BY id"))).scalars().all()
+            # The unique index of current databases can be created afterwards
+            for index in Transcript.__table__.indexes:
+                await conn.run_sync(index.create)
+    finally:
+        await engine.dispose()
+
+    assert hashes == [_content_hash("Lisa: A"), None, _content_hash("Lisa: A"), _content_hash("Lisa: B")]
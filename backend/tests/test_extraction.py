@@ -4,10 +4,14 @@ Mocks chat_completion_json to test JSON parsing, Pydantic validation,
 and retry logic without making real API calls.
 """
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, patch
 
-from services.extraction import extract_use_cases, ExtractionError
+from schemas.extraction import ExtractedUseCase
+from services import extraction
+from services.extraction import extract_use_cases, merge_use_cases, ExtractionError
 
 
 VALID_LLM_RESPONSE = {
@@ -125,3 +129,96 @@ async def test_extract_retry_then_succeed(mock_llm: AsyncMock):
 
     assert len(result) == 2
     assert mock_llm.call_count == 2
+
+
+# ────────────────────────── Chunked extraction ──────────────────────────
+
+
+def _use_case(title: str, stakeholders: list[str] = (), description: str = "Beschreibung.") -> dict:
+    return {
+        "title": title,
+        "description": description,
+        "stakeholders": [{"name": n, "role": "Team"} for n in stakeholders],
+        "expected_benefit": "Nutzen.",
+    }
+
+
+def test_merge_use_cases_dedupes_similar_titles():
+    """Duplicates from overlapping chunks are merged, distinct use cases kept in order."""
+    merged = merge_use_cases([ExtractedUseCase(**uc) for uc in [
+        _use_case("Chatbot für Mitarbeiter-FAQ", ["Lisa"]),
+        _use_case("Rechnungsprüfung automatisieren"),
+        _use_case("Chatbot für Mitarbeiter FAQs", ["lisa", "Max"], description="Längere Beschreibung."),
+    ]])
+
+    assert [uc.title for uc in merged] == ["Chatbot für Mitarbeiter-FAQ", "Rechnungsprüfung automatisieren"]
+    assert merged[0].description == "Längere Beschreibung."
+    assert [s.name for s in merged[0].stakeholders] == ["Lisa", "Max"]
+
+
+@pytest.mark.asyncio
+async def test_long_transcript_extracted_in_concurrent_chunks(monkeypatch):
+    """Chunks run concurrently under the limit; empty chunks are fine; results are merged."""
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_chars", 400)
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_overlap_chars", 100)
+    monkeypatch.setattr(extraction.settings, "extraction_max_concurrency", 2)
+    transcript = "".join(f"Sprecher {i}: Thema {i // 10} " + "bla " * 20 + "\n" for i in range(40))
+
+    in_flight, peak, calls = 0, 0, []
+
+    async def _fake_llm(messages):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        chunk = messages[1]["content"]
+        calls.append(chunk)
+        if "Thema 1 " in chunk:
+            return {"use_cases": [_use_case("Chatbot für Mitarbeiter-FAQ")]}
+        return {"use_cases": []}
+
+    with patch("services.extraction.chat_completion_json", side_effect=_fake_llm):
+        result = await extract_use_cases(transcript)
+
+    assert len(calls) > 2
+    assert peak == 2
+    assert [uc.title for uc in result] == ["Chatbot für Mitarbeiter-FAQ"]
+
+
+@pytest.mark.asyncio
+async def test_long_transcript_without_use_cases_fails(monkeypatch):
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_chars", 200)
+    transcript = "".join(f"Sprecher {i}: " + "bla " * 20 + "\n" for i in range(10))
+
+    with patch("services.extraction.chat_completion_json", new_callable=AsyncMock) as mock_llm:
+        mock_llm.return_value = {"use_cases": []}
+        with pytest.raises(ExtractionError):
+            await extract_use_cases(transcript)
+
+
+@pytest.mark.asyncio
+async def test_failing_chunk_cancels_the_others(monkeypatch):
+    """Any error in one chunk stops the rest, not just ExtractionError."""
+    monkeypatch.setattr(extraction.settings, "extraction_chunk_chars", 200)
+    monkeypatch.setattr(extraction.settings, "extraction_max_concurrency", 4)
+    transcript = "".join(f"Sprecher {i}: " + "bla " * 20 + "\n" for i in range(10))
+
+    started, finished = 0, 0
+
+    async def _fake_llm(messages):
+        nonlocal started, finished
+        started += 1
+        if started == 1:
+            raise RuntimeError("upstream down")
+        await asyncio.sleep(0.05)
+        finished += 1
+        return {"use_cases": [_use_case("Chatbot")]}
+
+    with patch("services.extraction.chat_completion_json", side_effect=_fake_llm):
+        with pytest.raises(RuntimeError):
+            await extract_use_cases(transcript)
+        await asyncio.sleep(0.1)
+
+    assert started > 1
+    assert finished == 0
@@ -0,0 +1,71 @@
+"""Tests for token-budgeted prompt compaction."""
+
+import json
+
+from services.history import MIN_TOOL_RESULT_CHARS, compact_messages, estimate_prompt_tokens
+
+SYSTEM = {"role": "system", "content": "Du bist ein Assistent."}
+
+
+def _turn(i: int, answer_len: int = 400) -> list[dict]:
+    return [
+        {"role": "user", "content": f"Frage {i}"},
+        {"role": "assistant", "content": "x" * answer_len},
+    ]
+
+
+def _tool_round(call_id: str, result_len: int) -> list[dict]:
+    return [
+        {"role": "assistant", "content": None, "tool_calls": [
+            {"id": call_id, "type": "function", "function": {"name": "list_use_cases", "arguments": "{}"}},
+        ]},
+        {"role": "tool", "tool_call_id": call_id, "content": json.dumps({"data": "u" * result_len})},
+    ]
+
+
+def _compact(messages, budget, keep_recent_turns=2, tool_result_chars=1000):
+    return compact_messages(
+        messages, budget=budget, keep_recent_turns=keep_recent_turns, tool_result_chars=tool_result_chars,
+    )
+
+
+def test_prompt_within_budget_is_untouched():
+    messages = [SYSTEM, *_turn(1), {"role": "user", "content": "Neu"}]
+    assert _compact(messages, budget=10_000) is messages
+
+
+def test_old_tool_results_are_cut_first():
+    current = {"role": "user", "content": "Liste alles"}
+    messages = [SYSTEM, current, *_tool_round("a", 8000), *_tool_round("b", 3000)]
+    compacted = _compact(messages, budget=1500)
+
+    old_result, latest_result = compacted[3]["content"], compacted[5]["content"]
+    assert "[gekürzt: 1000 von" in old_result
+    assert len(latest_result) > 3000
+    assert estimate_prompt_tokens(compacted) <= 1500
+    assert messages[3]["content"] != old_result  # input not modified
+
+
+def test_old_turns_are_replaced_by_summary():
+    messages = [SYSTEM, *_turn(1), *_turn(2), *_turn(3), {"role": "user", "content": "Frage 4"}]
+    compacted = _compact(messages, budget=300, keep_recent_turns=2)
+
+    assert [m["content"] for m in compacted[1:] if m["role"] == "user"] == ["Frage 3", "Frage 4"]
+    assert "4 Nachrichten ausgelassen" in compacted[0]["content"]
+    assert "Frage 1 | Frage 2" in compacted[0]["content"]
+    assert estimate_prompt_tokens(compacted) <= 300
+
+
+def test_latest_tool_results_cut_last_and_structure_kept():
+    messages = [SYSTEM, {"role": "user", "content": "Details?"}, *_tool_round("a", 20_000)]
+    compacted = _compact(messages, budget=50, tool_result_chars=2000)
+
+    assert [m["role"] for m in compacted] == ["system", "user", "assistant", "tool"]
+    assert compacted[3]["tool_call_id"] == "a"
+    assert f"[gekürzt: {MIN_TOOL_RESULT_CHARS} von" in compacted[3]["content"]
+
+
+def test_current_question_is_never_dropped():
+    messages = [SYSTEM, *_turn(1), {"role": "user", "content": "y" * 10_000}]
+    compacted = _compact(messages, budget=100, keep_recent_turns=0)
+    assert compacted[-1] == messages[-1]
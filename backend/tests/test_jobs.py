@@ -0,0 +1,178 @@
+"""Tests for the background extraction job queue and its endpoints."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db.database import request_scope
+from db.models import ExtractionJob, JobStatus, Transcript, UseCase
+from schemas.extraction import ExtractedUseCase
+from services.extraction import ExtractionError
+from services.jobs import JobQueue
+from services.tool_handlers import _analyze_transcript
+from tests.conftest import auth_header
+
+EXTRACTED = [
+    ExtractedUseCase(
+        title="Schichtplanung",
+        description="Automatische Schichtplanung.",
+        stakeholders=[],
+        expected_benefit="Weniger Planungsaufwand.",
+    )
+]
+
+
+@pytest_asyncio.fixture
+async def queue(db_session: AsyncSession):
+    """A queue on the test database that retries without delay."""
+    queue = JobQueue(
+        async_sessionmaker(db_session.bind, expire_on_commit=False),
+        workers=2, max_attempts=3, backoff_seconds=0, stale_after_seconds=60,
+    )
+    yield queue
+    await queue.stop()
+
+
+@pytest_asyncio.fixture
+async def transcript(db_session: AsyncSession, seed_data: dict) -> Transcript:
+    transcript = Transcript(filename="t.txt", content="Lisa: Schichtplanung", company_id=seed_data["company"].id)
+    db_session.add(transcript)
+    await db_session.commit()
+    return transcript
+
+
+async def _job(db_session: AsyncSession, job_id: int) -> ExtractionJob:
+    db_session.expunge_all()
+    return await db_session.get(ExtractionJob, job_id)
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_job_is_retried_until_it_succeeds(mock_extract, queue, db_session, transcript):
+    mock_extract.side_effect = [ExtractionError("kaputt"), RuntimeError("upstream down"), EXTRACTED]
+    job = await queue.enqueue(db_session, transcript.id)
+    await queue.join()
+
+    job = await _job(db_session, job.id)
+    assert (job.status, job.attempts, job.error) == (JobStatus.SUCCEEDED, 3, None)
+    assert len(job.use_case_ids) == 1
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_job_statements_are_not_counted_for_the_enqueuing_request(mock_extract, queue, db_session, transcript):
+    """Workers start inside the first enqueuing request but must not inherit its RequestState."""
+    mock_extract.return_value = EXTRACTED
+    with request_scope() as state:
+        job = await queue.enqueue(db_session, transcript.id)
+        queries, query_seconds = state.queries, state.query_seconds
+        await queue.join()
+        assert (state.queries, state.query_seconds) == (queries, query_seconds)
+
+    assert (await _job(db_session, job.id)).status == JobStatus.SUCCEEDED
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_job_fails_after_max_attempts(mock_extract, queue, db_session, transcript):
+    mock_extract.side_effect = ExtractionError("kein JSON")
+    job = await queue.enqueue(db_session, transcript.id)
+    await queue.join()
+
+    job = await _job(db_session, job.id)
+    assert (job.status, job.attempts, job.error) == (JobStatus.FAILED, 3, "kein JSON")
+    assert job.use_case_ids is None
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_failed_save_is_retried_not_left_running(mock_extract, queue, db_session, transcript, monkeypatch):
+    mock_extract.return_value = EXTRACTED
+    commit = AsyncSession.commit
+    failures = [1]
+
+    async def _flaky_commit(session):
+        # Fail the first commit that would store use cases, e.g. a dropped connection
+        if failures[0] and session is not db_session and any(
+            isinstance(obj, UseCase) for obj in session.identity_map.values()
+        ):
+            failures[0] -= 1
+            raise OperationalError("COMMIT", {}, Exception("connection lost"))
+        await commit(session)
+
+    monkeypatch.setattr(AsyncSession, "commit", _flaky_commit)
+    job = await queue.enqueue(db_session, transcript.id)
+    await queue.join()
+
+    job = await _job(db_session, job.id)
+    assert (job.status, job.attempts, job.error) == (JobStatus.SUCCEEDED, 2, None)
+    use_cases = (await db_session.execute(
+        select(UseCase).where(UseCase.transcript_id == transcript.id)
+    )).scalars().all()
+    assert [uc.id for uc in use_cases] == job.use_case_ids  # The failed attempt left nothing behind
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_job_runs_once_even_if_queued_twice(mock_extract, queue, db_session, transcript):
+    mock_extract.return_value = EXTRACTED
+    job = await queue.enqueue(db_session, transcript.id)
+    queue._submit(job.id)  # e.g. a second process recovered it too
+    await queue.join()
+
+    assert mock_extract.await_count == 1
+    assert (await _job(db_session, job.id)).attempts == 1
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_recover_requeues_queued_and_stale_jobs(mock_extract, queue, db_session, transcript):
+    mock_extract.return_value = EXTRACTED
+    now = datetime.now(timezone.utc)
+    jobs = [
+        ExtractionJob(transcript_id=transcript.id, max_attempts=3),
+        ExtractionJob(transcript_id=transcript.id, max_attempts=3, status=JobStatus.RUNNING,
+                      attempts=1, started_at=now - timedelta(hours=1)),
+        ExtractionJob(transcript_id=transcript.id, max_attempts=3, status=JobStatus.RUNNING,
+                      attempts=1, started_at=now),  # still running elsewhere
+    ]
+    db_session.add_all(jobs)
+    await db_session.commit()
+    ids = [j.id for j in jobs]
+
+    await queue.recover()
+    await queue.join()
+
+    statuses = [(await _job(db_session, job_id)).status for job_id in ids]
+    assert statuses == [JobStatus.SUCCEEDED, JobStatus.SUCCEEDED, JobStatus.RUNNING]
+
+
+@pytest.mark.asyncio
+async def test_get_job_not_found(client: AsyncClient, seed_data: dict):
+    res = await client.get("/api/jobs/999", headers=auth_header(seed_data["users"]["reader"]))
+    assert res.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_analyze_transcript_tool_can_enqueue(db_session, transcript, seed_data, monkeypatch):
+    queued = []
+
+    async def _fake_enqueue(db, transcript_id, user_id=None):
+        queued.append((transcript_id, user_id))
+        return ExtractionJob(id=7, transcript_id=transcript_id, status=JobStatus.QUEUED)
+
+    monkeypatch.setattr("services.tool_handlers.job_queue.enqueue", _fake_enqueue)
+    maintainer = seed_data["users"]["maintainer"]
+    result = await _analyze_transcript(
+        {"transcript_id": transcript.id, "background": True}, db_session, user=maintainer,
+    )
+
+    assert result["job_id"] == 7
+    assert queued == [(transcript.id, maintainer.id)]
@@ -0,0 +1,117 @@
+"""Tests for the LLM response cache and its use in services.llm."""
+
+import sqlite3
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services import llm, llm_cache as llm_cache_module
+from services.llm_cache import LLMResponseCache, cache_key
+
+MESSAGES = [{"role": "system", "content": "Extrahiere."}, {"role": "user", "content": "Transkript"}]
+
+
+def _response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_cache_key_covers_model_temperature_and_messages():
+    key = cache_key("m", 0.2, MESSAGES)
+    assert key == cache_key("m", 0.2, [dict(m) for m in MESSAGES])
+    assert key != cache_key("other", 0.2, MESSAGES)
+    assert key != cache_key("m", 0.3, MESSAGES)
+    assert key != cache_key("m", 0.2, MESSAGES[:1])
+
+
+@pytest.mark.asyncio
+async def test_disk_layer_is_shared_between_workers(tmp_path):
+    path = tmp_path / "llm.db"
+    worker_a = LLMResponseCache(memory_entries=10, ttl=60, disk_path=path, disk_entries=10)
+    worker_b = LLMResponseCache(memory_entries=10, ttl=60, disk_path=path, disk_entries=10)
+
+    await worker_a.set("k", "Antwort")
+    assert await worker_b.get("k") == "Antwort"  # from disk
+    assert await worker_b.get("k") == "Antwort"  # now from memory
+    assert await worker_b.get("fehlt") is None
+
+    stats = await worker_b.stats()
+    assert (stats.disk_hits, stats.memory_hits, stats.misses) == (1, 1, 1)
+    assert (stats.memory_entries, stats.disk_entries) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_disk_layer_evicts_expired_and_least_recently_used(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache_module.time, "time", lambda: now[0])
+    cache = LLMResponseCache(memory_entries=0, ttl=60, disk_path=tmp_path / "llm.db", disk_entries=2)
+
+    await cache.set("a", "1")
+    now[0] += 1
+    await cache.set("b", "2")
+    now[0] += 1
+    await cache.get("a")  # a is now more recent than b
+    now[0] += 1
+    await cache.set("c", "3")
+    assert [await cache.get(k) for k in "abc"] == ["1", None, "3"]
+
+    now[0] += 60
+    assert await cache.get("c") is None
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_served_from_cache():
+    cache = LLMResponseCache(memory_entries=10, ttl=60)
+    create = AsyncMock(return_value=_response("Antwort"))
+    with patch.object(llm, "response_cache", cache), patch.object(llm.client.chat.completions, "create", create):
+        assert await llm.chat_completion(MESSAGES, model="m") == "Antwort"
+        assert await llm.chat_completion(MESSAGES, model="m") == "Antwort"
+        assert create.await_count == 1
+
+        await llm.chat_completion(MESSAGES, model="m", temperature=0.7)
+        await llm.chat_completion(MESSAGES, model="m", use_cache=False)
+        assert create.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_is_not_served_again():
+    cache = LLMResponseCache(memory_entries=10, ttl=60)
+    create = AsyncMock(side_effect=[_response("kein JSON"), _response('{"use_cases": []}')])
+    with patch.object(llm, "response_cache", cache), patch.object(llm.client.chat.completions, "create", create):
+        with pytest.raises(ValueError):
+            await llm.chat_completion_json(MESSAGES, model="m")
+        assert await llm.chat_completion_json(MESSAGES, model="m") == {"use_cases": []}
+        assert await llm.chat_completion_json(MESSAGES, model="m") == {"use_cases": []}
+        assert create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_disk_connections_are_reused_and_closed(tmp_path):
+    cache = LLMResponseCache(memory_entries=0, ttl=60, disk_path=tmp_path / "llm.db", disk_entries=100)
+    for i in range(50):
+        await cache.set(f"k{i}", "Antwort")
+        assert await cache.get(f"k{i}") == "Antwort"
+
+    # One per executor thread, not one per call
+    connections = list(cache.disk._connections)
+    assert 1 <= len(connections) < 50
+
+    cache.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+    assert await cache.get("k1") == "Antwort"  # reopened on demand
+    cache.close()
+
+
+def test_response_cache_is_opened_on_startup_under_backend_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache_module, "BACKEND_DIR", tmp_path)
+    monkeypatch.setattr(llm.settings, "llm_cache_path", "data/llm_cache.db")
+    assert llm.response_cache is None  # nothing created at import
+
+    llm.open_response_cache()
+    try:
+        assert llm.response_cache.disk.path == tmp_path / "data" / "llm_cache.db"
+        assert llm.response_cache.disk.path.is_file()
+    finally:
+        llm.close_response_cache()
+    assert llm.response_cache is None
@@ -0,0 +1,136 @@
+"""Tests for the LLM concurrency/rate limiter."""
+
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from services.llm_limiter import LLMLimiter, Priority
+
+
+def _limiter(**overrides) -> LLMLimiter:
+    options = dict(
+        max_concurrency=1, requests_per_second=0, burst=1,
+        max_retries=3, backoff_base=0.01, backoff_max=0.05,
+    )
+    return LLMLimiter(**(options | overrides))
+
+
+def _rate_limited(retry_after: str | None = None) -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://llm/chat"))
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.mark.asyncio
+async def test_interactive_callers_are_served_before_batch():
+    limiter = _limiter()
+    order = []
+
+    async def _call(name: str, priority: Priority):
+        async with limiter.slot(priority):
+            order.append(name)
+
+    async with limiter.slot():
+        tasks = [asyncio.create_task(_call("batch-1", Priority.BATCH))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(_call("chat", Priority.INTERACTIVE)))
+        tasks.append(asyncio.create_task(_call("batch-2", Priority.BATCH)))
+        await asyncio.sleep(0)
+
+        stats = limiter.stats()
+        assert (stats.in_flight, stats.queued_interactive, stats.queued_batch) == (1, 1, 2)
+
+    await asyncio.gather(*tasks)
+    assert order == ["chat", "batch-1", "batch-2"]
+    assert limiter.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place():
+    limiter = _limiter()
+    async with limiter.slot():
+        waiter = asyncio.create_task(limiter.call(lambda: asyncio.sleep(0)))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert limiter.stats().queued_batch == 0
+    assert limiter.stats().in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_honors_retry_after_and_pauses_everyone():
+    limiter = _limiter(max_concurrency=2, backoff_max=1)
+    attempts = []
+
+    async def _throttled_once():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            raise _rate_limited(retry_after="0.2")
+        return "ok"
+
+    started = time.monotonic()
+    first = asyncio.create_task(limiter.call(_throttled_once))
+    await asyncio.sleep(0.05)
+    # A second caller arriving during the pause waits for it too
+    second = await limiter.call(lambda: asyncio.sleep(0, result="auch ok"))
+    assert time.monotonic() - started >= 0.2
+    assert second == "auch ok"
+    assert await first == "ok"
+    assert attempts[1] - attempts[0] >= 0.2
+    assert (limiter.throttled, limiter.retries) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_beyond_backoff_max_is_not_waited_out():
+    limiter = _limiter(backoff_max=1)
+    calls = 0
+
+    async def _throttled_for_long():
+        nonlocal calls
+        calls += 1
+        raise _rate_limited(retry_after="600")
+
+    started = time.monotonic()
+    with pytest.raises(openai.RateLimitError):
+        await limiter.call(_throttled_for_long)
+    assert calls == 1
+    assert time.monotonic() - started < 0.5
+    # Neither the slot nor the bucket stays blocked
+    assert limiter.stats().in_flight == 0
+    assert await limiter.call(lambda: asyncio.sleep(0, result="ok")) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded_and_other_errors_are_not_retried():
+    limiter = _limiter(max_retries=2)
+    calls = 0
+
+    async def _always_throttled():
+        nonlocal calls
+        calls += 1
+        raise _rate_limited()
+
+    with pytest.raises(openai.RateLimitError):
+        await limiter.call(_always_throttled)
+    assert calls == 3
+
+    async def _broken():
+        nonlocal calls
+        calls += 1
+        raise ValueError("kaputt")
+
+    with pytest.raises(ValueError):
+        await limiter.call(_broken)
+    assert calls == 4
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_caps_request_rate():
+    limiter = _limiter(max_concurrency=10, requests_per_second=20, burst=2)
+    started = time.monotonic()
+    await asyncio.gather(*(limiter.call(lambda: asyncio.sleep(0)) for _ in range(4)))
+    # Two requests from the burst, then one every 50 ms
+    assert time.monotonic() - started >= 0.09
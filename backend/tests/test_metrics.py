@@ -0,0 +1,125 @@
+"""Tests for the in-process metrics and the /metrics endpoint."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.metrics import (
+    Registry,
+    db_query_duration,
+    extraction_attempts,
+    llm_request_duration,
+    llm_tokens,
+    registry,
+    tool_duration,
+)
+from db.models import User
+from services import llm
+from services.extraction import extract_use_cases
+from services.tools import execute_tool
+from tests.conftest import auth_header
+
+VALID_LLM_RESPONSE = {
+    "use_cases": [{
+        "title": "Schichtplanung",
+        "description": "Automatische Schichtplanung.",
+        "stakeholders": [],
+        "expected_benefit": "Weniger Planungsaufwand.",
+    }]
+}
+
+
+@pytest.fixture(autouse=True)
+def _clear_metrics():
+    registry.clear()
+    yield
+    registry.clear()
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    metrics = Registry()
+    requests = metrics.counter("requests_total", "Requests", ("path",))
+    latency = metrics.histogram("latency_seconds", "Latency", ("path",), buckets=(0.1, 1.0))
+
+    requests.inc('/a"b')
+    requests.inc('/a"b', amount=2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/a")
+
+    assert metrics.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a\\"b"} 3',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{path="/a",le="0.1"} 2',
+        'latency_seconds_bucket{path="/a",le="1"} 3',
+        'latency_seconds_bucket{path="/a",le="+Inf"} 4',
+        'latency_seconds_sum{path="/a"} 3.65',
+        'latency_seconds_count{path="/a"} 4',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_requests_queries_and_jobs(
+    client: AsyncClient, seed_data: dict, seed_users: dict[str, User],
+):
+    use_case_id = seed_data["use_case"].id
+    res = await client.get(f"/api/use-cases/{use_case_id}", headers=auth_header(seed_users["reader"]))
+    assert res.status_code == 200
+
+    res = await client.get("/metrics")
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    body = res.text
+    # Labelled with the route template, not the ID
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/use-cases/{use_case_id}",status="200"} 1' in body
+    assert db_query_duration.count("select") > 0
+    assert 'extraction_jobs{status="queued"} 0' in body
+    assert 'llm_queued{priority="interactive"} 0' in body
+
+
+@pytest.mark.asyncio
+async def test_tool_duration_by_outcome(db_session: AsyncSession, seed_data: dict, seed_users: dict[str, User]):
+    reader = seed_users["reader"]
+    await execute_tool("list_use_cases", {}, db_session, reader)
+    await execute_tool("get_use_case", {"use_case_id": 99999}, db_session, reader)
+    await execute_tool("no_such_tool", {}, db_session, reader)
+
+    assert tool_duration.count("list_use_cases", "ok") == 1
+    assert tool_duration.count("get_use_case", "error") == 1
+    # Unknown names from the model don't create series
+    assert "no_such_tool" not in registry.render()
+
+
+@pytest.mark.asyncio
+@patch("services.extraction.chat_completion_json", new_callable=AsyncMock)
+async def test_extraction_attempts_counted(mock_llm: AsyncMock):
+    mock_llm.side_effect = [{"use_cases": []}, VALID_LLM_RESPONSE]
+
+    await extract_use_cases("Some transcript")
+
+    assert extraction_attempts.value("retry") == 1
+    assert extraction_attempts.value("ok") == 1
+    assert extraction_attempts.value("failed") == 0
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_records_latency_and_tokens():
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content="Antwort"))],
+        usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30),
+    )
+    create = AsyncMock(side_effect=[response, RuntimeError("upstream down")])
+    with patch.object(llm, "response_cache", None), patch.object(llm.client.chat.completions, "create", create):
+        await llm.chat_completion([{"role": "user", "content": "Hallo"}], model="m")
+        with pytest.raises(RuntimeError):
+            await llm.chat_completion([{"role": "user", "content": "Hallo"}], model="m")
+
+    assert llm_request_duration.count("completion", "ok") == 1
+    assert llm_request_duration.count("completion", "error") == 1
+    assert llm_tokens.value("completion", "prompt") == 120
+    assert llm_tokens.value("completion", "completion") == 30
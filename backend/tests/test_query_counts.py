@@ -0,0 +1,117 @@
+"""Regression tests for SQL statements emitted per endpoint.
+
+Seeds a company with many transcripts and use cases, then asserts that
+lookups touching that company stay at a fixed number of statements —
+an implicit eager load would turn them into O(company size) loads again.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Transcript, UseCase
+from tests.conftest import auth_header
+
+
+@pytest.fixture
+def count_statements(db_session: AsyncSession):
+    """Return a context manager collecting every SQL statement on the test engine."""
+    sync_engine = db_session.bind.sync_engine
+
+    @contextmanager
+    def _count():
+        statements: list[str] = []
+
+        def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+    return _count
+
+
+@pytest_asyncio.fixture
+async def big_company(db_session: AsyncSession, seed_data: dict) -> dict:
+    """Attach 10 transcripts with 3 use cases each to the seeded company."""
+    company = seed_data["company"]
+    for i in range(10):
+        transcript = Transcript(filename=f"t{i}.txt", content="x" * 1000, company_id=company.id)
+        db_session.add(transcript)
+        await db_session.flush()
+        for j in range(3):
+            db_session.add(UseCase(
+                title=f"UC {i}-{j}",
+                description="Beschreibung",
+                company_id=company.id,
+                transcript_id=transcript.id,
+            ))
+    await db_session.commit()
+    db_session.expunge_all()
+    return seed_data
+
+
+@pytest.mark.asyncio
+async def test_get_use_case_statement_count(client: AsyncClient, big_company: dict, count_statements):
+    uc_id = big_company["use_case"].id
+    with count_statements() as statements:
+        res = await client.get(f"/api/use-cases/{uc_id}", headers=auth_header(big_company["users"]["reader"]))
+    assert res.status_code == 200
+    # user lookup + use case
+    assert len(statements) <= 2, statements
+
+
+@pytest.mark.asyncio
+async def test_list_companies_statement_count(client: AsyncClient, big_company: dict, count_statements):
+    with count_statements() as statements:
+        res = await client.get("/api/companies/", headers=auth_header(big_company["users"]["reader"]))
+    assert res.status_code == 200
+    # user lookup + companies
+    assert len(statements) <= 2, statements
+
+
+@pytest.mark.asyncio
+async def test_list_industries_statement_count(client: AsyncClient, big_company: dict, count_statements):
+    with count_statements() as statements:
+        res = await client.get("/api/industries/", headers=auth_header(big_company["users"]["reader"]))
+    assert res.status_code == 200
+    assert len(statements) <= 2, statements
+
+
+@pytest.mark.asyncio
+async def test_create_use_case_statement_count(client: AsyncClient, big_company: dict, count_statements):
+    with count_statements() as statements:
+        res = await client.post("/api/use-cases/", json={
+            "title": "Neu",
+            "description": "Beschreibung",
+            "company_id": big_company["company"].id,
+        }, headers=auth_header(big_company["users"]["maintainer"]))
+    assert res.status_code == 201
+    # user lookup + company lookup + insert + refresh
+    assert len(statements) <= 4, statements
+
+
+@pytest.mark.asyncio
+async def test_list_use_cases_statement_count(client: AsyncClient, big_company: dict, count_statements):
+    with count_statements() as statements:
+        res = await client.get("/api/use-cases/?per_page=100", headers=auth_header(big_company["users"]["reader"]))
+    assert res.status_code == 200
+    assert res.json()["total"] == 31
+    # user lookup + count + page
+    assert len(statements) <= 3, statements
+
+
+@pytest.mark.asyncio
+async def test_list_transcripts_statement_count(client: AsyncClient, big_company: dict, count_statements):
+    with count_statements() as statements:
+        res = await client.get("/api/transcripts/", headers=auth_header(big_company["users"]["reader"]))
+    assert res.status_code == 200
+    assert len(res.json()) == 10
+    assert len(statements) <= 2, statements
@@ -0,0 +1,17 @@
+"""Guards against API queries degrading into full table scans.
+
+Runs the index advisor (index_advisor.py), which replays every read
+endpoint and read-only agent tool and checks each EXPLAIN QUERY PLAN.
+"""
+
+import pytest
+
+from index_advisor import collect_query_plans
+
+
+@pytest.mark.asyncio
+async def test_no_query_does_a_full_table_scan():
+    plans = await collect_query_plans()
+    assert plans
+    offenders = {p.statement: p.plan for p in plans if p.full_scans}
+    assert not offenders, offenders
@@ -0,0 +1,176 @@
+"""Tests for the chat session backends (memory and database)."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from db.models import AgentSession
+from services import session_store as session_store_module
+from services.session_store import DatabaseSessionBackend, MemorySessionBackend, SessionBackend
+
+
+LIMITS = {"idle_ttl": 60, "max_messages": 100, "max_bytes": 1_000_000}
+
+
+def _turn(question: str, answer: str = "ok") -> list[dict]:
+    return [{"role": "user", "content": question}, {"role": "assistant", "content": answer}]
+
+
+@pytest.fixture
+def session_maker(db_session: AsyncSession) -> async_sessionmaker:
+    """Independent sessions on the test database, as the backend opens its own."""
+    return async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture(params=["memory", "database"])
+async def make_backend(request, session_maker: async_sessionmaker):
+    """Factory for a backend of each kind; the database kind uses the test DB."""
+    def _make(**overrides) -> SessionBackend:
+        limits = LIMITS | overrides
+        if request.param == "memory":
+            return MemorySessionBackend(max_sessions=10, **limits)
+        return DatabaseSessionBackend(session_maker, **limits)
+
+    return _make
+
+
+@pytest.mark.asyncio
+async def test_load_returns_copy_of_history(make_backend):
+    store = make_backend()
+    await store.append("s1", _turn("Hallo"))
+    history = await store.load("s1")
+    history.append({"role": "user", "content": "nicht gespeichert"})
+    assert await store.load("s1") == _turn("Hallo")
+    assert await store.load("unbekannt") == []
+
+
+@pytest.mark.asyncio
+async def test_message_budget_trims_oldest_turns(make_backend):
+    store = make_backend(max_messages=4)
+    for i in range(3):
+        await store.append("s", _turn(f"Frage {i}"))
+    assert await store.load("s") == _turn("Frage 1") + _turn("Frage 2")
+    assert (await store.stats()).trimmed_messages == 2
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_keeps_history_starting_with_user_turn(make_backend):
+    store = make_backend(max_bytes=300)
+    await store.append("s", _turn("a" * 100, "b" * 100))
+    await store.append("s", _turn("kurz", "c" * 150))
+    assert await store.load("s") == _turn("kurz", "c" * 150)
+
+
+@pytest.mark.asyncio
+async def test_pending_file_is_returned_once(make_backend):
+    store = make_backend()
+    await store.store_file("s", "workshop.txt", "ab12")
+    await store.append("s", _turn("Analysiere das"))
+    assert await store.pop_file("s") == {"filename": "workshop.txt", "content_hash": "ab12"}
+    assert await store.pop_file("s") is None
+    assert await store.load("s") == _turn("Analysiere das")
+
+
+@pytest.mark.asyncio
+async def test_stats_and_clear(make_backend):
+    store = make_backend()
+    await store.append("a", _turn("1"))
+    await store.append("b", _turn("2"))
+    stats = await store.stats()
+    assert (stats.sessions, stats.messages) == (2, 4)
+    assert stats.bytes > 0
+
+    await store.clear("a")
+    assert await store.load("a") == []
+    await store.clear()
+    stats = await store.stats()
+    assert (stats.sessions, stats.messages, stats.bytes) == (0, 0, 0)
+
+
+# ---------- Memory backend ----------
+
+
+@pytest.mark.asyncio
+async def test_memory_least_recently_used_session_is_evicted():
+    store = MemorySessionBackend(max_sessions=2, **LIMITS)
+    await store.append("a", _turn("1"))
+    await store.append("b", _turn("2"))
+    await store.load("a")  # a is now more recent than b
+    await store.append("c", _turn("3"))
+
+    assert await store.load("b") == []
+    assert await store.load("a") == _turn("1")
+    assert (await store.stats()).evicted_sessions == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_idle_sessions_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store_module.time, "monotonic", lambda: now[0])
+    store = MemorySessionBackend(max_sessions=10, **(LIMITS | {"idle_ttl": 60}))
+    await store.append("alt", _turn("1"))
+    now[0] += 30
+    await store.append("neu", _turn("2"))
+    now[0] += 40
+
+    assert (await store.stats()).sessions == 1
+    assert await store.load("alt") == []
+    assert await store.load("neu") == _turn("2")
+
+
+# ---------- Database backend ----------
+
+
+@pytest.mark.asyncio
+async def test_database_history_is_shared_and_compressed(db_session: AsyncSession, session_maker):
+    # Two backend instances stand in for two workers
+    worker_a = DatabaseSessionBackend(session_maker, **LIMITS)
+    worker_b = DatabaseSessionBackend(session_maker, **LIMITS)
+    long_answer = "Use Case Beschreibung. " * 200
+    await worker_a.append("s", _turn("Frage", long_answer))
+    await worker_a.store_file("s", "t.txt", "cd34")
+
+    assert await worker_b.load("s") == _turn("Frage", long_answer)
+    assert await worker_b.pop_file("s") == {"filename": "t.txt", "content_hash": "cd34"}
+
+    row = await db_session.get(AgentSession, "s")
+    assert row.message_count == 2
+    assert len(row.history) < len(long_answer) // 10
+
+
+@pytest.mark.asyncio
+async def test_database_concurrent_session_creation_is_retried(db_session: AsyncSession, session_maker):
+    """An attachment upload and the chat message can both create the session."""
+    reads = 0
+
+    def _stale_first_read():
+        nonlocal reads
+        session = session_maker()
+        reads += 1
+        if reads == 1:
+            session.get = AsyncMock(return_value=None)  # Read before the other request inserted
+        return session
+
+    uploader = DatabaseSessionBackend(session_maker, **LIMITS)
+    chat = DatabaseSessionBackend(_stale_first_read, **LIMITS)
+    await uploader.store_file("s", "t.txt", "cd34")
+    await chat.append("s", _turn("Frage"))
+
+    assert reads == 2
+    assert await uploader.load("s") == _turn("Frage")
+    assert await uploader.pop_file("s") == {"filename": "t.txt", "content_hash": "cd34"}
+
+
+@pytest.mark.asyncio
+async def test_database_expired_sessions_are_ignored_and_purged(db_session: AsyncSession, session_maker):
+    writer = DatabaseSessionBackend(session_maker, **LIMITS)
+    await writer.append("alt", _turn("1"))
+
+    expired = DatabaseSessionBackend(session_maker, **(LIMITS | {"idle_ttl": 0}), purge_every=1)
+    assert await expired.load("alt") == []
+    await expired.append("neu", _turn("2"))  # triggers the purge
+
+    db_session.expunge_all()
+    assert await db_session.get(AgentSession, "alt") is None
@@ -10,8 +10,9 @@ import pytest_asyncio
 from dataclasses import dataclass
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.models import Role, Industry, Company, UseCase
+from db.models import Role, Industry, Company, UseCase, User
 from services.tool_handlers import _check_role, _create_use_case, _set_status
+from services.tools import TOOL_DEFINITIONS, classify_intents, tools_for
 
 
 @dataclass
@@ -127,7 +128,11 @@ async def company_in_db(db_session: AsyncSession) -> Company:
 @pytest.mark.asyncio
 async def test_create_use_case_success(db_session: AsyncSession, company_in_db: Company):
     """Maintainer can create a use case via the tool handler."""
-    user = _make_user(Role.MAINTAINER)
+    # created_by_id is a real foreign key (enforced on PostgreSQL)
+    maintainer = User(email="maintainer@test.com", password_hash="-", role=Role.MAINTAINER)
+    db_session.add(maintainer)
+    await db_session.commit()
+    user = FakeUser(id=maintainer.id, email=maintainer.email, role=Role.MAINTAINER)
     args = {
         "title": "KI-Chatbot",
         "description": "Ein Chatbot für den Kundenservice.",
@@ -236,3 +241,62 @@ async def test_set_status_as_reader_blocked(db_session: AsyncSession, use_case_i
     )
     assert "error" in result
     assert "berechtigung" in result["error"].lower()
+
+
+# ────────────────────────── tools_for() Tests ──────────────────────────
+
+
+def _names(definitions: list[dict]) -> set[str]:
+    return {d["function"]["name"] for d in definitions}
+
+
+READ_ONLY = {"list_use_cases", "get_use_case", "list_companies", "list_industries", "get_extraction_job"}
+
+
+def test_tools_for_reader_only_read_tools():
+    """Readers are never offered tools their role would reject."""
+    assert _names(tools_for(Role.READER)) == READ_ONLY
+    assert _names(tools_for(None)) == READ_ONLY
+
+
+def test_tools_for_role_hierarchy():
+    """Maintainers get everything except the admin tools; admins get all."""
+    maintainer = _names(tools_for(Role.MAINTAINER))
+    assert {"create_use_case", "save_transcript", "create_industry"} <= maintainer
+    assert not {"archive_use_case", "restore_use_case"} & maintainer
+    assert tools_for(Role.ADMIN) == TOOL_DEFINITIONS
+
+
+def test_tools_for_narrows_mutating_tools_by_intent():
+    """Only write tools matching the message remain; reads are always kept."""
+    names = _names(tools_for(Role.ADMIN, "Archiviere bitte Use Case 3"))
+    assert names == READ_ONLY | {
+        "create_use_case", "update_use_case", "set_status", "archive_use_case", "restore_use_case",
+    }
+    assert _names(tools_for(Role.MAINTAINER, "Lege die Branche Logistik an")) == READ_ONLY | {"create_industry"}
+
+
+def test_tools_for_without_intent_keeps_full_list():
+    """A follow-up without keywords must not lose tools from the previous turn."""
+    assert classify_intents("Ja, mach das") == frozenset()
+    assert tools_for(Role.ADMIN, "Ja, mach das") == TOOL_DEFINITIONS
+
+
+@pytest.mark.parametrize("earlier, follow_up, kept", [
+    ("Analysiere bitte das angehängte Workshop-Transkript", "Ordne es der Firma Müller zu und speichere",
+     "save_transcript"),
+    ("Lege einen Use Case für Predictive Maintenance an", "Mach das für Firma Acme", "create_use_case"),
+    ("Zeig mir die Use Cases von Kunde X", "Setze Nr. 5 auf approved für Kunde X", "set_status"),
+])
+def test_tools_for_follow_up_keeps_tools_of_earlier_turns(earlier, follow_up, kept):
+    """A follow-up naming only a company must not lose the tool the conversation is about."""
+    assert kept in _names(tools_for(Role.MAINTAINER, earlier, follow_up))
+
+
+def test_tools_for_status_value_implies_use_case():
+    assert "set_status" in _names(tools_for(Role.MAINTAINER, "Setze Nr. 5 auf approved für Kunde X"))
+
+
+def test_tools_for_reuses_lists():
+    """Catalogues are built once per role and intent set."""
+    assert tools_for(Role.MAINTAINER, "Neues Transkript") is tools_for(Role.MAINTAINER, "Workshop-Datei")
@@ -0,0 +1,152 @@
+"""Tests for transcript upload, listing and detail endpoints.
+
+LLM extraction is mocked; these tests cover persistence and which
+columns are loaded per endpoint.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from httpx import AsyncClient
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Company, ExtractionJob, JobStatus, Transcript, UseCase
+from schemas.extraction import ExtractedUseCase
+from services.blob_store import sha256_hex
+from services.jobs import job_queue
+from tests.conftest import auth_header
+
+
+EXTRACTED = [
+    ExtractedUseCase(
+        title="Dokumentationsassistent",
+        description="Automatische Erstellung von Pflegedokumentation.",
+        stakeholders=[{"name": "Petra Langner", "role": "Pflegedienstleiterin"}],
+        expected_benefit="Weniger Dokumentationsaufwand.",
+    )
+]
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_upload_transcript_queues_extraction(
+    mock_extract: AsyncMock, client: AsyncClient, db_session: AsyncSession, seed_data: dict
+):
+    mock_extract.return_value = EXTRACTED
+    maintainer = seed_data["users"]["maintainer"]
+    res = await client.post(
+        "/api/transcripts/",
+        data={"company_id": str(seed_data["company"].id)},
+        files={"file": ("workshop.txt", "Lisa Berger: Willkommen.".encode(), "text/plain")},
+        headers=auth_header(maintainer),
+    )
+    assert res.status_code == 202
+    body = res.json()
+    assert body["filename"] == "workshop.txt"
+    assert body["job"]["status"] == "queued"
+    assert body["duplicate"] is False
+
+    await job_queue.join()
+    db_session.expunge_all()
+
+    res = await client.get(f"/api/jobs/{body['job']['id']}", headers=auth_header(seed_data["users"]["reader"]))
+    job = res.json()
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 1
+    mock_extract.assert_awaited_once_with("Lisa Berger: Willkommen.")
+
+    use_cases = (await db_session.execute(select(UseCase).where(UseCase.id.in_(job["use_case_ids"])))).scalars().all()
+    assert [(uc.title, uc.transcript_id, uc.created_by_id) for uc in use_cases] == [
+        ("Dokumentationsassistent", body["id"], maintainer.id),
+    ]
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_reupload_resolves_to_existing_transcript(
+    mock_extract: AsyncMock, client: AsyncClient, db_session: AsyncSession, seed_data: dict
+):
+    mock_extract.return_value = EXTRACTED
+    headers = auth_header(seed_data["users"]["maintainer"])
+    company_id = str(seed_data["company"].id)
+
+    async def _upload(content: bytes, name: str = "workshop.txt", company: str = company_id):
+        return await client.post(
+            "/api/transcripts/", data={"company_id": company},
+            files={"file": (name, content, "text/plain")}, headers=headers,
+        )
+
+    first = (await _upload("Lisa: Hallo".encode())).json()
+    await job_queue.join()
+
+    # Same text (here with a BOM and another name) short-circuits to the first upload
+    res = await _upload("\ufeffLisa: Hallo".encode(), name="kopie.txt")
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["id"], body["filename"], body["duplicate"]) == (first["id"], "workshop.txt", True)
+    assert body["job"]["status"] == "succeeded"
+    assert [uc["title"] for uc in body["use_cases"]] == ["Dokumentationsassistent"]
+    assert mock_extract.await_count == 1
+
+    # Another company gets its own transcript
+    other = Company(name="Andere GmbH", industry_id=seed_data["industry"].id)
+    db_session.add(other)
+    await db_session.commit()
+    res = await _upload("Lisa: Hallo".encode(), company=str(other.id))
+    assert res.status_code == 202
+    assert res.json()["id"] != first["id"]
+    await job_queue.join()
+
+
+@pytest.mark.asyncio
+@patch("services.jobs.extract_use_cases", new_callable=AsyncMock)
+async def test_reupload_after_failed_extraction_queues_again(
+    mock_extract: AsyncMock, client: AsyncClient, db_session: AsyncSession, seed_data: dict
+):
+    mock_extract.return_value = EXTRACTED
+    transcript = Transcript(
+        filename="t.txt", content="Lisa: Hallo", content_hash=sha256_hex(b"Lisa: Hallo"),
+        company_id=seed_data["company"].id,
+    )
+    db_session.add(transcript)
+    await db_session.flush()
+    db_session.add(ExtractionJob(transcript_id=transcript.id, status=JobStatus.FAILED, attempts=3, max_attempts=3))
+    await db_session.commit()
+
+    res = await client.post(
+        "/api/transcripts/", data={"company_id": str(seed_data["company"].id)},
+        files={"file": ("t.txt", b"Lisa: Hallo", "text/plain")},
+        headers=auth_header(seed_data["users"]["maintainer"]),
+    )
+    assert res.status_code == 202
+    body = res.json()
+    assert (body["id"], body["duplicate"], body["job"]["status"]) == (transcript.id, True, "queued")
+    await job_queue.join()
+    assert mock_extract.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_transcript_includes_content(client: AsyncClient, db_session: AsyncSession, seed_data: dict):
+    transcript = Transcript(filename="t.txt", content="Voller Inhalt", company_id=seed_data["company"].id)
+    db_session.add(transcript)
+    await db_session.commit()
+    db_session.expunge_all()
+
+    res = await client.get(f"/api/transcripts/{transcript.id}", headers=auth_header(seed_data["users"]["reader"]))
+    assert res.status_code == 200
+    assert res.json()["content"] == "Voller Inhalt"
+
+
+@pytest.mark.asyncio
+async def test_list_transcripts_does_not_load_content(client: AsyncClient, db_session: AsyncSession, seed_data: dict):
+    db_session.add(Transcript(filename="t.txt", content="x" * 10_000, company_id=seed_data["company"].id))
+    await db_session.commit()
+    db_session.expunge_all()
+
+    res = await client.get("/api/transcripts/", headers=auth_header(seed_data["users"]["reader"]))
+    assert res.status_code == 200
+    assert [t["filename"] for t in res.json()] == ["t.txt"]
+    assert "content" not in res.json()[0]
+
+    transcript = (await db_session.execute(select(Transcript))).scalar_one()
+    assert "content_z" in inspect(transcript).unloaded
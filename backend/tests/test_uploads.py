@@ -0,0 +1,107 @@
+"""Tests for the streaming upload intake."""
+
+import io
+import os
+import time
+import zlib
+
+import pytest
+from fastapi import UploadFile
+
+from core.config import get_settings
+from services.blob_store import BlobStore, sha256_hex
+from services.uploads import (
+    UploadError, discard_stash, load_stash, read_upload, stash_text, stash_upload, sweep_stashes,
+)
+
+
+@pytest.fixture(autouse=True)
+def _small_chunks(monkeypatch):
+    # Multi-byte characters end up split across chunks
+    monkeypatch.setattr(get_settings(), "upload_chunk_bytes", 2)
+
+
+def _file(data: bytes, name: str = "workshop.txt") -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=name)
+
+
+@pytest.mark.asyncio
+async def test_read_upload_compresses_in_chunks(blob_store: BlobStore):
+    text = "Jörg: Größe prüfen. " * 50
+    upload = await read_upload(_file(b"\xef\xbb\xbf" + text.encode()))
+
+    assert upload.content_hash == sha256_hex(text.encode())
+    assert upload.size == len(text.encode())
+    assert zlib.decompress(upload.compressed).decode() == text
+    assert len(upload.compressed) < upload.size / 5
+    assert not blob_store.root.exists()  # Nothing is written to disk
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("data, name, error", [
+    (b"Hallo", "workshop.pdf", "Only .txt"),
+    (b"  \n\t", "workshop.txt", "empty"),
+    (b"\xef\xbb\xbf", "workshop.txt", "empty"),
+    ("Größe".encode("latin-1"), "workshop.txt", "UTF-8"),
+    ("Grö".encode()[:-1], "workshop.txt", "UTF-8"),  # truncated at the end
+    (b"x" * 11, "workshop.txt", "too large"),
+])
+async def test_stash_upload_rejects(blob_store: BlobStore, data, name, error):
+    with pytest.raises(UploadError, match=error):
+        await stash_upload("s", _file(data, name), max_bytes=10)
+    # Nothing is left behind, not even the temporary file
+    assert not any(path.is_file() for path in blob_store.root.rglob("*"))
+
+
+@pytest.mark.asyncio
+async def test_stash_round_trip(blob_store: BlobStore):
+    upload = await stash_upload("s", _file("\ufeffLisa: Größe".encode()))
+    assert upload.content_hash == stash_text("s", "t.txt", "\ufeffLisa: Größe").content_hash
+    assert zlib.decompress(load_stash("s", upload.content_hash)).decode() == "Lisa: Größe"
+
+    discard_stash("s", upload.content_hash)
+    with pytest.raises(FileNotFoundError):
+        load_stash("s", upload.content_hash)
+
+
+def test_stashes_are_kept_per_session(blob_store: BlobStore):
+    """Two sessions attaching the same file don't share (and delete) one copy."""
+    digest = stash_text("a", "t.txt", "Lisa: Hallo").content_hash
+    assert stash_text("b", "t.txt", "Lisa: Hallo").content_hash == digest
+
+    discard_stash("a", digest)
+    assert zlib.decompress(load_stash("b", digest)).decode() == "Lisa: Hallo"
+
+
+def test_sweep_removes_expired_stashes(blob_store: BlobStore):
+    old = stash_text("alt", "t.txt", "Lisa: Alt").content_hash
+    stash_text("neu", "t.txt", "Lisa: Neu")
+    expired = time.time() - 3 * 60 * 60
+    for path in blob_store.root.rglob("*"):
+        if "Alt" in (path.read_text() if path.is_file() else ""):
+            os.utime(path, (expired, expired))
+            os.utime(path.parent, (expired, expired))
+            os.utime(path.parent.parent, (expired, expired))
+
+    assert sweep_stashes(max_age=2 * 60 * 60) == 1
+    with pytest.raises(FileNotFoundError):
+        load_stash("alt", old)
+    assert len([p for p in blob_store.root.rglob("*") if p.is_file()]) == 1
+    assert len(list(blob_store.root.iterdir())) == 1  # The expired session's directory is gone
+
+
+def test_restashed_file_survives_sweep(blob_store: BlobStore):
+    """Attaching the same file again restarts its age, even though nothing is rewritten."""
+    digest = stash_text("s", "t.txt", "Lisa: Hallo").content_hash
+    expired = time.time() - 3 * 60 * 60
+    for path in blob_store.root.rglob("*"):
+        os.utime(path, (expired, expired))
+
+    assert stash_text("s", "t.txt", "Lisa: Hallo").content_hash == digest
+    assert sweep_stashes(max_age=2 * 60 * 60) == 0
+    assert zlib.decompress(load_stash("s", digest)).decode() == "Lisa: Hallo"
+
+
+def test_stash_text_limit(blob_store: BlobStore):
+    with pytest.raises(UploadError, match="too large"):
+        stash_text("s", "t.txt", "Lisa: Hallo", max_bytes=5)
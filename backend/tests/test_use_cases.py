@@ -2,8 +2,10 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from tests.conftest import auth_header
+from db.models import UseCase
+from tests.conftest import TEST_DATABASE_URL, auth_header
 
 
 # ---------- List ----------
@@ -37,6 +39,121 @@ async def test_list_use_cases_filter_by_status(client: AsyncClient, seed_data: d
     assert res.json()["total"] == 0
 
 
+@pytest.mark.asyncio
+async def test_list_use_cases_cursor_pagination(client: AsyncClient, db_session: AsyncSession, seed_data: dict):
+    """Keyset pages cover every row exactly once, even with equal created_at values."""
+    for i in range(4):
+        db_session.add(UseCase(
+            title=f"UC {i}", description="Cursor test.", company_id=seed_data["company"].id,
+        ))
+    await db_session.commit()
+
+    headers = auth_header(seed_data["users"]["reader"])
+    seen, cursor = [], None
+    while True:
+        params = {"per_page": 2, "include_total": "false"}
+        if cursor:
+            params["cursor"] = cursor
+        res = await client.get("/api/use-cases/", params=params, headers=headers)
+        assert res.status_code == 200
+        body = res.json()
+        assert body["total"] is None
+        seen.extend(uc["id"] for uc in body["data"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_list_use_cases_invalid_cursor(client: AsyncClient, seed_data: dict):
+    res = await client.get(
+        "/api/use-cases/?cursor=not-a-cursor", headers=auth_header(seed_data["users"]["reader"])
+    )
+    assert res.status_code == 400
+
+
+# ---------- Search ----------
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not TEST_DATABASE_URL.startswith("sqlite"), reason="FTS5 index is SQLite-only")
+async def test_search_use_cases_ranked_with_snippets(client: AsyncClient, db_session: AsyncSession, seed_data: dict):
+    company_id = seed_data["company"].id
+    db_session.add_all([
+        UseCase(title="Kundenanalyse mit KI", description="Churn-Erkennung.", company_id=company_id),
+        UseCase(title="Chatbot", description="Beantwortet Fragen zur Kundenanalyse.", company_id=company_id),
+        UseCase(
+            title="Rechnungsprüfung", description="Automatisierung.", company_id=company_id,
+            stakeholders=[{"name": "Anna Schmidt", "role": "Controlling"}],
+        ),
+    ])
+    await db_session.commit()
+    headers = auth_header(seed_data["users"]["reader"])
+
+    res = await client.get("/api/use-cases/search?q=analyse", headers=headers)
+    assert res.status_code == 200
+    hits = res.json()
+    assert [h["use_case"]["title"] for h in hits] == ["Kundenanalyse mit KI", "Chatbot"]
+    assert hits[0]["score"] > hits[1]["score"]
+    assert "<mark>" in hits[0]["title_highlight"]
+    assert "<mark>" in hits[1]["snippet"]
+
+    res = await client.get("/api/use-cases/search?q=Schmidt", headers=headers)
+    assert [h["use_case"]["title"] for h in res.json()] == ["Rechnungsprüfung"]
+
+
+@pytest.mark.asyncio
+async def test_list_use_cases_search_follows_updates(client: AsyncClient, seed_data: dict):
+    headers = auth_header(seed_data["users"]["reader"])
+    res = await client.get("/api/use-cases/?search=test use", headers=headers)
+    assert res.json()["total"] == 1
+
+    uc_id = seed_data["use_case"].id
+    await client.patch(f"/api/use-cases/{uc_id}", json={"title": "Umbenannt", "description": "Neu."},
+                       headers=auth_header(seed_data["users"]["maintainer"]))
+
+    res = await client.get("/api/use-cases/?search=umbenannt", headers=headers)
+    assert [uc["id"] for uc in res.json()["data"]] == [uc_id]
+    res = await client.get("/api/use-cases/?search=test use", headers=headers)
+    assert res.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_search_falls_back_to_ilike_without_fts(client: AsyncClient, seed_data: dict, monkeypatch):
+    monkeypatch.setattr("services.use_case_query.fts_available", lambda bind: False)
+    res = await client.get("/api/use-cases/search?q=test", headers=auth_header(seed_data["users"]["reader"]))
+    assert res.status_code == 200
+    hits = res.json()
+    assert [h["use_case"]["title"] for h in hits] == ["Test Use Case"]
+    assert hits[0]["score"] is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fts", [True, False])
+async def test_search_covers_same_fields_with_and_without_fts(
+    client: AsyncClient, db_session: AsyncSession, seed_data: dict, monkeypatch, fts: bool,
+):
+    db_session.add(UseCase(
+        title="Schichtplanung", description="Automatisch planen.", expected_benefit="Weniger Überstunden",
+        stakeholders=[{"name": "Jörg Hansen", "role": "Schichtleiter"}], company_id=seed_data["company"].id,
+    ))
+    await db_session.commit()
+    if not fts:
+        monkeypatch.setattr("services.use_case_query.fts_available", lambda bind: False)
+
+    headers = auth_header(seed_data["users"]["reader"])
+    for term in ("Überstunden", "hansen"):
+        res = await client.get(f"/api/use-cases/?search={term}", headers=headers)
+        assert [uc["title"] for uc in res.json()["data"]] == ["Schichtplanung"], term
+    # Roles are not indexed by FTS, so the fallback ignores them too
+    res = await client.get("/api/use-cases/?search=Schichtleiter", headers=headers)
+    assert res.json()["total"] == 0
+
+
 # ---------- Get ----------
 
 
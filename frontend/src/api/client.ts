@@ -6,27 +6,62 @@ function authHeaders(): Record<string, string> {
   return token ? { Authorization: `Bearer ${token}` } : {};
 }
 
+async function errorFromResponse(path: string, res: Response): Promise<Error> {
+  let detail = "";
+  try {
+    const body = await res.json();
+    detail = body.detail || "";
+  } catch (parseErr) {
+    console.warn(`Failed to parse error response for ${path}:`, parseErr);
+  }
+  return new Error(detail || `HTTP ${res.status}`);
+}
+
 async function request<T>(path: string, options?: RequestInit): Promise<T> {
   const res = await fetch(`${BASE_URL}${path}`, {
     headers: { "Content-Type": "application/json", ...authHeaders() },
     ...options,
   });
 
-  if (!res.ok) {
-    let detail = "";
-    try {
-      const body = await res.json();
-      detail = body.detail || "";
-    } catch (parseErr) {
-      console.warn(`Failed to parse error response for ${path}:`, parseErr);
-    }
-    throw new Error(detail || `HTTP ${res.status}`);
-  }
+  if (!res.ok) throw await errorFromResponse(path, res);
 
   if (res.status === 204) return undefined as T;
   return res.json();
 }
 
+/** POST a JSON body and call `onEvent` for every Server-Sent Event in the response. */
+async function stream<T>(path: string, body: unknown, onEvent: (event: T) => void): Promise<void> {
+  const res = await fetch(`${BASE_URL}${path}`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Accept: "text/event-stream", ...authHeaders() },
+    body: JSON.stringify(body),
+  });
+
+  if (!res.ok) throw await errorFromResponse(path, res);
+  if (!res.body) throw new Error("Leere Antwort vom Server");
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+
+    // Events are separated by a blank line; keep a trailing partial event
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const data = block
+        .split("\n")
+        .filter((line) => line.startsWith("data: "))
+        .map((line) => line.slice("data: ".length))
+        .join("\n");
+      if (data) onEvent(JSON.parse(data) as T);
+    }
+  }
+}
+
 export const api = {
   get: <T>(path: string) => request<T>(path),
 
@@ -39,6 +74,8 @@ export const api = {
   del: <T>(path: string) =>
     request<T>(path, { method: "DELETE" }),
 
+  stream,
+
   upload: <T>(path: string, formData: FormData) =>
     request<T>(path, {
       method: "POST",
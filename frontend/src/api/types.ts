@@ -28,9 +28,10 @@ export type UseCaseStatus =
 
 export interface UseCaseListResponse {
   data: UseCase[];
-  total: number;
+  total: number | null;
   page: number;
   per_page: number;
+  next_cursor: string | null;
 }
 
 export interface Company {
@@ -45,8 +46,31 @@ export interface Industry {
   description: string | null;
 }
 
+export type JobStatus = "queued" | "running" | "succeeded" | "failed";
+
+export interface ExtractionJob {
+  id: number;
+  transcript_id: number;
+  status: JobStatus;
+  attempts: number;
+  max_attempts: number;
+  error: string | null;
+  use_case_ids: number[] | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface ChatResponse {
   reply: string;
   session_id: string;
   tool_calls_made: string[];
 }
+
+/** Server-Sent Events of POST /chat/stream */
+export type ChatStreamEvent =
+  | { type: "delta"; content: string }
+  | { type: "tool_start"; name: string; arguments: Record<string, unknown> }
+  | { type: "tool_end"; name: string; ok: boolean }
+  | { type: "done"; reply: string; tool_calls_made: string[] }
+  | { type: "error"; detail: string };
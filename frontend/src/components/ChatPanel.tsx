@@ -1,6 +1,6 @@
 import { useEffect, useRef, useState } from "react";
 import { api } from "../api/client";
-import type { ChatResponse } from "../api/types";
+import type { ChatStreamEvent } from "../api/types";
 import { useRefresh } from "../context/RefreshContext";
 
 const MUTATING_TOOLS = new Set([
@@ -15,7 +15,7 @@ const MUTATING_TOOLS = new Set([
   "create_industry",
 ]);
 
-const MAX_FILE_SIZE = 512_000; // 500 KB
+const MAX_FILE_SIZE = 8 * 1024 * 1024; // 8 MB, see TRANSCRIPT_MAX_BYTES
 
 interface Message {
   role: "user" | "assistant";
@@ -44,7 +44,7 @@ export default function ChatPanel() {
     sessionStorage.setItem("chat_session_id", id);
     return id;
   });
-  const [attachedFile, setAttachedFile] = useState<{ name: string; content: string } | null>(null);
+  const [attachedFile, setAttachedFile] = useState<File | null>(null);
   const bottomRef = useRef<HTMLDivElement>(null);
   const inputRef = useRef<HTMLInputElement>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
@@ -78,15 +78,11 @@ export default function ChatPanel() {
       return;
     }
     if (file.size > MAX_FILE_SIZE) {
-      alert("Datei ist zu groß (max. 500 KB).");
+      alert("Datei ist zu groß (max. 8 MB).");
       return;
     }
 
-    const reader = new FileReader();
-    reader.onload = () => {
-      setAttachedFile({ name: file.name, content: reader.result as string });
-    };
-    reader.readAsText(file, "utf-8");
+    setAttachedFile(file);
   }
 
   function handleClear() {
@@ -107,26 +103,47 @@ export default function ChatPanel() {
       message: text,
       session_id: sessionId,
     };
-    if (attachedFile) {
-      body.file_content = attachedFile.content;
-      body.file_name = attachedFile.name;
-    }
+    const file = attachedFile;
     setAttachedFile(null);
 
+    // Placeholder for the streamed reply; always the last message while sending
+    setMessages((prev) => [...prev, { role: "assistant", text: "", toolCalls: [] }]);
+    const updateReply = (update: (msg: Message) => Message) =>
+      setMessages((prev) => [...prev.slice(0, -1), update(prev[prev.length - 1])]);
+
     try {
-      const data = await api.post<ChatResponse>("/chat/", body);
-      setMessages((prev) => [
-        ...prev,
-        { role: "assistant", text: data.reply, toolCalls: data.tool_calls_made },
-      ]);
-      if (data.tool_calls_made.some((t) => MUTATING_TOOLS.has(t))) {
-        triggerRefresh();
+      if (file) {
+        // Upload the file separately, so it is streamed to disk instead of sent as JSON
+        const formData = new FormData();
+        formData.append("file", file);
+        formData.append("session_id", sessionId);
+        await api.upload("/chat/attachments", formData);
+        body.file_name = file.name;
       }
+      await api.stream<ChatStreamEvent>("/chat/stream", body, (event) => {
+        switch (event.type) {
+          case "delta":
+            updateReply((msg) => ({ ...msg, text: msg.text + event.content }));
+            break;
+          case "tool_start":
+            updateReply((msg) => ({ ...msg, toolCalls: [...(msg.toolCalls ?? []), event.name] }));
+            break;
+          case "done":
+            updateReply((msg) => ({ ...msg, text: event.reply, toolCalls: event.tool_calls_made }));
+            if (event.tool_calls_made.some((t) => MUTATING_TOOLS.has(t))) {
+              triggerRefresh();
+            }
+            break;
+          case "error":
+            updateReply((msg) => ({ ...msg, text: `Fehler: ${event.detail}` }));
+            break;
+        }
+      });
     } catch (e: unknown) {
-      setMessages((prev) => [
-        ...prev,
-        { role: "assistant", text: `Fehler: ${e instanceof Error ? e.message : "Unbekannter Fehler"}` },
-      ]);
+      updateReply((msg) => ({
+        ...msg,
+        text: `Fehler: ${e instanceof Error ? e.message : "Unbekannter Fehler"}`,
+      }));
     } finally {
       setSending(false);
     }
@@ -168,7 +185,9 @@ export default function ChatPanel() {
                   : "bg-gray-100 text-gray-800"
               }`}
             >
-              <p className="whitespace-pre-wrap">{msg.text}</p>
+              <p className="whitespace-pre-wrap">
+                {msg.text || (sending && i === messages.length - 1 ? "Denkt nach..." : "")}
+              </p>
               {msg.toolCalls && msg.toolCalls.length > 0 && (
                 <div className="mt-2 pt-2 border-t border-gray-200/50">
                   <p className="text-xs text-gray-500">
@@ -180,14 +199,6 @@ export default function ChatPanel() {
           </div>
         ))}
 
-        {sending && (
-          <div className="flex justify-start">
-            <div className="bg-gray-100 rounded-lg px-3 py-2 text-sm text-gray-500">
-              Denkt nach...
-            </div>
-          </div>
-        )}
-
         <div ref={bottomRef} />
       </div>
 
@@ -1,13 +1,26 @@
 import { useEffect, useRef, useState } from "react";
 import { Navigate, useNavigate } from "react-router-dom";
 import { api } from "../api/client";
-import type { Company, Industry } from "../api/types";
+import type { Company, ExtractionJob, Industry, UseCase } from "../api/types";
 import { useAuth } from "../context/AuthContext";
 
 interface UploadResult {
   id: number;
   filename: string;
-  use_cases: { id: number; title: string; status: string }[];
+  duplicate: boolean;
+  job: ExtractionJob | null;
+  use_cases: UseCase[];
+}
+
+const JOB_POLL_INTERVAL_MS = 1500;
+
+/** Poll an extraction job until it has succeeded or failed. */
+async function waitForJob(jobId: number): Promise<ExtractionJob> {
+  for (;;) {
+    const job = await api.get<ExtractionJob>(`/jobs/${jobId}`);
+    if (job.status === "succeeded" || job.status === "failed") return job;
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
 }
 
 export default function UploadPage() {
@@ -26,6 +39,7 @@ export default function UploadPage() {
   const [uploading, setUploading] = useState(false);
   const [error, setError] = useState("");
   const [result, setResult] = useState<UploadResult | null>(null);
+  const [useCases, setUseCases] = useState<UseCase[]>([]);
 
   // New company form
   const [showNewCompany, setShowNewCompany] = useState(false);
@@ -113,6 +127,7 @@ export default function UploadPage() {
     setUploading(true);
     setError("");
     setResult(null);
+    setUseCases([]);
 
     const formData = new FormData();
     formData.append("file", file);
@@ -123,6 +138,18 @@ export default function UploadPage() {
       setResult(data);
       setFile(null);
       if (fileRef.current) fileRef.current.value = "";
+
+      // Same transcript uploaded before: its use cases come with the response
+      if (data.use_cases.length > 0 || !data.job) {
+        setUseCases(data.use_cases);
+        return;
+      }
+
+      // Extraction runs as a background job
+      const job = await waitForJob(data.job.id);
+      setResult({ ...data, job });
+      const ids = job.use_case_ids ?? [];
+      setUseCases(await Promise.all(ids.map((id) => api.get<UseCase>(`/use-cases/${id}`))));
     } catch (e: any) {
       setError(e.message);
     } finally {
@@ -235,7 +262,9 @@ export default function UploadPage() {
             disabled={uploading || !file || !companyId}
             className="w-full px-4 py-2 text-sm bg-blue-600 text-white rounded-md hover:bg-blue-700 disabled:opacity-40 transition-colors"
           >
-            {uploading ? "Wird hochgeladen & analysiert..." : "Hochladen & Use Cases extrahieren"}
+            {uploading
+              ? result ? "Use Cases werden extrahiert..." : "Wird hochgeladen..."
+              : "Hochladen & Use Cases extrahieren"}
           </button>
         </div>
 
@@ -243,15 +272,21 @@ export default function UploadPage() {
         {result && (
           <div className="mt-6 pt-6 border-t border-gray-200">
             <h2 className="text-sm font-medium text-gray-900 mb-2">
-              Transkript #{result.id} hochgeladen
+              {result.duplicate
+                ? `Transkript wurde bereits hochgeladen (#${result.id})`
+                : `Transkript #${result.id} hochgeladen`}
             </h2>
-            {result.use_cases.length > 0 ? (
+            {result.job && (result.job.status === "queued" || result.job.status === "running") ? (
+              <p className="text-sm text-gray-600">
+                Extraktion läuft im Hintergrund (Job #{result.job.id})...
+              </p>
+            ) : useCases.length > 0 ? (
               <>
                 <p className="text-sm text-green-700 mb-3">
-                  {result.use_cases.length} Use Case(s) extrahiert:
+                  {useCases.length} Use Case(s) extrahiert:
                 </p>
                 <ul className="space-y-1">
-                  {result.use_cases.map((uc) => (
+                  {useCases.map((uc) => (
                     <li key={uc.id}>
                       <button
                         onClick={() => navigate(`/use-cases/${uc.id}`)}
@@ -203,7 +203,7 @@ export default function UseCaseListPage() {
           </div>
 
           {/* Pagination */}
-          {data.total > data.per_page && (
+          {data.total !== null && data.total > data.per_page && (
             <div className="flex items-center gap-2 mt-4 text-sm">
               <button
                 disabled={page <= 1}